@@ -0,0 +1,129 @@
+"""Benchmark segment and entity ingestion: execute_many vs COPY.
+
+Generates ``--segments`` OCR segments for one video, with one entity for
+every ``--entity-every``-th segment, and inserts them three ways:
+
+- ``execute_many`` of INSERTs, with ids returned one row at a time so
+  entities can reference their segments;
+- :func:`bulk_insert` with text COPY;
+- :func:`bulk_insert` with binary COPY (the default).
+
+Each run deletes its rows afterwards. Reports rows/sec for segments plus
+entities.
+
+Run against a scratch database only:
+
+    DATABASE_URL=postgresql://... uv run python benchmarks/bulk_insert.py --segments 200000
+"""
+
+import argparse
+import time
+import uuid
+from typing import Any
+
+from psycopg.types.json import Jsonb
+
+from cortana_common.db import bulk_insert, execute_many, get_db_connection
+
+SEGMENT_COLUMNS = [
+    "video_id", "owner_id", "text", "normalized_text", "text_hash",
+    "language", "confidence", "t_start", "t_end", "bounding_box",
+]
+ENTITY_COLUMNS = ["segment_id", "entity_type", "value", "normalized_value"]
+
+
+def segment_rows(video_id: uuid.UUID, owner_id: uuid.UUID, count: int) -> list[tuple[Any, ...]]:
+    """Rows shaped like OCR output: a short line of text with its box."""
+    return [
+        (
+            video_id,
+            owner_id,
+            f"Deploy #{i} finished in {i % 97}s",
+            f"deploy #{i} finished in {i % 97}s",
+            f"{i:064x}",
+            "eng",
+            0.91,
+            i * 100,
+            i * 100 + 100,
+            {"x": 16, "y": 40 + 24 * (i % 30), "width": 420, "height": 18},
+        )
+        for i in range(count)
+    ]
+
+
+def entity_rows(segment_ids: list[uuid.UUID], every: int) -> list[tuple[Any, ...]]:
+    """A ``number`` entity for every ``every``-th segment."""
+    return [(segment_ids[i], "number", str(i), str(i)) for i in range(0, len(segment_ids), every)]
+
+
+def with_execute_many(rows: list[tuple[Any, ...]], every: int) -> None:
+    placeholders = ", ".join(["%s"] * len(SEGMENT_COLUMNS))
+    query = (
+        f"INSERT INTO segments ({', '.join(SEGMENT_COLUMNS)}) "
+        f"VALUES ({placeholders}) RETURNING id"
+    )
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.executemany(query, [(*row[:-1], Jsonb(row[-1])) for row in rows], returning=True)
+            segment_ids = []
+            while True:
+                segment_ids.append(cur.fetchone()["id"])
+                if not cur.nextset():
+                    break
+    execute_many(
+        "INSERT INTO entities (segment_id, entity_type, value, normalized_value) "
+        "VALUES (%s, %s, %s, %s)",
+        entity_rows(segment_ids, every),
+    )
+
+
+def with_copy(rows: list[tuple[Any, ...]], every: int, binary: bool) -> None:
+    if not binary:
+        rows = [(*row[:-1], Jsonb(row[-1])) for row in rows]
+    with get_db_connection() as conn:
+        segment_ids = bulk_insert("segments", SEGMENT_COLUMNS, rows, "id", binary=binary, conn=conn)
+        entities = entity_rows(segment_ids, every)
+        bulk_insert("entities", ENTITY_COLUMNS, entities, binary=binary, conn=conn)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, default=100_000)
+    parser.add_argument("--entity-every", type=int, default=5)
+    args = parser.parse_args()
+
+    with get_db_connection() as conn:
+        owner_id = uuid.uuid4()
+        video_id = conn.execute(
+            "INSERT INTO videos (owner_id, s3_original_path) "
+            "VALUES (%s, 'benchmark/bulk') RETURNING id",
+            (owner_id,),
+        ).fetchone()["id"]
+    rows = segment_rows(video_id, owner_id, args.segments)
+    total = args.segments + len(range(0, args.segments, args.entity_every))
+
+    runs = [
+        ("execute_many", lambda: with_execute_many(rows, args.entity_every)),
+        ("COPY text", lambda: with_copy(rows, args.entity_every, binary=False)),
+        ("COPY binary", lambda: with_copy(rows, args.entity_every, binary=True)),
+    ]
+    print(f"{args.segments} segments + {total - args.segments} entities")
+    baseline = None
+    for name, run in runs:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(
+            f"  {name:<13} {elapsed:7.2f}s | {total / elapsed:10,.0f} rows/s | "
+            f"{baseline / elapsed:5.1f}x"
+        )
+        with get_db_connection() as conn:
+            conn.execute("DELETE FROM segments WHERE video_id = %s", (video_id,))
+
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM videos WHERE id = %s", (video_id,))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Benchmark job claim latency and tenant fairness on a large queue.
+
+Seeds ``--rows`` queued jobs spread over ``--tenants`` tenants, one of which
+(the "bulk" tenant) owns ``--bulk-share`` of the backlog, then runs
+``--pollers`` concurrent pollers that claim one job at a time and ack it.
+Reports claim latency percentiles, the share of claims that went to the bulk
+tenant, and the cost of an enqueue (fair_key trigger) against the full queue.
+
+Run against a scratch database only; the jobs table must start empty:
+
+    DATABASE_URL=postgresql://... uv run python benchmarks/claim_latency.py --rows 1000000
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from collections import Counter
+from uuid import UUID
+
+from cortana_common.db import execute_query, get_db_connection
+from cortana_common.jobs import ack_jobs, enqueue_job, poll_next_jobs
+from cortana_common.models import JobType
+
+# Pipeline job types allow one active job per video (idx_jobs_video_pipeline_active);
+# clip_generate is the type whose backlog can hold many jobs per video
+JOB_TYPE = JobType.CLIP_GENERATE
+
+
+def seed(rows: int, tenants: int, bulk_share: float) -> dict[UUID, UUID]:
+    """Insert one video per tenant and ``rows`` queued jobs.
+
+    Keys are assigned as if every tenant had enqueued its backlog at once
+    into an empty queue, which is what the fair_key trigger produces.
+
+    Returns:
+        Mapping of video ID to tenant ID.
+    """
+    with get_db_connection() as conn:
+        videos = conn.execute(
+            """
+            INSERT INTO videos (owner_id, s3_original_path)
+            SELECT gen_random_uuid(), 'benchmark/' || g
+            FROM generate_series(1, %s) AS g
+            RETURNING id, owner_id
+            """,
+            (tenants,),
+        ).fetchall()
+        video_ids = [v["id"] for v in videos]
+
+        bulk_rows = int(rows * bulk_share)
+        other_rows = rows - bulk_rows
+        conn.execute(
+            """
+            INSERT INTO jobs (video_id, job_type, payload, fair_key)
+            SELECT %(bulk)s, %(job_type)s, '{"benchmark": true}'::jsonb, g - 1
+            FROM generate_series(1, %(bulk_rows)s) AS g
+            """,
+            {"bulk": video_ids[0], "job_type": JOB_TYPE.value, "bulk_rows": bulk_rows},
+        )
+        conn.execute(
+            """
+            INSERT INTO jobs (video_id, job_type, payload, fair_key)
+            SELECT (%(others)s::uuid[])[1 + g %% %(n)s], %(job_type)s,
+                   '{"benchmark": true}'::jsonb, g / %(n)s
+            FROM generate_series(0, %(other_rows)s - 1) AS g
+            """,
+            {
+                "others": video_ids[1:],
+                "n": len(video_ids) - 1,
+                "job_type": JOB_TYPE.value,
+                "other_rows": other_rows,
+            },
+        )
+        conn.execute("ANALYZE jobs")
+
+    return {v["id"]: v["owner_id"] for v in videos}
+
+
+def run_pollers(pollers: int, claims: int) -> tuple[list[float], list[UUID]]:
+    """Claim and ack ``claims`` jobs with ``pollers`` concurrent threads.
+
+    Returns:
+        Claim latencies in milliseconds and the claimed jobs' video IDs.
+    """
+    latencies: list[float] = []
+    claimed: list[UUID] = []
+    lock = threading.Lock()
+    remaining = [claims]
+
+    def worker() -> None:
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+
+            start = time.perf_counter()
+            jobs = poll_next_jobs(JOB_TYPE, 1)
+            elapsed = (time.perf_counter() - start) * 1000
+            ack_jobs([job.id for job in jobs])
+
+            with lock:
+                latencies.append(elapsed)
+                claimed.extend(job.video_id for job in jobs)
+
+    threads = [threading.Thread(target=worker) for _ in range(pollers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return latencies, claimed
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--tenants", type=int, default=50)
+    parser.add_argument("--bulk-share", type=float, default=0.9)
+    parser.add_argument("--pollers", type=int, default=8)
+    parser.add_argument("--claims", type=int, default=2_000)
+    parser.add_argument("--enqueues", type=int, default=200)
+    args = parser.parse_args()
+
+    if execute_query("SELECT count(*) AS n FROM jobs", fetch_one=True)["n"]:
+        raise SystemExit("jobs table is not empty; run against a scratch database")
+
+    start = time.perf_counter()
+    tenant_of = seed(args.rows, args.tenants, args.bulk_share)
+    bulk_video = next(iter(tenant_of))
+    print(f"seeded {args.rows} jobs over {args.tenants} tenants in {time.perf_counter() - start:.1f}s")
+
+    try:
+        start = time.perf_counter()
+        latencies, claimed = run_pollers(args.pollers, args.claims)
+        wall = time.perf_counter() - start
+        bulk_claims = Counter(claimed)[bulk_video]
+        print(
+            f"claims: {len(latencies)} by {args.pollers} pollers in {wall:.2f}s "
+            f"({len(latencies) / wall:.0f}/s)"
+        )
+        print(
+            f"claim latency ms: p50={percentile(latencies, 50):.2f} "
+            f"p95={percentile(latencies, 95):.2f} p99={percentile(latencies, 99):.2f} "
+            f"mean={statistics.mean(latencies):.2f}"
+        )
+        print(
+            f"bulk tenant owns {args.bulk_share:.0%} of the backlog and got "
+            f"{bulk_claims / len(claimed):.1%} of claims "
+            f"(fair share: {1 / args.tenants:.1%})"
+        )
+
+        # Fresh videos of the bulk tenant, so every enqueue inserts a job
+        fresh = execute_query(
+            """
+            INSERT INTO videos (owner_id, s3_original_path)
+            SELECT %s, 'benchmark/enqueue-' || g
+            FROM generate_series(1, %s) AS g
+            RETURNING id, owner_id
+            """,
+            (tenant_of[bulk_video], args.enqueues),
+            fetch_all=True,
+        )
+        tenant_of.update((v["id"], v["owner_id"]) for v in fresh)
+
+        enqueue_latencies = []
+        for video in fresh:
+            start = time.perf_counter()
+            enqueue_job(video["id"], JOB_TYPE, {"benchmark": True})
+            enqueue_latencies.append((time.perf_counter() - start) * 1000)
+        print(
+            f"enqueue latency ms: p50={percentile(enqueue_latencies, 50):.2f} "
+            f"p99={percentile(enqueue_latencies, 99):.2f}"
+        )
+    finally:
+        execute_query("DELETE FROM videos WHERE id = ANY(%s)", (list(tenant_of),))
+        execute_query(
+            "DELETE FROM job_tenant_clock WHERE tenant_id = ANY(%s)", (list(tenant_of.values()),)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Benchmark claim latency with a large job history, before and after archival.
+
+Seeds ``--history`` finished jobs (spread over the last ``--days`` days) and
+``--queued`` queued jobs. The "before" run restores the generic status/job_type
+indexes and the unconditional updated_at trigger that predate the
+jobs_history migration; the "after" run drops them again and moves finished
+jobs to ``jobs_history`` with :func:`archive_finished_jobs`. Each run claims
+and acks ``--claims`` jobs and reports claim latency and the number of rows
+left in ``jobs``.
+
+Run against a scratch database only; the jobs table must start empty:
+
+    DATABASE_URL=postgresql://... uv run python benchmarks/history_archival.py --history 10000000
+"""
+
+import argparse
+import statistics
+import time
+from datetime import timedelta
+
+import psycopg
+
+from cortana_common.db import execute_query, get_conninfo, get_db_connection
+from cortana_common.jobs import ack_jobs, archive_finished_jobs, poll_next_jobs
+from cortana_common.models import JobType
+
+# The only job type allowed several active jobs per video (see
+# idx_jobs_video_pipeline_active), so the queue can be seeded from a few videos
+JOB_TYPE = JobType.CLIP_GENERATE
+SEED_CHUNK = 1_000_000
+
+
+def seed(history: int, queued: int, days: int) -> list:
+    """Insert finished and queued jobs for a handful of videos.
+
+    Returns:
+        IDs of the seeded videos.
+    """
+    with get_db_connection() as conn:
+        video_ids = [
+            row["id"]
+            for row in conn.execute(
+                """
+                INSERT INTO videos (owner_id, s3_original_path)
+                SELECT gen_random_uuid(), 'benchmark/' || g
+                FROM generate_series(1, 100) AS g
+                RETURNING id
+                """
+            ).fetchall()
+        ]
+
+    for start in range(0, history, SEED_CHUNK):
+        count = min(SEED_CHUNK, history - start)
+        with get_db_connection() as conn:
+            conn.execute(
+                """
+                INSERT INTO jobs (video_id, job_type, status, payload, started_at,
+                                  finished_at, created_at, fair_key)
+                SELECT (%(videos)s::uuid[])[1 + g %% 100],
+                       (enum_range(NULL::job_type))[1 + g %% 4],
+                       CASE WHEN g %% 50 = 0 THEN 'failed' ELSE 'done' END::job_status,
+                       '{"benchmark": true}'::jsonb,
+                       finished, finished, finished - interval '1 minute', g
+                FROM (
+                    SELECT g, now() - interval '1 day' - random() * %(span)s AS finished
+                    FROM generate_series(%(start)s::bigint, %(end)s::bigint) AS g
+                ) rows
+                """,
+                {
+                    "videos": video_ids,
+                    "span": timedelta(days=days),
+                    "start": start,
+                    "end": start + count - 1,
+                },
+            )
+        print(f"  seeded {start + count}/{history} finished jobs")
+
+    with get_db_connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO jobs (video_id, job_type, payload, fair_key)
+            SELECT (%(videos)s::uuid[])[1 + g %% 100], %(job_type)s,
+                   '{"benchmark": true}'::jsonb, g
+            FROM generate_series(1, %(queued)s) AS g
+            """,
+            {"videos": video_ids, "job_type": JOB_TYPE.value, "queued": queued},
+        )
+
+    return video_ids
+
+
+def set_legacy_schema(enabled: bool) -> None:
+    """Restore (or drop) the pre-archival generic indexes and updated_at trigger."""
+    with get_db_connection() as conn:
+        if enabled:
+            conn.execute("CREATE INDEX idx_jobs_job_type ON jobs (job_type)")
+            conn.execute("CREATE INDEX idx_jobs_status ON jobs (status)")
+            conn.execute("CREATE INDEX idx_jobs_status_job_type ON jobs (status, job_type)")
+            condition = ""
+        else:
+            conn.execute("DROP INDEX idx_jobs_job_type, idx_jobs_status, idx_jobs_status_job_type")
+            condition = "WHEN (new.updated_at IS NOT DISTINCT FROM old.updated_at)"
+        conn.execute("DROP TRIGGER update_jobs_updated_at ON jobs")
+        conn.execute(
+            f"""
+            CREATE TRIGGER update_jobs_updated_at BEFORE UPDATE ON jobs
+            FOR EACH ROW {condition} EXECUTE FUNCTION update_updated_at_column()
+            """
+        )
+
+
+def vacuum_analyze() -> None:
+    """VACUUM ANALYZE the queue tables (needs autocommit)."""
+    with psycopg.connect(get_conninfo(), autocommit=True) as conn:
+        conn.execute("VACUUM ANALYZE jobs")
+        conn.execute("VACUUM ANALYZE jobs_history")
+
+
+def jobs_rows() -> int:
+    """Number of rows in the live jobs table."""
+    return execute_query("SELECT count(*) AS n FROM jobs", fetch_one=True)["n"]
+
+
+def measure(claims: int) -> list[float]:
+    """Claim and ack ``claims`` jobs one at a time.
+
+    Returns:
+        Claim latencies in milliseconds.
+    """
+    latencies = []
+    for _ in range(claims):
+        start = time.perf_counter()
+        jobs = poll_next_jobs(JOB_TYPE, 1)
+        latencies.append((time.perf_counter() - start) * 1000)
+        ack_jobs([job.id for job in jobs])
+    return latencies
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(label: str, latencies: list[float]) -> None:
+    """Print latency percentiles and the live table's row count."""
+    print(
+        f"{label}: claim p50={percentile(latencies, 50):.2f}ms "
+        f"p95={percentile(latencies, 95):.2f}ms p99={percentile(latencies, 99):.2f}ms "
+        f"mean={statistics.mean(latencies):.2f}ms ({jobs_rows()} rows in jobs)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=10_000_000)
+    parser.add_argument("--queued", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--claims", type=int, default=1_000)
+    args = parser.parse_args()
+
+    if jobs_rows():
+        raise SystemExit("jobs table is not empty; run against a scratch database")
+
+    start = time.perf_counter()
+    video_ids = seed(args.history, args.queued, args.days)
+    vacuum_analyze()
+    print(
+        f"seeded {args.history} finished + {args.queued} queued jobs "
+        f"in {time.perf_counter() - start:.0f}s"
+    )
+
+    try:
+        set_legacy_schema(True)
+        vacuum_analyze()
+        report("before", measure(args.claims))
+        set_legacy_schema(False)
+
+        start = time.perf_counter()
+        archived = archive_finished_jobs(older_than=timedelta(hours=12))
+        elapsed = time.perf_counter() - start
+        print(f"archived {archived} jobs in {elapsed:.0f}s ({archived / elapsed:.0f} jobs/s)")
+        vacuum_analyze()
+
+        report("after", measure(args.claims))
+    finally:
+        execute_query("DELETE FROM jobs_history WHERE video_id = ANY(%s)", (video_ids,))
+        execute_query("DELETE FROM videos WHERE id = ANY(%s)", (video_ids,))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,58 @@
 """Cortana Common - Shared utilities for cortana-vision services."""
 
+from cortana_common.async_db import close_async_db_pool, get_async_db_connection
+from cortana_common.async_jobs import (
+    AsyncJobPoller,
+    ack_jobs_async,
+    complete_and_chain_async,
+    enqueue_job_async,
+    nack_jobs_async,
+    poll_next_jobs_async,
+)
+from cortana_common.async_s3 import AsyncS3Client, get_async_s3_client
 from cortana_common.config import Settings, get_settings
-from cortana_common.db import get_db_connection, execute_query
-from cortana_common.s3 import S3Client, get_s3_client
+from cortana_common.db import (
+    bulk_insert,
+    close_db_pool,
+    execute_query,
+    get_db_connection,
+    get_pool_stats,
+)
+from cortana_common.frames import (
+    FrameManifest,
+    FrameShardWriter,
+    load_frame_manifest,
+    read_frames,
+)
 from cortana_common.jobs import (
+    JobFailure,
     JobPoller,
-    poll_next_job,
+    NextJob,
+    NonRetryableError,
     ack_job,
-    nack_job,
+    ack_jobs,
+    archive_finished_jobs,
+    complete_and_chain,
     enqueue_job,
+    extend_leases,
+    nack_job,
+    nack_jobs,
+    poll_next_job,
+    poll_next_jobs,
+    reap_expired_jobs,
+    seconds_until_next_job,
+)
+from cortana_common.models import Job, JobStatus, JobType, Video, VideoStatus
+from cortana_common.presign import PresignedUrlCache, get_presigned_url_cache
+from cortana_common.s3 import (
+    ObjectCache,
+    S3Client,
+    S3ObjectReader,
+    ScanCursor,
+    TransferResult,
+    get_object_cache,
+    get_s3_client,
 )
-from cortana_common.models import Job, Video, JobType, JobStatus, VideoStatus
 
 __version__ = "0.1.0"
 
@@ -19,13 +61,48 @@ __all__ = [
     "get_settings",
     "get_db_connection",
     "execute_query",
+    "bulk_insert",
+    "close_db_pool",
+    "get_pool_stats",
     "S3Client",
+    "S3ObjectReader",
+    "ScanCursor",
+    "TransferResult",
     "get_s3_client",
+    "ObjectCache",
+    "get_object_cache",
+    "FrameManifest",
+    "FrameShardWriter",
+    "load_frame_manifest",
+    "read_frames",
+    "PresignedUrlCache",
+    "get_presigned_url_cache",
+    "JobFailure",
     "JobPoller",
+    "NextJob",
+    "NonRetryableError",
     "poll_next_job",
+    "poll_next_jobs",
     "ack_job",
+    "ack_jobs",
     "nack_job",
+    "nack_jobs",
     "enqueue_job",
+    "complete_and_chain",
+    "extend_leases",
+    "reap_expired_jobs",
+    "seconds_until_next_job",
+    "archive_finished_jobs",
+    "get_async_db_connection",
+    "close_async_db_pool",
+    "AsyncS3Client",
+    "get_async_s3_client",
+    "AsyncJobPoller",
+    "poll_next_jobs_async",
+    "ack_jobs_async",
+    "nack_jobs_async",
+    "enqueue_job_async",
+    "complete_and_chain_async",
     "Job",
     "Video",
     "JobType",
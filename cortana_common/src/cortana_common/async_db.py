@@ -0,0 +1,116 @@
+"""Asyncio database utilities for PostgreSQL/Supabase access."""
+
+import logging
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, Optional
+
+import psycopg
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from cortana_common.config import get_settings
+from cortana_common.db import get_conninfo
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache
+def _create_async_db_pool() -> AsyncConnectionPool:
+    """Create the process-wide async connection pool without opening it."""
+    settings = get_settings()
+
+    return AsyncConnectionPool(
+        get_conninfo(),
+        connection_class=psycopg.AsyncConnection,
+        kwargs={"row_factory": dict_row, "autocommit": False},
+        min_size=settings.db_pool_min_size,
+        max_size=settings.db_pool_max_size,
+        max_idle=settings.db_pool_max_idle,
+        max_lifetime=settings.db_pool_max_lifetime,
+        timeout=settings.db_pool_timeout,
+        check=AsyncConnectionPool.check_connection,
+        name=f"{settings.service_name or 'cortana'}-async",
+        open=False,
+    )
+
+
+async def get_async_db_pool() -> AsyncConnectionPool:
+    """Get the process-wide async connection pool, opening it on first use.
+
+    The pool is bound to the event loop that first opens it. It uses the same
+    ``db_pool_*`` settings as the blocking pool in :mod:`cortana_common.db`.
+
+    Returns:
+        AsyncConnectionPool: Cached, opened connection pool.
+    """
+    pool = _create_async_db_pool()
+    if pool.closed:
+        await pool.open()
+        logger.info("Async database pool opened")
+    return pool
+
+
+async def close_async_db_pool() -> None:
+    """Close the process-wide async connection pool if it has been created."""
+    if _create_async_db_pool.cache_info().currsize == 0:
+        return
+
+    await _create_async_db_pool().close()
+    _create_async_db_pool.cache_clear()
+    logger.info("Async database pool closed")
+
+
+@asynccontextmanager
+async def get_async_db_connection() -> AsyncGenerator[psycopg.AsyncConnection, None]:
+    """Get a pooled async database connection with automatic cleanup.
+
+    The transaction is committed when the block exits normally and rolled
+    back on error; the connection is then returned to the shared pool.
+
+    Yields:
+        psycopg.AsyncConnection: Database connection with dict_row factory.
+
+    Example:
+        >>> async with get_async_db_connection() as conn:
+        ...     async with conn.cursor() as cur:
+        ...         await cur.execute("SELECT * FROM videos WHERE id = %s", (video_id,))
+        ...         video = await cur.fetchone()
+    """
+    pool = await get_async_db_pool()
+    try:
+        async with pool.connection() as conn:
+            yield conn
+    except Exception as e:
+        logger.error(f"Database error: {e}")
+        raise
+
+
+async def execute_query_async(
+    query: str,
+    params: Optional[tuple] = None,
+    fetch_one: bool = False,
+    fetch_all: bool = False,
+) -> Optional[Any]:
+    """Execute a SQL query on a pooled async connection.
+
+    Args:
+        query: SQL query string with %s placeholders.
+        params: Query parameters tuple.
+        fetch_one: If True, return single row.
+        fetch_all: If True, return all rows.
+
+    Returns:
+        Query result(s) or None for non-SELECT queries.
+    """
+    async with get_async_db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(query, params or ())
+
+            if fetch_one:
+                return await cur.fetchone()
+            elif fetch_all:
+                return await cur.fetchall()
+            else:
+                return None
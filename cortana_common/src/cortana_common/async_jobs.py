@@ -0,0 +1,537 @@
+"""Asyncio job queue runtime for I/O-bound workers."""
+
+import asyncio
+import logging
+import signal
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from contextlib import suppress
+from typing import Any, Optional
+from uuid import UUID
+
+import psycopg
+from psycopg import sql
+
+from cortana_common.async_db import get_async_db_connection
+from cortana_common.config import get_settings
+from cortana_common.db import get_conninfo
+from cortana_common.jobs import (
+    _ACK_JOBS_QUERY,
+    _CLAIM_JOBS_QUERY,
+    _COMPLETE_AND_CHAIN_QUERY,
+    _ENQUEUE_JOB_QUERY,
+    _EXTEND_LEASES_QUERY,
+    _NACK_JOBS_QUERY,
+    _NEXT_RUN_AFTER_QUERY,
+    _REAP_EXPIRED_JOBS_QUERY,
+    JobFailure,
+    NextJob,
+    _ack_params,
+    _claim_params,
+    _claimed_jobs,
+    _complete_and_chain_params,
+    _enqueue_params,
+    _extend_leases_params,
+    _fail_params,
+    _job_failure,
+    _listen_wait,
+    _log_ack_results,
+    _log_enqueue,
+    _log_failed_jobs,
+    _log_nack_results,
+    _nack_params,
+    job_channel,
+)
+from cortana_common.models import Job, JobStatus, JobType
+
+logger = logging.getLogger(__name__)
+
+
+async def poll_next_jobs_async(job_type: JobType, limit: int) -> list[Job]:
+    """Claim up to ``limit`` queued jobs of a specific type.
+
+    Async counterpart of :func:`cortana_common.jobs.poll_next_jobs`.
+
+    Args:
+        job_type: Type of job to poll for.
+        limit: Maximum number of jobs to claim.
+
+    Returns:
+        Claimed jobs in queue order (possibly empty).
+    """
+    if limit < 1:
+        return []
+
+    async with get_async_db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(_CLAIM_JOBS_QUERY, _claim_params(job_type, limit))
+            rows = await cur.fetchall()
+
+    return _claimed_jobs(rows)
+
+
+async def ack_jobs_async(job_ids: Sequence[UUID]) -> None:
+    """Mark a batch of jobs as successfully completed.
+
+    Async counterpart of :func:`cortana_common.jobs.ack_jobs`.
+
+    Args:
+        job_ids: IDs of the jobs to acknowledge.
+    """
+    if not job_ids:
+        return
+
+    async with get_async_db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(_ACK_JOBS_QUERY, _ack_params(job_ids))
+            rows = await cur.fetchall()
+
+    _log_ack_results(rows, job_ids)
+
+
+async def nack_jobs_async(failures: Sequence[JobFailure]) -> None:
+    """Mark a batch of jobs as failed with retry logic.
+
+    Async counterpart of :func:`cortana_common.jobs.nack_jobs`.
+
+    Args:
+        failures: Failed jobs with their error messages.
+    """
+    if not failures:
+        return
+
+    async with get_async_db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(_NACK_JOBS_QUERY, _nack_params(failures))
+            rows = await cur.fetchall()
+
+    _log_nack_results(rows, failures)
+
+
+async def enqueue_job_async(
+    video_id: UUID,
+    job_type: JobType,
+    payload: dict[str, Any],
+    priority: int = 0,
+) -> UUID:
+    """Create a new job in the queue.
+
+    Async counterpart of :func:`cortana_common.jobs.enqueue_job`.
+
+    Args:
+        video_id: Video ID for the job.
+        job_type: Type of job to create.
+        payload: Job payload dictionary.
+        priority: Claim priority; higher values are claimed first.
+
+    Returns:
+        UUID of the created job, or of the already active job.
+    """
+    async with get_async_db_connection() as conn:
+        async with conn.cursor() as cur:
+            row = None
+            while row is None:
+                await cur.execute(
+                    _ENQUEUE_JOB_QUERY, _enqueue_params(video_id, job_type, payload, priority)
+                )
+                row = await cur.fetchone()
+
+    _log_enqueue(row, video_id, job_type)
+    return row["id"]
+
+
+async def complete_and_chain_async(
+    job: Job,
+    next_type: JobType,
+    payload: dict[str, Any],
+    priority: int = 0,
+) -> Optional[UUID]:
+    """Mark a job as done and enqueue the next pipeline stage atomically.
+
+    Async counterpart of :func:`cortana_common.jobs.complete_and_chain`.
+
+    Args:
+        job: The job being completed.
+        next_type: Type of the next job.
+        payload: Payload for the next job.
+        priority: Claim priority of the next job.
+
+    Returns:
+        UUID of the next job (new or already active), or None if this worker
+        no longer holds the lease on ``job``.
+    """
+    async with get_async_db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                _COMPLETE_AND_CHAIN_QUERY,
+                _complete_and_chain_params(job, next_type, payload, priority),
+            )
+            row = await cur.fetchone()
+
+            if not row["completed"]:
+                logger.warning(f"Job {job.id} not completed: not found or lease lost")
+                return None
+
+            logger.info(f"Job {job.id} marked as done")
+            if row["job_id"] is not None:
+                logger.info(
+                    f"Enqueued job {row['job_id']} (type: {next_type.value}, video: {job.video_id})"
+                )
+                return row["job_id"]
+
+            row = None
+            while row is None:
+                await cur.execute(
+                    _ENQUEUE_JOB_QUERY, _enqueue_params(job.video_id, next_type, payload, priority)
+                )
+                row = await cur.fetchone()
+
+    _log_enqueue(row, job.video_id, next_type)
+    return row["id"]
+
+
+async def extend_leases_async(job_ids: Sequence[UUID]) -> list[UUID]:
+    """Renew this worker's lease on jobs it is still processing.
+
+    Async counterpart of :func:`cortana_common.jobs.extend_leases`.
+
+    Args:
+        job_ids: IDs of the jobs to renew.
+
+    Returns:
+        IDs whose lease was extended.
+    """
+    if not job_ids:
+        return []
+
+    async with get_async_db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(_EXTEND_LEASES_QUERY, _extend_leases_params(job_ids))
+            rows = await cur.fetchall()
+
+    return [row["id"] for row in rows]
+
+
+async def reap_expired_jobs_async(limit: int = 100) -> int:
+    """Requeue or fail jobs whose worker stopped renewing its lease.
+
+    Async counterpart of :func:`cortana_common.jobs.reap_expired_jobs`.
+
+    Args:
+        limit: Maximum number of jobs to reap in one call.
+
+    Returns:
+        Number of jobs reaped.
+    """
+    async with get_async_db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(_REAP_EXPIRED_JOBS_QUERY, {**_fail_params(), "limit": limit})
+            rows = await cur.fetchall()
+
+    if rows:
+        logger.warning(f"Reaped {len(rows)} jobs with expired leases")
+        _log_failed_jobs(rows)
+    return len(rows)
+
+
+async def seconds_until_next_job_async(job_type: JobType) -> Optional[float]:
+    """Time until the earliest backed-off retry of a type becomes claimable.
+
+    Async counterpart of :func:`cortana_common.jobs.seconds_until_next_job`.
+
+    Args:
+        job_type: Type of jobs to look at.
+
+    Returns:
+        Seconds until its ``run_after``, or None if no retry is waiting.
+    """
+    async with get_async_db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(_NEXT_RUN_AFTER_QUERY, (JobStatus.QUEUED.value, job_type.value))
+            row = await cur.fetchone()
+
+    return row["seconds"] if row else None
+
+
+class AsyncJobPoller:
+    """Asyncio job poller running many I/O-bound jobs in one process.
+
+    Each claimed job runs as its own task, so a worker waiting on S3 or
+    Postgres costs a coroutine rather than a thread. Claim, ack, nack and
+    enqueue share their SQL with :class:`cortana_common.jobs.JobPoller`.
+    """
+
+    def __init__(
+        self,
+        job_type: JobType,
+        listen: Optional[bool] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        """Initialize async job poller for a specific job type.
+
+        Args:
+            job_type: Type of jobs to poll for.
+            listen: Wake on LISTEN/NOTIFY instead of interval polling.
+                Defaults to the ``job_listen_enabled`` setting.
+            max_concurrency: Maximum number of jobs in flight. Defaults to
+                the ``job_async_max_concurrency`` setting.
+        """
+        self.job_type = job_type
+        self.settings = get_settings()
+        self.listen = self.settings.job_listen_enabled if listen is None else listen
+        self.max_concurrency = max_concurrency or self.settings.job_async_max_concurrency
+        self._stopping: Optional[asyncio.Event] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._next_reap = 0.0
+        logger.info(
+            f"AsyncJobPoller initialized for job_type: {job_type.value} "
+            f"(listen={self.listen}, max_concurrency={self.max_concurrency})"
+        )
+
+    async def poll_next_jobs(self, limit: int) -> list[Job]:
+        """Claim up to ``limit`` queued jobs.
+
+        Args:
+            limit: Maximum number of jobs to claim.
+
+        Returns:
+            Claimed jobs in queue order (possibly empty).
+        """
+        return await poll_next_jobs_async(self.job_type, limit)
+
+    async def ack_jobs(self, job_ids: Sequence[UUID]) -> None:
+        """Mark a batch of jobs as successfully completed.
+
+        Args:
+            job_ids: IDs of the jobs to acknowledge.
+        """
+        await ack_jobs_async(job_ids)
+
+    async def nack_jobs(self, failures: Sequence[JobFailure]) -> None:
+        """Mark a batch of jobs as failed.
+
+        Args:
+            failures: Failed jobs with their error messages.
+        """
+        await nack_jobs_async(failures)
+
+    async def reap_expired_jobs(self) -> int:
+        """Requeue jobs whose lease expired, at most every ``job_reap_interval``.
+
+        Returns:
+            Number of jobs reaped (0 if the interval has not elapsed).
+        """
+        now = time.monotonic()
+        if now < self._next_reap:
+            return 0
+        self._next_reap = now + self.settings.job_reap_interval
+        return await reap_expired_jobs_async()
+
+    async def complete_and_chain(
+        self,
+        job: Job,
+        next_type: JobType,
+        payload: dict[str, Any],
+        priority: int = 0,
+    ) -> Optional[UUID]:
+        """Mark a job as done and enqueue the next stage in one transaction.
+
+        Args:
+            job: The job being completed.
+            next_type: Type of the next job.
+            payload: Payload for the next job.
+            priority: Claim priority of the next job.
+
+        Returns:
+            UUID of the next job, or None if the lease on ``job`` was lost.
+        """
+        return await complete_and_chain_async(job, next_type, payload, priority)
+
+    async def enqueue_next_job(
+        self,
+        video_id: UUID,
+        next_job_type: JobType,
+        payload: dict[str, Any],
+        priority: int = 0,
+    ) -> UUID:
+        """Enqueue the next job in the pipeline.
+
+        Args:
+            video_id: Video ID for the job.
+            next_job_type: Type of the next job.
+            payload: Job payload dictionary.
+            priority: Claim priority; higher values are claimed first.
+
+        Returns:
+            UUID of the created job.
+        """
+        return await enqueue_job_async(video_id, next_job_type, payload, priority)
+
+    def stop(self) -> None:
+        """Stop claiming new jobs and return once in-flight jobs are settled."""
+        if self._stopping is not None and self._wakeup is not None:
+            self._stopping.set()
+            self._wakeup.set()
+
+    async def run_forever(self, process_func: Callable[[Job], Awaitable[None]]) -> None:
+        """Run the job polling loop until stopped.
+
+        On SIGTERM the poller stops claiming new jobs, waits for in-flight
+        jobs to finish, settles them and returns.
+
+        Args:
+            process_func: Coroutine function processing each job. Should
+                raise exceptions on failure. May return a
+                :class:`~cortana_common.jobs.NextJob` to complete the job and
+                enqueue the next pipeline stage atomically.
+        """
+        logger.info(f"Starting async job polling loop for {self.job_type.value}")
+
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        in_flight: dict[asyncio.Task, Job] = {}
+        listener: Optional[asyncio.Task] = None
+        heartbeat = asyncio.create_task(self._heartbeat(in_flight))
+
+        try:
+            loop.add_signal_handler(signal.SIGTERM, self._handle_sigterm)
+            signal_installed = True
+        except (NotImplementedError, RuntimeError):
+            signal_installed = False
+
+        if self.listen:
+            listener = asyncio.create_task(self._listen())
+
+        try:
+            while not self._stopping.is_set():
+                try:
+                    self._wakeup.clear()
+                    await self._settle_finished(in_flight)
+                    await self.reap_expired_jobs()
+
+                    free_slots = self.max_concurrency - len(in_flight)
+                    if free_slots > 0:
+                        for job in await self.poll_next_jobs(free_slots):
+                            logger.info(f"Processing job {job.id} (type: {job.job_type.value})")
+                            task = asyncio.create_task(process_func(job))
+                            in_flight[task] = job
+                            task.add_done_callback(lambda _: self._wakeup.set())
+
+                    if len(in_flight) >= self.max_concurrency:
+                        timeout = None
+                    elif listener is not None:
+                        timeout = await self._listen_wait()
+                    else:
+                        timeout = self.settings.job_poll_interval
+
+                    with suppress(TimeoutError):
+                        await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+                except Exception as e:
+                    logger.error(f"Unexpected error in polling loop: {e}")
+                    await asyncio.sleep(self.settings.job_poll_interval)
+
+            if in_flight:
+                logger.info(f"Waiting for {len(in_flight)} in-flight jobs to finish")
+                await asyncio.wait(in_flight)
+                await self._settle_finished(in_flight)
+        finally:
+            heartbeat.cancel()
+            if listener is not None:
+                listener.cancel()
+            if signal_installed:
+                loop.remove_signal_handler(signal.SIGTERM)
+
+        logger.info(f"Async job polling loop for {self.job_type.value} stopped")
+
+    async def _listen_wait(self) -> float:
+        """Seconds to block on notifications before polling again."""
+        fallback = self.settings.job_listen_fallback_interval
+        try:
+            return _listen_wait(await seconds_until_next_job_async(self.job_type), fallback)
+        except psycopg.Error as e:
+            logger.error(f"Could not look up the next run_after: {e}")
+            return fallback
+
+    def _handle_sigterm(self) -> None:
+        """Stop the poller on SIGTERM."""
+        logger.info("Received SIGTERM, draining in-flight jobs...")
+        self.stop()
+
+    async def _settle_finished(self, in_flight: dict[asyncio.Task, Job]) -> None:
+        """Ack/nack finished jobs in bulk and drop them from ``in_flight``."""
+        succeeded: list[tuple[Job, Any]] = []
+        failed: list[JobFailure] = []
+
+        for task in [t for t in in_flight if t.done()]:
+            job = in_flight.pop(task)
+            error = task.exception() if not task.cancelled() else asyncio.CancelledError()
+
+            if error is None:
+                succeeded.append((job, task.result()))
+                logger.info(f"Job {job.id} completed successfully")
+            else:
+                failed.append(_job_failure(job.id, error))
+
+        # Each settlement on its own, so one failed update cannot skip the rest
+        acked = [job.id for job, result in succeeded if not isinstance(result, NextJob)]
+        try:
+            await self.ack_jobs(acked)
+        except Exception as e:
+            logger.error(f"Failed to ack jobs {acked}: {e}")
+        for job, result in succeeded:
+            if isinstance(result, NextJob):
+                try:
+                    await self.complete_and_chain(job, *result)
+                except Exception as e:
+                    logger.error(f"Failed to complete job {job.id}: {e}")
+        try:
+            await self.nack_jobs(failed)
+        except Exception as e:
+            logger.error(f"Failed to nack jobs {[f.job_id for f in failed]}: {e}")
+
+    async def _heartbeat(self, in_flight: dict[asyncio.Task, Job]) -> None:
+        """Extend the lease on in-flight jobs every ``job_heartbeat_interval``.
+
+        Jobs whose lease could not be extended were reaped by another worker;
+        they are not renewed again, so their eventual ack/nack is stale.
+        """
+        lost: set[UUID] = set()
+        while True:
+            await asyncio.sleep(self.settings.job_heartbeat_interval)
+            running = {job.id for job in in_flight.values()}
+            # Settled jobs leave in_flight; forget them
+            lost &= running
+            held = [job_id for job_id in running if job_id not in lost]
+            if not held:
+                continue
+            try:
+                extended = set(await extend_leases_async(held))
+            except psycopg.Error as e:
+                logger.error(f"Failed to extend job leases: {e}")
+                continue
+            for job_id in held:
+                if job_id not in extended:
+                    logger.warning(f"Lost lease on job {job_id}")
+                    lost.add(job_id)
+
+    async def _listen(self) -> None:
+        """Turn LISTEN notifications into main-loop wakeups, reconnecting on error."""
+        assert self._wakeup is not None
+        channel = job_channel(self.job_type)
+
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    get_conninfo(), autocommit=True
+                ) as conn:
+                    await conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+                    logger.info(f"Listening for jobs on channel {channel}")
+                    # Catch anything enqueued before LISTEN took effect
+                    self._wakeup.set()
+                    async for _ in conn.notifies():
+                        self._wakeup.set()
+            except psycopg.Error as e:
+                logger.error(f"LISTEN on {channel} failed, falling back to polling: {e}")
+                await asyncio.sleep(self.settings.job_poll_interval)
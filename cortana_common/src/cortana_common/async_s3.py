@@ -0,0 +1,217 @@
+"""Asyncio S3 client wrapper for object storage access."""
+
+import asyncio
+import functools
+import logging
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Optional, TypeVar, Union
+from uuid import UUID
+
+from cortana_common.s3 import S3Client, TransferResult, get_s3_client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncS3Client:
+    """Asyncio facade over :class:`S3Client`.
+
+    boto3 has no native asyncio support, so each call runs on a dedicated,
+    bounded thread pool while the event loop keeps serving other jobs. The
+    pool size caps the number of S3 requests in flight for the whole process;
+    excess calls queue instead of opening more connections.
+    """
+
+    def __init__(self, client: Optional[S3Client] = None, max_concurrency: int = 32):
+        """Initialize async S3 client.
+
+        Args:
+            client: Blocking client to wrap (default: the cached S3 client).
+            max_concurrency: Maximum number of S3 calls running at once.
+        """
+        self.client = client or get_s3_client()
+        self.bucket = self.client.bucket
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="s3-async",
+        )
+        logger.info(f"Async S3 client initialized (max_concurrency={max_concurrency})")
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking client call on the S3 thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def upload_file(
+        self,
+        file_path: str,
+        s3_key: str,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """Upload a file to S3.
+
+        Args:
+            file_path: Local file path to upload.
+            s3_key: S3 object key (path in bucket).
+            content_type: Optional content type (e.g., 'video/mp4').
+
+        Returns:
+            S3 key of uploaded object.
+        """
+        return await self._run(self.client.upload_file, file_path, s3_key, content_type)
+
+    async def download_file(self, s3_key: str, local_path: str) -> str:
+        """Download a file from S3.
+
+        Args:
+            s3_key: S3 object key to download.
+            local_path: Local file path to save to.
+
+        Returns:
+            Local file path.
+        """
+        return await self._run(self.client.download_file, s3_key, local_path)
+
+    async def upload_many(
+        self,
+        objects: Mapping[str, Union[str, bytes]],
+        content_type: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> list[TransferResult]:
+        """Upload many small objects concurrently.
+
+        See :meth:`S3Client.upload_many`; the batch runs its own worker pool
+        and occupies one slot of this client's pool while it runs.
+
+        Args:
+            objects: Mapping of S3 key to local file path or object bytes.
+            content_type: Content type for every object (default: guessed).
+            max_workers: Concurrent uploads.
+
+        Returns:
+            One result per key, in input order.
+        """
+        return await self._run(self.client.upload_many, objects, content_type, max_workers)
+
+    async def download_many(
+        self,
+        s3_keys: Iterable[str],
+        local_dir: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> list[TransferResult]:
+        """Download many small objects concurrently.
+
+        Args:
+            s3_keys: S3 keys to download.
+            local_dir: Directory to write objects to (default: return bytes).
+            max_workers: Concurrent downloads.
+
+        Returns:
+            One result per key, in input order.
+        """
+        return await self._run(self.client.download_many, list(s3_keys), local_dir, max_workers)
+
+    async def get_object_range(self, s3_key: str, start: int, end: Optional[int] = None) -> bytes:
+        """Read a byte range of an object.
+
+        Args:
+            s3_key: S3 object key to read.
+            start: First byte offset.
+            end: Last byte offset, inclusive (default: end of object).
+
+        Returns:
+            The requested bytes.
+        """
+        return await self._run(self.client.get_object_range, s3_key, start, end)
+
+    def generate_presigned_url(
+        self,
+        s3_key: str,
+        expiration: int = 900,
+        http_method: str = "GET",
+    ) -> str:
+        """Generate a presigned URL for temporary access.
+
+        Signing is a local computation, so this does not leave the event loop.
+
+        Args:
+            s3_key: S3 object key.
+            expiration: URL expiration time in seconds (default: 15 minutes).
+            http_method: HTTP method (GET, PUT, etc.).
+
+        Returns:
+            Presigned URL string.
+        """
+        return self.client.generate_presigned_url(s3_key, expiration, http_method)
+
+    async def object_exists(self, s3_key: str) -> bool:
+        """Check if an object exists in S3.
+
+        Args:
+            s3_key: S3 object key to check.
+
+        Returns:
+            True if object exists, False otherwise.
+        """
+        return await self._run(self.client.object_exists, s3_key)
+
+    async def delete_object(self, s3_key: str) -> None:
+        """Delete an object from S3.
+
+        Args:
+            s3_key: S3 object key to delete.
+        """
+        await self._run(self.client.delete_object, s3_key)
+
+    async def delete_prefix(self, prefix: str) -> int:
+        """Delete every object below a prefix.
+
+        Args:
+            prefix: S3 key prefix; must not be empty.
+
+        Returns:
+            Number of objects deleted.
+        """
+        return await self._run(self.client.delete_prefix, prefix)
+
+    async def delete_video_objects(self, video_id: UUID) -> int:
+        """Delete every S3 object of a video.
+
+        Args:
+            video_id: Video whose objects to delete.
+
+        Returns:
+            Number of objects deleted.
+        """
+        return await self._run(self.client.delete_video_objects, video_id)
+
+    async def list_objects(self, prefix: str, max_keys: Optional[int] = None) -> list[str]:
+        """List objects with a given prefix.
+
+        Args:
+            prefix: S3 key prefix to filter by.
+            max_keys: Maximum number of keys to return (default: all).
+
+        Returns:
+            List of S3 object keys.
+        """
+        return await self._run(self.client.list_objects, prefix, max_keys)
+
+    def close(self) -> None:
+        """Shut down the S3 thread pool."""
+        self._executor.shutdown(wait=False)
+
+
+@lru_cache
+def get_async_s3_client() -> AsyncS3Client:
+    """Get cached async S3 client instance.
+
+    Returns:
+        AsyncS3Client: Cached async S3 client object.
+    """
+    return AsyncS3Client()
@@ -25,20 +25,101 @@ class Settings(BaseSettings):
         None, description="Direct PostgreSQL connection URL (optional)"
     )
 
+    db_pool_min_size: int = Field(
+        default=1, description="Connections kept open by the shared pool"
+    )
+    db_pool_max_size: int = Field(
+        default=10, description="Maximum connections in the shared pool"
+    )
+    db_pool_max_idle: float = Field(
+        default=300.0, description="Seconds before an idle pooled connection is closed"
+    )
+    db_pool_max_lifetime: float = Field(
+        default=3600.0, description="Seconds before a pooled connection is recycled"
+    )
+    db_pool_timeout: float = Field(
+        default=30.0, description="Seconds to wait for a free pooled connection"
+    )
+    db_copy_batch_size: int = Field(
+        default=10000, description="Rows per COPY statement in bulk_insert"
+    )
+
     s3_endpoint: str = Field(..., description="S3-compatible endpoint URL")
     s3_bucket: str = Field(..., description="S3 bucket name")
     s3_access_key_id: str = Field(..., description="S3 access key ID")
     s3_secret_access_key: str = Field(..., description="S3 secret access key")
     s3_region: str = Field(default="us-east-1", description="S3 region")
+    s3_multipart_threshold: int = Field(
+        default=64 * 1024 * 1024, description="Object size in bytes above which transfers go multipart"
+    )
+    s3_multipart_chunksize: int = Field(
+        default=64 * 1024 * 1024, description="Multipart part size in bytes"
+    )
+    s3_max_concurrency: int = Field(
+        default=16, description="Parallel part transfers per upload/download"
+    )
+    s3_max_pool_connections: Optional[int] = Field(
+        default=None,
+        description="HTTP connection pool size (default: max(s3_max_concurrency, 10))",
+    )
+    s3_read_ahead: int = Field(
+        default=8 * 1024 * 1024, description="Ranged GET size in bytes for streaming object reads"
+    )
+    s3_cache_dir: Optional[str] = Field(
+        default=None, description="Node-local directory for cached S3 objects (disabled if unset)"
+    )
+    s3_cache_max_bytes: int = Field(
+        default=50 * 1024 ** 3, description="Size bound of the node-local S3 object cache"
+    )
 
     job_poll_interval: int = Field(
         default=5, description="Job polling interval in seconds"
     )
+    job_listen_enabled: bool = Field(
+        default=False,
+        description="Wake pollers via LISTEN/NOTIFY instead of interval polling",
+    )
+    job_listen_fallback_interval: int = Field(
+        default=60,
+        description="Safety poll interval in seconds while waiting on LISTEN",
+    )
+    job_batch_size: int = Field(
+        default=1, description="Jobs claimed per poll by JobPoller"
+    )
+    job_max_concurrency: int = Field(
+        default=1, description="Jobs processed at once by JobPoller"
+    )
+    job_executor: str = Field(
+        default="thread",
+        description="Pool for concurrent JobPoller mode: thread or process",
+    )
+    job_async_max_concurrency: int = Field(
+        default=100, description="Jobs in flight per AsyncJobPoller"
+    )
+    job_lease_seconds: int = Field(
+        default=300, description="Lease duration stamped on claimed jobs"
+    )
+    job_heartbeat_interval: int = Field(
+        default=120, description="Seconds between lease extensions for running jobs"
+    )
+    job_reap_interval: int = Field(
+        default=60, description="Seconds between expired-lease sweeps by a poller"
+    )
+    job_archive_after_days: int = Field(
+        default=7, description="Days after finishing before a job moves to jobs_history"
+    )
+    job_archive_batch_size: int = Field(
+        default=10000, description="Jobs moved to jobs_history per archival transaction"
+    )
     job_max_retries: int = Field(default=3, description="Maximum job retry attempts")
     job_retry_base_delay: int = Field(
         default=60, description="Base delay for job retries in seconds"
     )
 
+    ocr_cache_max_bytes: int = Field(
+        default=5 * 1024 ** 3, description="Size bound of the shared OCR result cache table"
+    )
+
     log_level: str = Field(default="INFO", description="Logging level")
     log_format: str = Field(
         default="json", description="Log format: json or text"
@@ -1,20 +1,109 @@
 """Database utilities for PostgreSQL/Supabase access."""
 
 import logging
+import time
+import uuid
+from collections.abc import Iterable, Sequence
 from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 from typing import Any, Generator, Optional
 
 import psycopg
+from psycopg import sql
 from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
 
 from cortana_common.config import get_settings
 
 logger = logging.getLogger(__name__)
 
 
+def get_conninfo() -> str:
+    """Build the PostgreSQL connection string from settings.
+    
+    Returns:
+        Connection string, preferring ``DATABASE_URL`` when configured.
+    """
+    settings = get_settings()
+    
+    if settings.database_url:
+        return str(settings.database_url)
+    
+    supabase_url = settings.supabase_url.rstrip("/")
+    project_ref = supabase_url.split("//")[1].split(".")[0]
+    return f"postgresql://postgres.{project_ref}:5432/postgres"
+
+
+@lru_cache
+def get_db_pool() -> ConnectionPool:
+    """Get the process-wide connection pool.
+    
+    The pool is created lazily on first use and shared by every caller of
+    :func:`get_db_connection`. Connections are health-checked on checkout,
+    recycled after ``db_pool_max_lifetime`` and closed after sitting idle for
+    ``db_pool_max_idle`` seconds (down to ``db_pool_min_size``).
+    
+    Returns:
+        ConnectionPool: Cached, opened connection pool.
+    """
+    settings = get_settings()
+    
+    pool = ConnectionPool(
+        get_conninfo(),
+        kwargs={"row_factory": dict_row, "autocommit": False},
+        min_size=settings.db_pool_min_size,
+        max_size=settings.db_pool_max_size,
+        max_idle=settings.db_pool_max_idle,
+        max_lifetime=settings.db_pool_max_lifetime,
+        timeout=settings.db_pool_timeout,
+        check=ConnectionPool.check_connection,
+        name=settings.service_name or "cortana",
+        open=False,
+    )
+    pool.open()
+    logger.info(
+        f"Database pool opened (min_size={settings.db_pool_min_size}, "
+        f"max_size={settings.db_pool_max_size})"
+    )
+    return pool
+
+
+def close_db_pool() -> None:
+    """Close the process-wide connection pool if it has been created.
+    
+    Call this on worker shutdown so connections are returned to Postgres
+    cleanly. A subsequent :func:`get_db_connection` opens a fresh pool.
+    """
+    if get_db_pool.cache_info().currsize == 0:
+        return
+    
+    get_db_pool().close()
+    get_db_pool.cache_clear()
+    logger.info("Database pool closed")
+
+
+def get_pool_stats() -> dict[str, int]:
+    """Get usage statistics for the process-wide connection pool.
+    
+    Returns:
+        Dictionary of pool counters (``pool_size``, ``pool_available``,
+        ``requests_waiting``, ``requests_num``, ``connections_errors``, ...).
+        Empty if the pool has not been created yet.
+    """
+    if get_db_pool.cache_info().currsize == 0:
+        return {}
+    
+    return get_db_pool().get_stats()
+
+
 @contextmanager
 def get_db_connection() -> Generator[psycopg.Connection, None, None]:
-    """Get a database connection with automatic cleanup.
+    """Get a pooled database connection with automatic cleanup.
+    
+    The transaction is committed when the block exits normally and rolled
+    back on error; the connection is then returned to the shared pool
+    instead of being closed.
     
     Yields:
         psycopg.Connection: Database connection with dict_row factory.
@@ -25,35 +114,13 @@ def get_db_connection() -> Generator[psycopg.Connection, None, None]:
         ...         cur.execute("SELECT * FROM videos WHERE id = %s", (video_id,))
         ...         video = cur.fetchone()
     """
-    settings = get_settings()
-    
-    supabase_url = settings.supabase_url.rstrip("/")
-    project_ref = supabase_url.split("//")[1].split(".")[0]
-    
-    if settings.database_url:
-        conn_string = str(settings.database_url)
-    else:
-        conn_string = f"postgresql://postgres.{project_ref}:5432/postgres"
-    
-    conn = None
     try:
-        conn = psycopg.connect(
-            conn_string,
-            row_factory=dict_row,
-            autocommit=False,
-        )
-        logger.debug("Database connection established")
-        yield conn
-        conn.commit()
+        with get_db_pool().connection() as conn:
+            logger.debug("Database connection checked out")
+            yield conn
     except Exception as e:
-        if conn:
-            conn.rollback()
         logger.error(f"Database error: {e}")
         raise
-    finally:
-        if conn:
-            conn.close()
-            logger.debug("Database connection closed")
 
 
 def execute_query(
@@ -95,6 +162,8 @@ def execute_query(
 def execute_many(query: str, params_list: list[tuple]) -> None:
     """Execute a query multiple times with different parameters.
     
+    For loading many rows into one table, :func:`bulk_insert` is much faster.
+    
     Args:
         query: SQL query string with %s placeholders.
         params_list: List of parameter tuples.
@@ -108,3 +177,112 @@ def execute_many(query: str, params_list: list[tuple]) -> None:
     with get_db_connection() as conn:
         with conn.cursor() as cur:
             cur.executemany(query, params_list)
+
+
+# Type OIDs to dump each column with in binary COPY. Enum labels travel in
+# the same binary format as text, and domains in that of their base type, so
+# psycopg needs no dumper for custom types.
+_COPY_TYPES_QUERY = """
+SELECT a.attname,
+       CASE t.typtype
+           WHEN 'e' THEN 'text'::regtype::oid
+           WHEN 'd' THEN t.typbasetype
+           ELSE a.atttypid
+       END AS oid
+FROM pg_attribute a
+JOIN pg_type t ON t.oid = a.atttypid
+WHERE a.attrelid = %s::regclass
+  AND a.attnum > 0
+  AND NOT a.attisdropped
+"""
+
+
+def _copy_types(conn: psycopg.Connection, table: str, columns: Sequence[str]) -> list[int]:
+    """Type OIDs of ``columns`` of ``table`` for binary COPY."""
+    with conn.cursor(row_factory=dict_row) as cur:
+        cur.execute(_COPY_TYPES_QUERY, (table,))
+        oids = {row["attname"]: row["oid"] for row in cur.fetchall()}
+    return [oids[column] for column in columns]
+
+
+def bulk_insert(
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    id_column: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    binary: bool = True,
+    conn: Optional[psycopg.Connection] = None,
+) -> list[uuid.UUID]:
+    """Stream rows into a table with ``COPY ... FROM STDIN``.
+    
+    Rows are sent in ``COPY`` statements of ``batch_size`` rows each, all in
+    one transaction, so client memory stays bounded however long ``rows``
+    is. This is one round trip per batch instead of one per row with
+    :func:`execute_many`, and the server skips per-statement parsing and
+    planning.
+    
+    ``COPY`` cannot return generated values. With ``id_column``, ids are
+    generated client-side (uuid4, as ``gen_random_uuid()`` would) and
+    returned, so dependent rows (e.g. entities of segments) can reference
+    them in a later ``bulk_insert`` on the same connection.
+    
+    Args:
+        table: Table name.
+        columns: Columns the values of each row are for, in order.
+        rows: Row values. For binary COPY, values must have the column's
+            Python type (``UUID`` for uuid, ``dict`` for jsonb, ...).
+        id_column: Uuid primary key column to generate values for; it must
+            not be in ``columns``.
+        batch_size: Rows per ``COPY`` statement (default: ``db_copy_batch_size``).
+        binary: Use the binary COPY format (default); text is more lenient
+            about value types.
+        conn: Connection to use, e.g. to insert segments and their entities
+            in one transaction (default: a pooled connection, committed at
+            the end).
+    
+    Returns:
+        Generated ids in row order if ``id_column`` is set, otherwise empty.
+    
+    Example:
+        >>> segment_ids = bulk_insert(
+        ...     "segments",
+        ...     ["video_id", "owner_id", "text", "normalized_text", "text_hash",
+        ...      "confidence", "t_start", "t_end", "bounding_box"],
+        ...     segment_rows,
+        ...     id_column="id",
+        ... )
+    """
+    if conn is None:
+        with get_db_connection() as pooled:
+            return bulk_insert(table, columns, rows, id_column, batch_size, binary, pooled)
+    
+    batch_size = batch_size or get_settings().db_copy_batch_size
+    copy_columns = [id_column, *columns] if id_column else list(columns)
+    statement = sql.SQL("COPY {} ({}) FROM STDIN{}").format(
+        sql.Identifier(*table.split(".")),
+        sql.SQL(", ").join(map(sql.Identifier, copy_columns)),
+        sql.SQL(" (FORMAT BINARY)" if binary else ""),
+    )
+    types = _copy_types(conn, table, copy_columns) if binary else None
+    
+    ids: list[uuid.UUID] = []
+    count = 0
+    start = time.perf_counter()
+    iterator = iter(rows)
+    with conn.cursor() as cur:
+        while batch := list(islice(iterator, batch_size)):
+            with cur.copy(statement) as copy:
+                if types:
+                    copy.set_types(types)
+                for row in batch:
+                    if id_column:
+                        row_id = uuid.uuid4()
+                        ids.append(row_id)
+                        copy.write_row((row_id, *row))
+                    else:
+                        copy.write_row(row)
+            count += len(batch)
+    
+    logger.debug(f"Copied {count} rows into {table} in {time.perf_counter() - start:.2f}s")
+    return ids
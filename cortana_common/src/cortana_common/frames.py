@@ -0,0 +1,289 @@
+"""Packed keyframe shards with a manifest for byte-range access.
+
+The sampler appends encoded keyframes to a few large shard objects per video
+instead of writing one object per frame, and records where each frame lives
+in a manifest. The ``ocr`` job payload carries only the manifest key; the OCR
+worker reads frames back with ranged GETs, coalescing neighbouring frames
+into one request.
+
+Layout::
+
+    frames/{video_id}/manifest.json
+    frames/{video_id}/shard-00000.bin
+    frames/{video_id}/shard-00001.bin
+"""
+
+import logging
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from cortana_common.s3 import S3Client, get_s3_client
+
+logger = logging.getLogger(__name__)
+
+# Target shard size: large enough that a video needs only a few PUTs, small
+# enough that one shard is cheap to hold in memory while it is filled
+DEFAULT_SHARD_BYTES = 32 * 1024 * 1024
+
+# Largest single ranged GET when reading neighbouring frames together
+DEFAULT_MAX_RANGE_BYTES = 8 * 1024 * 1024
+
+
+def frame_manifest_key(video_id: UUID) -> str:
+    """S3 key of a video's keyframe manifest."""
+    return f"frames/{video_id}/manifest.json"
+
+
+def frame_shard_key(video_id: UUID, shard: int) -> str:
+    """S3 key of one of a video's keyframe shards."""
+    return f"frames/{video_id}/shard-{shard:05d}.bin"
+
+
+class FrameRecord(BaseModel):
+    """Location of one encoded keyframe inside its shard.
+    
+    When the sampler only emits the changed regions of a keyframe, a record
+    holds one region and ``x``/``y`` are its top-left corner in the full
+    frame; several records then share a ``timestamp_ms``. Such a region's
+    content usually stays on screen past the next keyframe, so the sampler
+    records in ``visible_until_ms`` when it scrolled off or changed.
+    """
+
+    timestamp_ms: int
+    offset: int
+    length: int
+    x: int = 0
+    y: int = 0
+    visible_until_ms: Optional[int] = None
+
+    def to_frame_box(self, box: dict[str, int]) -> dict[str, int]:
+        """Translate a bounding box within this image to full-frame coordinates.
+        
+        Args:
+            box: ``{x, y, width, height}`` relative to the encoded image.
+        
+        Returns:
+            The same box relative to the full frame, for ``segments.bounding_box``.
+        """
+        return {**box, "x": box["x"] + self.x, "y": box["y"] + self.y}
+
+
+class FrameShard(BaseModel):
+    """One shard object and the offset index of the frames it holds."""
+
+    key: str
+    size: int
+    frames: list[FrameRecord]
+
+
+class FrameManifest(BaseModel):
+    """All keyframes of a video, in timestamp order across shards."""
+
+    video_id: UUID
+    content_type: str = "image/jpeg"
+    duration_ms: Optional[int] = None
+    shards: list[FrameShard]
+
+    @property
+    def frame_count(self) -> int:
+        return sum(len(shard.frames) for shard in self.shards)
+
+
+class FrameShardWriter:
+    """Append encoded keyframes to shard objects and write their manifest.
+    
+    A shard is uploaded in the background as soon as it is full, while the
+    next one is being filled; at most one upload is in flight, so memory
+    stays at about two shards.
+    
+    Records returned by :meth:`add` can still be updated (e.g. their
+    ``visible_until_ms``) until :meth:`close` writes the manifest.
+    
+    Example:
+        with FrameShardWriter(video_id, duration_ms=info.duration_ms) as writer:
+            for keyframe, jpeg in frames:
+                writer.add(keyframe.timestamp_ms, jpeg)
+        enqueue_next_job(..., payload={"manifest_path": writer.manifest_key, ...})
+    """
+
+    def __init__(
+        self,
+        video_id: UUID,
+        client: Optional[S3Client] = None,
+        shard_bytes: int = DEFAULT_SHARD_BYTES,
+        content_type: str = "image/jpeg",
+        duration_ms: Optional[int] = None,
+    ):
+        """Initialize the writer.
+        
+        Args:
+            video_id: Video the keyframes belong to.
+            client: S3 client (default: the cached client).
+            shard_bytes: Size at which a shard is closed and uploaded.
+            content_type: Media type of every frame.
+            duration_ms: Length of the video, stored in the manifest.
+        """
+        self.video_id = video_id
+        self.client = client or get_s3_client()
+        self.shard_bytes = shard_bytes
+        self.content_type = content_type
+        self.duration_ms = duration_ms
+        self.manifest_key = frame_manifest_key(video_id)
+        self._shards: list[FrameShard] = []
+        self._buffer = bytearray()
+        self._records: list[FrameRecord] = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame-shards")
+        self._pending: Optional[Future] = None
+
+    def add(self, timestamp_ms: int, data: bytes, x: int = 0, y: int = 0) -> FrameRecord:
+        """Append one encoded frame or frame region.
+        
+        Args:
+            timestamp_ms: Frame timestamp; frames must be added in order.
+            data: Encoded image bytes.
+            x: Left edge of the region in the full frame.
+            y: Top edge of the region in the full frame.
+        
+        Returns:
+            The frame's record, as it will appear in the manifest.
+        """
+        record = FrameRecord(
+            timestamp_ms=timestamp_ms,
+            offset=len(self._buffer),
+            length=len(data),
+            x=x,
+            y=y,
+        )
+        self._records.append(record)
+        self._buffer += data
+        if len(self._buffer) >= self.shard_bytes:
+            self._flush()
+        return record
+
+    def close(self) -> FrameManifest:
+        """Upload the last shard and the manifest.
+        
+        Returns:
+            The manifest that was written to :attr:`manifest_key`.
+        
+        Raises:
+            ClientError: If a shard or the manifest could not be uploaded.
+        """
+        try:
+            self._flush()
+            self._wait()
+        finally:
+            self._executor.shutdown(wait=True)
+
+        manifest = FrameManifest(
+            video_id=self.video_id,
+            content_type=self.content_type,
+            duration_ms=self.duration_ms,
+            shards=self._shards,
+        )
+        self._put(self.manifest_key, manifest.model_dump_json().encode(), "application/json")
+        logger.info(
+            f"Wrote {manifest.frame_count} keyframes in {len(self._shards)} shards "
+            f"for video {self.video_id}"
+        )
+        return manifest
+
+    def __enter__(self) -> "FrameShardWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _flush(self) -> None:
+        """Close the current shard and start uploading it."""
+        if not self._records:
+            return
+        key = frame_shard_key(self.video_id, len(self._shards))
+        self._shards.append(FrameShard(key=key, size=len(self._buffer), frames=self._records))
+        data = bytes(self._buffer)
+        self._buffer = bytearray()
+        self._records = []
+        self._wait()
+        self._pending = self._executor.submit(self._put, key, data, self.content_type)
+
+    def _wait(self) -> None:
+        """Wait for the shard upload in flight, re-raising its error."""
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            pending.result()
+
+    def _put(self, key: str, data: bytes, content_type: str) -> None:
+        (result,) = self.client.upload_many({key: data}, content_type=content_type)
+        if not result.ok:
+            raise result.error
+
+
+def load_frame_manifest(manifest_key: str, client: Optional[S3Client] = None) -> FrameManifest:
+    """Read a keyframe manifest.
+    
+    Args:
+        manifest_key: S3 key of the manifest, e.g. from the ``ocr`` payload's
+            ``manifest_path``.
+        client: S3 client (default: the cached client).
+    
+    Returns:
+        The parsed manifest.
+    """
+    client = client or get_s3_client()
+    return FrameManifest.model_validate_json(client.get_object_range(manifest_key, 0))
+
+
+def read_frames(
+    manifest: FrameManifest,
+    client: Optional[S3Client] = None,
+    timestamps: Optional[Iterable[int]] = None,
+    max_range_bytes: int = DEFAULT_MAX_RANGE_BYTES,
+) -> Iterator[tuple[FrameRecord, bytes]]:
+    """Read keyframes with ranged GETs.
+    
+    Frames that sit next to each other in a shard are fetched together in
+    one request of up to ``max_range_bytes``; reading a whole video costs
+    about ``total size / max_range_bytes`` GETs instead of one per frame.
+    
+    Args:
+        manifest: Manifest of the video.
+        client: S3 client (default: the cached client).
+        timestamps: Only read frames with these timestamps (default: all).
+        max_range_bytes: Largest single ranged GET.
+    
+    Yields:
+        Each frame's record and encoded bytes, in manifest order.
+    """
+    client = client or get_s3_client()
+    wanted = set(timestamps) if timestamps is not None else None
+    for shard in manifest.shards:
+        records = [r for r in shard.frames if wanted is None or r.timestamp_ms in wanted]
+        group: list[FrameRecord] = []
+        for record in records:
+            if group and (
+                record.offset != group[-1].offset + group[-1].length
+                or record.offset + record.length - group[0].offset > max_range_bytes
+            ):
+                yield from _read_group(client, shard.key, group)
+                group = []
+            group.append(record)
+        if group:
+            yield from _read_group(client, shard.key, group)
+
+
+def _read_group(
+    client: S3Client, key: str, group: list[FrameRecord]
+) -> Iterator[tuple[FrameRecord, bytes]]:
+    """Fetch contiguous frames of one shard with a single ranged GET."""
+    start = group[0].offset
+    end = group[-1].offset + group[-1].length - 1
+    data = client.get_object_range(key, start, end)
+    for record in group:
+        yield record, data[record.offset - start:record.offset - start + record.length]
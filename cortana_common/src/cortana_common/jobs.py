@@ -1,31 +1,212 @@
 """Job queue helpers for database-driven job polling."""
 
 import logging
+import multiprocessing
+import os
 import random
+import signal
+import socket
+import threading
 import time
-from datetime import UTC, datetime
-from typing import Any, Optional
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, NamedTuple, Optional, Sequence
 from uuid import UUID
 
+import psycopg
+from psycopg import sql
+from psycopg.types.json import Jsonb
+
 from cortana_common.config import get_settings
-from cortana_common.db import get_db_connection
+from cortana_common.db import get_conninfo, get_db_connection
 from cortana_common.models import Job, JobStatus, JobType
 
 logger = logging.getLogger(__name__)
 
 
+class NonRetryableError(Exception):
+    """Raised by a job handler when retrying cannot help.
+
+    Use it for invalid payloads, missing source objects or permission errors:
+    the job goes straight to ``failed`` instead of being requeued.
+
+    Example:
+        >>> if not s3.object_exists(path):
+        ...     raise NonRetryableError(f"Original video {path} is gone")
+    """
+
+
+class JobFailure(NamedTuple):
+    """A failed job and the error to record for it."""
+
+    job_id: UUID
+    error: str
+    retryable: bool = True
+
+
+class NextJob(NamedTuple):
+    """Next pipeline stage, returned by a ``process_func`` to chain it atomically.
+
+    Example:
+        >>> def process_transcode_job(job: Job) -> NextJob:
+        ...     transcode(job)
+        ...     return NextJob(JobType.SAMPLE, {"video_id": str(job.video_id)})
+    """
+
+    job_type: JobType
+    payload: dict[str, Any]
+    priority: int = 0
+
+
+def _job_failure(job_id: UUID, error: BaseException) -> JobFailure:
+    """Log a job handler's exception and turn it into a :class:`JobFailure`."""
+    error_msg = f"{type(error).__name__}: {str(error)}"
+    retryable = not isinstance(error, NonRetryableError)
+    logger.error(f"Job {job_id} failed{'' if retryable else ' (not retryable)'}: {error_msg}")
+    return JobFailure(job_id, error_msg, retryable)
+
+
+def job_channel(job_type: JobType) -> str:
+    """Get the LISTEN/NOTIFY channel name for a job type.
+
+    Args:
+        job_type: Job type to get the channel for.
+
+    Returns:
+        Channel name, e.g. ``jobs_transcode``.
+    """
+    return f"jobs_{job_type.value}"
+
+
+class JobNotificationListener:
+    """Dedicated LISTEN connection that wakes a poller when jobs are queued.
+
+    The ``notify_job_queued`` trigger publishes on ``jobs_<job_type>`` whenever
+    a job is inserted or moved back to ``queued``. LISTEN needs a session-level
+    connection, so this uses its own autocommit connection instead of the
+    shared pool (and cannot go through a transaction-mode pgbouncer).
+    """
+
+    def __init__(self, job_type: JobType):
+        """Initialize listener for a specific job type.
+
+        Args:
+            job_type: Type of jobs to listen for.
+        """
+        self.channel = job_channel(job_type)
+        self._conn: Optional[psycopg.Connection] = None
+
+    def connect(self) -> None:
+        """Open the connection and subscribe to the job type's channel."""
+        self.close()
+        self._conn = psycopg.connect(get_conninfo(), autocommit=True)
+        self._conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+        logger.info(f"Listening for jobs on channel {self.channel}")
+
+    @property
+    def connected(self) -> bool:
+        """Whether the LISTEN connection is currently open."""
+        return self._conn is not None and not self._conn.closed
+
+    def wait(self, timeout: float) -> bool:
+        """Block until a job notification arrives or the timeout elapses.
+
+        Notifications that piled up while the worker was busy are drained, so
+        a burst of enqueues results in a single wakeup.
+
+        Args:
+            timeout: Maximum time to block in seconds.
+
+        Returns:
+            True if woken by a notification, False on timeout or error.
+        """
+        try:
+            if not self.connected:
+                self.connect()
+            assert self._conn is not None
+
+            notified = False
+            for _ in self._conn.notifies(timeout=timeout, stop_after=1):
+                notified = True
+            if notified:
+                for _ in self._conn.notifies(timeout=0):
+                    pass
+            return notified
+        except psycopg.Error as e:
+            logger.error(f"LISTEN on {self.channel} failed, falling back to polling: {e}")
+            self.close()
+            return False
+
+    def close(self) -> None:
+        """Close the LISTEN connection."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            finally:
+                self._conn = None
+
+
 class JobPoller:
     """Base class for job polling workers."""
 
-    def __init__(self, job_type: JobType):
+    def __init__(
+        self,
+        job_type: JobType,
+        listen: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        executor: Optional[str] = None,
+    ):
         """Initialize job poller for a specific job type.
         
         Args:
             job_type: Type of jobs to poll for.
+            listen: Block on LISTEN/NOTIFY between empty polls instead of
+                sleeping ``job_poll_interval``. Defaults to the
+                ``job_listen_enabled`` setting.
+            batch_size: Number of jobs to claim per poll. Jobs in a batch are
+                processed in order and settled with one bulk ack and one bulk
+                nack. Defaults to the ``job_batch_size`` setting.
+            max_concurrency: Maximum number of jobs processed at once. Above 1,
+                ``process_func`` runs on an executor and new jobs are only
+                claimed when a slot is free. Defaults to the
+                ``job_max_concurrency`` setting.
+            executor: ``"thread"`` or ``"process"`` pool for concurrent mode.
+                Process pools use the spawn start method, so ``process_func``
+                must be a picklable module-level function. Defaults to the
+                ``job_executor`` setting.
+
+        Raises:
+            ValueError: If ``executor`` is not ``"thread"`` or ``"process"``.
         """
         self.job_type = job_type
         self.settings = get_settings()
-        logger.info(f"JobPoller initialized for job_type: {job_type.value}")
+        self.listen = self.settings.job_listen_enabled if listen is None else listen
+        self.batch_size = batch_size or self.settings.job_batch_size
+        self.max_concurrency = max_concurrency or self.settings.job_max_concurrency
+        self.executor = executor or self.settings.job_executor
+        if self.executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor {self.executor!r}, expected 'thread' or 'process'")
+        self._listener: Optional[JobNotificationListener] = None
+        self._stopping = threading.Event()
+        self._wakeup = threading.Event()
+        # Claimed jobs whose lease the heartbeat keeps renewing
+        self._held: set[UUID] = set()
+        self._held_lock = threading.Lock()
+        self._next_reap = 0.0
+        logger.info(
+            f"JobPoller initialized for job_type: {job_type.value} "
+            f"(listen={self.listen}, batch_size={self.batch_size}, "
+            f"max_concurrency={self.max_concurrency}, executor={self.executor})"
+        )
 
     def poll_next_job(self) -> Optional[Job]:
         """Poll for the next queued job using SELECT FOR UPDATE SKIP LOCKED.
@@ -35,28 +216,118 @@ class JobPoller:
         """
         return poll_next_job(self.job_type)
 
+    def poll_next_jobs(self, limit: Optional[int] = None) -> list[Job]:
+        """Claim up to ``limit`` queued jobs in one round trip.
+
+        Args:
+            limit: Maximum number of jobs to claim (default: ``batch_size``).
+
+        Returns:
+            Claimed jobs in queue order (possibly empty).
+        """
+        jobs = poll_next_jobs(self.job_type, limit or self.batch_size)
+        with self._held_lock:
+            self._held.update(job.id for job in jobs)
+        return jobs
+
     def ack_job(self, job_id: UUID) -> None:
         """Mark a job as successfully completed.
         
         Args:
             job_id: ID of the job to acknowledge.
         """
-        ack_job(job_id)
+        self.ack_jobs([job_id])
+
+    def ack_jobs(self, job_ids: Sequence[UUID]) -> None:
+        """Mark a batch of jobs as successfully completed.
+
+        Args:
+            job_ids: IDs of the jobs to acknowledge.
+        """
+        try:
+            ack_jobs(job_ids)
+        finally:
+            self._release(job_ids)
 
-    def nack_job(self, job_id: UUID, error: str) -> None:
+    def nack_job(self, job_id: UUID, error: str, retryable: bool = True) -> None:
         """Mark a job as failed with error details.
         
         Args:
             job_id: ID of the job to mark as failed.
             error: Error message describing the failure.
+            retryable: Set to False to fail the job without retrying.
+        """
+        self.nack_jobs([JobFailure(job_id, error, retryable)])
+
+    def nack_jobs(self, failures: Sequence[JobFailure]) -> None:
+        """Mark a batch of jobs as failed.
+
+        Args:
+            failures: Failed jobs with their error messages.
+        """
+        try:
+            nack_jobs(failures)
+        finally:
+            self._release([failure.job_id for failure in failures])
+
+    def heartbeat(self) -> None:
+        """Extend the lease on every job this poller is still processing.
+
+        Jobs whose lease could not be extended were reaped by another worker;
+        they are dropped so their eventual ack/nack is recognised as stale.
+        """
+        with self._held_lock:
+            held = list(self._held)
+        if not held:
+            return
+
+        extended = set(extend_leases(held))
+        lost = [job_id for job_id in held if job_id not in extended]
+        for job_id in lost:
+            logger.warning(f"Lost lease on job {job_id}")
+        self._release(lost)
+
+    def reap_expired_jobs(self) -> int:
+        """Requeue jobs whose lease expired, at most every ``job_reap_interval``.
+
+        Returns:
+            Number of jobs reaped (0 if the interval has not elapsed).
+        """
+        now = time.monotonic()
+        if now < self._next_reap:
+            return 0
+        self._next_reap = now + self.settings.job_reap_interval
+        return reap_expired_jobs()
+
+    def complete_and_chain(
+        self,
+        job: Job,
+        next_type: JobType,
+        payload: dict[str, Any],
+        priority: int = 0,
+    ) -> Optional[UUID]:
+        """Mark a job as done and enqueue the next stage in one transaction.
+
+        Args:
+            job: The job being completed.
+            next_type: Type of the next job.
+            payload: Payload for the next job.
+            priority: Claim priority of the next job.
+
+        Returns:
+            UUID of the next job, or None if the lease on ``job`` was lost.
         """
-        nack_job(job_id, error)
+        try:
+            return complete_and_chain(job, next_type, payload, priority)
+        finally:
+            self._release([job.id])
 
     def enqueue_next_job(
         self,
         video_id: UUID,
         next_job_type: JobType,
         payload: dict[str, Any],
+        priority: int = 0,
     ) -> UUID:
         """Enqueue the next job in the pipeline.
         
@@ -64,48 +335,667 @@ class JobPoller:
             video_id: Video ID for the job.
             next_job_type: Type of the next job.
             payload: Job payload dictionary.
+            priority: Claim priority; higher values are claimed first.
             
         Returns:
             UUID of the created job.
         """
-        return enqueue_job(video_id, next_job_type, payload)
+        return enqueue_job(video_id, next_job_type, payload, priority)
+
+    def stop(self) -> None:
+        """Stop claiming new jobs and exit once in-flight jobs are settled.
+
+        Safe to call from signal handlers and other threads. ``run_forever``
+        installs this as the SIGTERM handler so rollouts drain gracefully.
+        """
+        self._stopping.set()
+        self._wakeup.set()
+
+    def wait_for_jobs(self) -> None:
+        """Wait until new jobs may be available.
+
+        In listen mode this blocks on the job type's NOTIFY channel until the
+        earliest delayed job is due, with ``job_listen_fallback_interval`` as
+        a safety poll in case a notification is missed. Otherwise it sleeps
+        ``job_poll_interval``. Returns early when the poller is stopped.
+        """
+        if self._listener is None:
+            self._stopping.wait(self.settings.job_poll_interval)
+            return
+
+        deadline = time.monotonic() + self._listen_wait()
+        while not self._stopping.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            # Short slices so a SIGTERM is noticed promptly
+            if self._listener.wait(min(remaining, 1.0)):
+                logger.debug(f"Woken by notification on {self._listener.channel}")
+                return
+            if not self._listener.connected:
+                # LISTEN connection is down; avoid a hot loop until it reconnects
+                self._stopping.wait(self.settings.job_poll_interval)
+                return
+
+    def _listen_wait(self) -> float:
+        """Seconds to block on notifications before polling again."""
+        fallback = self.settings.job_listen_fallback_interval
+        try:
+            return _listen_wait(seconds_until_next_job(self.job_type), fallback)
+        except psycopg.Error as e:
+            logger.error(f"Could not look up the next run_after: {e}")
+            return fallback
 
     def run_forever(self, process_func) -> None:
-        """Run the job polling loop forever.
+        """Run the job polling loop until stopped.
+
+        On SIGTERM or KeyboardInterrupt the poller stops claiming new jobs,
+        waits for in-flight jobs to finish, settles them and returns.
         
         Args:
             process_func: Function to process each job. Should accept a Job object.
-                         Should raise exceptions on failure.
+                         Should raise exceptions on failure. May return a
+                         :class:`NextJob` to complete the job and enqueue the
+                         next pipeline stage atomically.
         """
         logger.info(f"Starting job polling loop for {self.job_type.value}")
         
-        while True:
+        self._stopping.clear()
+        restore_signal_handler = self._install_signal_handler()
+        heartbeat_stop = threading.Event()
+        heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(heartbeat_stop,),
+            name=f"{self.job_type.value}-heartbeat",
+            daemon=True,
+        )
+        heartbeat_thread.start()
+
+        if self.listen:
+            # Subscribe before the first poll so no enqueue can slip in between
+            self._listener = JobNotificationListener(self.job_type)
+            try:
+                self._listener.connect()
+            except psycopg.Error as e:
+                logger.error(f"Could not LISTEN for {self.job_type.value} jobs: {e}")
+
+        try:
+            if self.max_concurrency > 1:
+                self._run_concurrent(process_func)
+            else:
+                self._run_loop(process_func)
+        finally:
+            # Keep leases alive until draining jobs have been settled
+            heartbeat_stop.set()
+            heartbeat_thread.join()
+            restore_signal_handler()
+            if self._listener is not None:
+                self._listener.close()
+                self._listener = None
+
+        logger.info(f"Job polling loop for {self.job_type.value} stopped")
+
+    def _install_signal_handler(self) -> Callable[[], None]:
+        """Route SIGTERM to :meth:`stop` and return a function that undoes it."""
+        if threading.current_thread() is not threading.main_thread():
+            return lambda: None
+
+        def handle_sigterm(signum, frame) -> None:
+            logger.info("Received SIGTERM, draining in-flight jobs...")
+            self.stop()
+
+        previous = signal.signal(signal.SIGTERM, handle_sigterm)
+        return lambda: signal.signal(signal.SIGTERM, previous)
+
+    def _run_loop(self, process_func) -> None:
+        """Poll and process jobs one at a time until stopped."""
+        while not self._stopping.is_set():
             try:
-                job = self.poll_next_job()
+                self.reap_expired_jobs()
+                jobs = self.poll_next_jobs()
                 
-                if job is None:
-                    time.sleep(self.settings.job_poll_interval)
+                if not jobs:
+                    self.wait_for_jobs()
                     continue
                 
-                logger.info(f"Processing job {job.id} (type: {job.job_type.value})")
+                succeeded: list[tuple[Job, Any]] = []
+                failed: list[JobFailure] = []
                 
-                try:
-                    process_func(job)
-                    
-                    self.ack_job(job.id)
-                    logger.info(f"Job {job.id} completed successfully")
+                for job in jobs:
+                    logger.info(f"Processing job {job.id} (type: {job.job_type.value})")
                     
-                except Exception as e:
-                    error_msg = f"{type(e).__name__}: {str(e)}"
-                    self.nack_job(job.id, error_msg)
-                    logger.error(f"Job {job.id} failed: {error_msg}")
+                    try:
+                        succeeded.append((job, process_func(job)))
+                        logger.info(f"Job {job.id} completed successfully")
+
+                    except Exception as e:
+                        failed.append(_job_failure(job.id, e))
+
+                self._settle(succeeded, failed)
                     
             except KeyboardInterrupt:
                 logger.info("Received interrupt signal, shutting down...")
                 break
             except Exception as e:
                 logger.error(f"Unexpected error in polling loop: {e}")
-                time.sleep(self.settings.job_poll_interval)
+                self._stopping.wait(self.settings.job_poll_interval)
+
+    def _run_concurrent(self, process_func) -> None:
+        """Process up to ``max_concurrency`` jobs at once until stopped."""
+        executor = self._create_executor()
+        in_flight: dict[Future, Job] = {}
+        listener_thread: Optional[threading.Thread] = None
+
+        if self._listener is not None:
+            listener_thread = threading.Thread(
+                target=self._forward_notifications,
+                args=(self._listener,),
+                name=f"{self.job_type.value}-listener",
+                daemon=True,
+            )
+            listener_thread.start()
+
+        try:
+            while not self._stopping.is_set():
+                try:
+                    self._wakeup.clear()
+                    self.reap_expired_jobs()
+
+                    if self._settle_finished(in_flight):
+                        logger.error("Executor is broken, starting a new one")
+                        executor.shutdown(wait=False)
+                        executor = self._create_executor()
+
+                    free_slots = self.max_concurrency - len(in_flight)
+                    if free_slots > 0:
+                        jobs = self.poll_next_jobs(free_slots)
+
+                        for job in jobs:
+                            logger.info(f"Processing job {job.id} (type: {job.job_type.value})")
+                            future = executor.submit(process_func, job)
+                            in_flight[future] = job
+                            future.add_done_callback(lambda _: self._wakeup.set())
+
+                    if len(in_flight) >= self.max_concurrency:
+                        # Every slot is busy; only a finished job can free one
+                        self._wakeup.wait()
+                    elif self._listener is not None:
+                        self._wakeup.wait(self._listen_wait())
+                    else:
+                        self._wakeup.wait(self.settings.job_poll_interval)
+
+                except KeyboardInterrupt:
+                    logger.info("Received interrupt signal, draining in-flight jobs...")
+                    self.stop()
+                except Exception as e:
+                    logger.error(f"Unexpected error in polling loop: {e}")
+                    self._stopping.wait(self.settings.job_poll_interval)
+
+            if in_flight:
+                logger.info(f"Waiting for {len(in_flight)} in-flight jobs to finish")
+                wait(in_flight)
+                self._settle_finished(in_flight)
+        finally:
+            executor.shutdown(wait=True)
+            if listener_thread is not None:
+                self._stopping.set()
+                listener_thread.join()
+
+    def _create_executor(self) -> Executor:
+        """Create the thread or process pool for concurrent mode."""
+        if self.executor == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.max_concurrency,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_ignore_sigterm,
+            )
+        return ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix=f"{self.job_type.value}-worker",
+        )
+
+    def _settle_finished(self, in_flight: dict[Future, Job]) -> bool:
+        """Ack/nack finished jobs in bulk and drop them from ``in_flight``.
+
+        Returns:
+            True if a job failed because the executor itself broke.
+        """
+        succeeded: list[tuple[Job, Any]] = []
+        failed: list[JobFailure] = []
+        broken = False
+
+        for future in [f for f in in_flight if f.done()]:
+            job = in_flight.pop(future)
+            error = future.exception()
+
+            if error is None:
+                succeeded.append((job, future.result()))
+                logger.info(f"Job {job.id} completed successfully")
+            else:
+                failed.append(_job_failure(job.id, error))
+                broken = broken or isinstance(error, BrokenExecutor)
+
+        self._settle(succeeded, failed)
+        return broken
+
+    def _settle(self, succeeded: list[tuple[Job, Any]], failed: list[JobFailure]) -> None:
+        """Ack, chain and nack finished jobs, each independently of the others.
+
+        A settlement that fails is logged and its jobs are left to lease
+        expiry; the rest of the batch is still settled.
+        """
+        acked = [job.id for job, result in succeeded if not isinstance(result, NextJob)]
+        try:
+            self.ack_jobs(acked)
+        except Exception as e:
+            logger.error(f"Failed to ack jobs {acked}: {e}")
+        for job, result in succeeded:
+            if isinstance(result, NextJob):
+                try:
+                    self.complete_and_chain(job, *result)
+                except Exception as e:
+                    logger.error(f"Failed to complete job {job.id}: {e}")
+        try:
+            self.nack_jobs(failed)
+        except Exception as e:
+            logger.error(f"Failed to nack jobs {[f.job_id for f in failed]}: {e}")
+
+    def _release(self, job_ids: Sequence[UUID]) -> None:
+        """Stop renewing the lease on settled jobs."""
+        with self._held_lock:
+            self._held.difference_update(job_ids)
+
+    def _heartbeat_loop(self, stop: threading.Event) -> None:
+        """Call :meth:`heartbeat` every ``job_heartbeat_interval`` until ``stop``."""
+        while not stop.wait(self.settings.job_heartbeat_interval):
+            try:
+                self.heartbeat()
+            except Exception as e:
+                logger.error(f"Failed to extend job leases: {e}")
+
+    def _forward_notifications(self, listener: JobNotificationListener) -> None:
+        """Turn LISTEN notifications into main-loop wakeups (concurrent mode)."""
+        while not self._stopping.is_set():
+            if listener.wait(1.0):
+                self._wakeup.set()
+            elif not listener.connected:
+                self._stopping.wait(self.settings.job_poll_interval)
+
+
+def _ignore_sigterm() -> None:
+    """Process pool initializer: leave SIGTERM handling to the parent poller."""
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+
+# Statements shared by the blocking API below and cortana_common.async_jobs
+
+_CLAIM_JOBS_QUERY = """
+    WITH next_jobs AS (
+        SELECT id FROM jobs
+        WHERE status = %s
+          AND job_type = %s
+          AND run_after <= now()
+        ORDER BY priority DESC, fair_key ASC
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE jobs
+    SET status = %s,
+        started_at = %s,
+        updated_at = %s,
+        locked_by = %s,
+        locked_until = now() + make_interval(secs => %s)
+    FROM next_jobs
+    WHERE jobs.id = next_jobs.id
+    RETURNING jobs.*
+"""
+
+# Only the lease holder may settle a job; a stale worker whose lease was
+# reaped must not overwrite the outcome of the job's next attempt.
+_ACK_JOBS_QUERY = """
+    UPDATE jobs
+    SET status = %s,
+        finished_at = %s,
+        updated_at = %s,
+        locked_by = NULL,
+        locked_until = NULL
+    WHERE id = ANY(%s)
+      AND status = %s
+      AND locked_by = %s
+    RETURNING id
+"""
+
+# Shared by nack and the lease reaper: record the error, then requeue the job
+# after an exponential backoff (see calculate_retry_delay) or fail it
+# permanently once it is out of retries or the error is not retryable.
+_FAIL_JOBS_SET_CLAUSE = """
+    SET status = CASE
+            WHEN f.retryable AND j.retry_count + 1 < %(max_retries)s THEN %(queued)s
+            ELSE %(failed)s
+        END::job_status,
+        retry_count = j.retry_count + 1,
+        payload = jsonb_set(
+            coalesce(j.payload, '{}'::jsonb),
+            '{errors}',
+            coalesce(j.payload -> 'errors', '[]'::jsonb) || jsonb_build_array(
+                jsonb_build_object(
+                    'message', f.error,
+                    'timestamp', %(now)s::timestamptz,
+                    'retry_count', j.retry_count
+                )
+            )
+        ),
+        finished_at = CASE
+            WHEN f.retryable AND j.retry_count + 1 < %(max_retries)s THEN NULL
+            ELSE %(now)s::timestamptz
+        END,
+        run_after = CASE
+            WHEN f.retryable AND j.retry_count + 1 < %(max_retries)s THEN
+                %(now)s::timestamptz + make_interval(
+                    secs => %(retry_base_delay)s * power(3, j.retry_count) * (0.8 + random() * 0.4)
+                )
+            ELSE j.run_after
+        END,
+        updated_at = %(now)s,
+        locked_by = NULL,
+        locked_until = NULL
+"""
+
+_NACK_JOBS_QUERY = (
+    "UPDATE jobs AS j"
+    + _FAIL_JOBS_SET_CLAUSE
+    + """
+    FROM unnest(
+        %(job_ids)s::uuid[], %(errors)s::text[], %(retryable)s::boolean[]
+    ) AS f(id, error, retryable)
+    WHERE j.id = f.id
+      AND j.status = %(processing)s
+      AND j.locked_by = %(worker_id)s
+    RETURNING j.id, j.status, j.retry_count, j.run_after
+"""
+)
+
+_REAP_EXPIRED_JOBS_QUERY = (
+    """
+    WITH f AS (
+        SELECT id, 'LeaseExpired: lease held by ' || coalesce(locked_by, 'unknown')
+            || ' expired' AS error,
+            true AS retryable
+        FROM jobs
+        WHERE status = %(processing)s
+          AND locked_until < now()
+        ORDER BY locked_until
+        LIMIT %(limit)s
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE jobs AS j"""
+    + _FAIL_JOBS_SET_CLAUSE
+    + """
+    FROM f
+    WHERE j.id = f.id
+    RETURNING j.id, j.status, j.retry_count, j.run_after
+"""
+)
+
+# Seconds until the earliest backed-off retry becomes claimable: negative if
+# one is claimable already, NULL if none is waiting. Only retries are delayed;
+# new jobs notify on insert. Served by idx_jobs_delayed_retries.
+_NEXT_RUN_AFTER_QUERY = """
+    SELECT EXTRACT(EPOCH FROM min(run_after) - now())::float8 AS seconds
+    FROM jobs
+    WHERE status = %s
+      AND job_type = %s
+      AND retry_count > 0
+"""
+
+# Shortest listen wait when a claimable job exists but could not be claimed
+# (e.g. it is locked by another worker's claim)
+_MIN_LISTEN_WAIT = 0.1
+
+_EXTEND_LEASES_QUERY = """
+    UPDATE jobs
+    SET locked_until = now() + make_interval(secs => %s)
+    WHERE id = ANY(%s)
+      AND status = %s
+      AND locked_by = %s
+    RETURNING id
+"""
+
+# Pipeline job types allow one active job per video (idx_jobs_video_pipeline_active);
+# a duplicate enqueue resolves to the already active job.
+_ACTIVE_JOB_CONFLICT = """
+    ON CONFLICT (video_id, job_type)
+        WHERE status IN ('queued', 'processing') AND job_type <> 'clip_generate'
+    DO NOTHING
+"""
+
+_ACTIVE_JOB_QUERY = """
+    SELECT id FROM jobs
+    WHERE video_id = %(video_id)s
+      AND job_type = %(job_type)s
+      AND status IN ('queued', 'processing')
+    LIMIT 1
+"""
+
+# fair_key is assigned by the assign_jobs_fair_key trigger
+_ENQUEUE_JOB_QUERY = (
+    """
+    WITH new_job AS (
+        INSERT INTO jobs (video_id, job_type, status, payload, priority)
+        VALUES (%(video_id)s, %(job_type)s, %(queued)s, %(payload)s, %(priority)s)"""
+    + _ACTIVE_JOB_CONFLICT
+    + """
+        RETURNING id
+    )
+    SELECT id, true AS created FROM new_job
+    UNION ALL
+    SELECT id, false AS created FROM ("""
+    + _ACTIVE_JOB_QUERY
+    + """) AS active
+    WHERE NOT EXISTS (SELECT 1 FROM new_job)
+"""
+)
+
+# Ack a job and enqueue the next pipeline stage in one statement, so a crash
+# can never leave a video with its stage done and nothing queued after it
+_COMPLETE_AND_CHAIN_QUERY = (
+    """
+    WITH done AS (
+        UPDATE jobs
+        SET status = %(done)s,
+            finished_at = %(now)s,
+            updated_at = %(now)s,
+            locked_by = NULL,
+            locked_until = NULL
+        WHERE id = %(job_id)s
+          AND status = %(processing)s
+          AND locked_by = %(worker_id)s
+        RETURNING video_id
+    ),
+    new_job AS (
+        INSERT INTO jobs (video_id, job_type, status, payload, priority)
+        SELECT video_id, %(job_type)s, %(queued)s, %(payload)s, %(priority)s
+        FROM done"""
+    + _ACTIVE_JOB_CONFLICT
+    + """
+        RETURNING id
+    )
+    SELECT EXISTS (SELECT 1 FROM done) AS completed,
+           (SELECT id FROM new_job) AS job_id
+"""
+)
+
+
+@lru_cache
+def get_worker_id() -> str:
+    """Get the identifier stamped on jobs this process has leased.
+
+    Returns:
+        The ``worker_id`` setting, or ``<hostname>:<pid>``.
+    """
+    return get_settings().worker_id or f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _claim_params(job_type: JobType, limit: int) -> tuple:
+    """Build parameters for ``_CLAIM_JOBS_QUERY``."""
+    now = datetime.now(UTC)
+    return (
+        JobStatus.QUEUED.value,
+        job_type.value,
+        limit,
+        JobStatus.PROCESSING.value,
+        now,
+        now,
+        get_worker_id(),
+        get_settings().job_lease_seconds,
+    )
+
+
+def _claimed_jobs(rows: list[dict[str, Any]]) -> list[Job]:
+    """Convert claimed rows to jobs in queue order."""
+    # UPDATE ... RETURNING does not preserve the subquery order
+    jobs = sorted((Job(**row) for row in rows), key=lambda job: (-job.priority, job.fair_key))
+    for job in jobs:
+        logger.debug(f"Polled job {job.id} (type: {job.job_type.value})")
+    return jobs
+
+
+def _ack_params(job_ids: Sequence[UUID]) -> tuple:
+    """Build parameters for ``_ACK_JOBS_QUERY``."""
+    now = datetime.now(UTC)
+    return (
+        JobStatus.DONE.value,
+        now,
+        now,
+        list(job_ids),
+        JobStatus.PROCESSING.value,
+        get_worker_id(),
+    )
+
+
+def _log_ack_results(rows: list[dict[str, Any]], job_ids: Sequence[UUID]) -> None:
+    """Log the outcome of a bulk ack."""
+    acked = {row["id"] for row in rows}
+    for job_id in job_ids:
+        if job_id in acked:
+            logger.info(f"Job {job_id} marked as done")
+        else:
+            logger.warning(f"Job {job_id} not acked: not found or lease lost")
+
+
+def _fail_params() -> dict[str, Any]:
+    """Build the parameters shared by ``_NACK_JOBS_QUERY`` and the reaper."""
+    return {
+        "max_retries": get_settings().job_max_retries,
+        "retry_base_delay": get_settings().job_retry_base_delay,
+        "queued": JobStatus.QUEUED.value,
+        "failed": JobStatus.FAILED.value,
+        "processing": JobStatus.PROCESSING.value,
+        "now": datetime.now(UTC),
+    }
+
+
+def _nack_params(failures: Sequence[JobFailure]) -> dict[str, Any]:
+    """Build parameters for ``_NACK_JOBS_QUERY``."""
+    return {
+        **_fail_params(),
+        "worker_id": get_worker_id(),
+        "job_ids": [failure.job_id for failure in failures],
+        "errors": [failure.error for failure in failures],
+        "retryable": [failure.retryable for failure in failures],
+    }
+
+
+def _log_failed_jobs(rows: list[dict[str, Any]]) -> None:
+    """Log requeued and permanently failed jobs."""
+    max_retries = get_settings().job_max_retries
+
+    for row in rows:
+        if row["status"] == JobStatus.QUEUED.value:
+            logger.info(
+                f"Job {row['id']} failed (retry {row['retry_count']}/{max_retries}), "
+                f"requeued to run after {row['run_after']}"
+            )
+        else:
+            logger.warning(
+                f"Job {row['id']} failed permanently after {row['retry_count']} attempts"
+            )
+
+
+def _log_nack_results(rows: list[dict[str, Any]], failures: Sequence[JobFailure]) -> None:
+    """Log the outcome of a bulk nack."""
+    _log_failed_jobs(rows)
+
+    found = {row["id"] for row in rows}
+    for failure in failures:
+        if failure.job_id not in found:
+            logger.error(f"Job {failure.job_id} not nacked: not found or lease lost")
+
+
+def _listen_wait(seconds_until_due: Optional[float], fallback: float) -> float:
+    """How long a listening poller may block before polling again.
+
+    Delayed jobs (retry backoff) send no notification when they become
+    claimable, so the wait ends when the earliest one is due, and after
+    ``fallback`` seconds at the latest.
+    """
+    if seconds_until_due is None:
+        return fallback
+    return min(fallback, max(seconds_until_due, _MIN_LISTEN_WAIT))
+
+
+def _extend_leases_params(job_ids: Sequence[UUID]) -> tuple:
+    """Build parameters for ``_EXTEND_LEASES_QUERY``."""
+    return (
+        get_settings().job_lease_seconds,
+        list(job_ids),
+        JobStatus.PROCESSING.value,
+        get_worker_id(),
+    )
+
+
+def _enqueue_params(
+    video_id: UUID,
+    job_type: JobType,
+    payload: dict[str, Any],
+    priority: int,
+) -> dict[str, Any]:
+    """Build parameters for ``_ENQUEUE_JOB_QUERY``."""
+    return {
+        "video_id": video_id,
+        "job_type": job_type.value,
+        "queued": JobStatus.QUEUED.value,
+        "payload": Jsonb(payload),
+        "priority": priority,
+    }
+
+
+def _log_enqueue(row: dict[str, Any], video_id: UUID, job_type: JobType) -> None:
+    """Log the outcome of ``_ENQUEUE_JOB_QUERY``."""
+    if row["created"]:
+        logger.info(f"Enqueued job {row['id']} (type: {job_type.value}, video: {video_id})")
+    else:
+        logger.info(
+            f"Job {row['id']} (type: {job_type.value}, video: {video_id}) is already active, "
+            f"skipping duplicate enqueue"
+        )
+
+
+def _complete_and_chain_params(
+    job: Job,
+    next_type: JobType,
+    payload: dict[str, Any],
+    priority: int,
+) -> dict[str, Any]:
+    """Build parameters for ``_COMPLETE_AND_CHAIN_QUERY``."""
+    return {
+        **_enqueue_params(job.video_id, next_type, payload, priority),
+        "job_id": job.id,
+        "done": JobStatus.DONE.value,
+        "processing": JobStatus.PROCESSING.value,
+        "worker_id": get_worker_id(),
+        "now": datetime.now(UTC),
+    }
 
 
 def poll_next_job(job_type: JobType) -> Optional[Job]:
@@ -125,43 +1015,39 @@ def poll_next_job(job_type: JobType) -> Optional[Job]:
         ...     # Process job
         ...     ack_job(job.id)
     """
-    query = """
-        UPDATE jobs
-        SET status = %s, started_at = %s, updated_at = %s
-        WHERE id = (
-            SELECT id FROM jobs
-            WHERE status = %s
-              AND job_type = %s
-            ORDER BY created_at ASC
-            LIMIT 1
-            FOR UPDATE SKIP LOCKED
-        )
-        RETURNING *
-    """
+    jobs = poll_next_jobs(job_type, 1)
+    return jobs[0] if jobs else None
+
+
+def poll_next_jobs(job_type: JobType, limit: int) -> list[Job]:
+    """Claim up to ``limit`` queued jobs of a specific type in one round trip.
     
-    now = datetime.now(UTC)
+    All returned jobs are moved to ``processing`` in a single statement using
+    SELECT FOR UPDATE SKIP LOCKED, so concurrent pollers never claim the same
+    job and never block on each other.
+
+    Args:
+        job_type: Type of job to poll for.
+        limit: Maximum number of jobs to claim.
+
+    Returns:
+        Claimed jobs in queue order (possibly empty).
+
+    Example:
+        >>> jobs = poll_next_jobs(JobType.SEGMENT_INDEX, 20)
+        >>> for job in jobs:
+        ...     process_job(job)
+        >>> ack_jobs([job.id for job in jobs])
+    """
+    if limit < 1:
+        return []
     
     with get_db_connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(
-                query,
-                (
-                    JobStatus.PROCESSING.value,
-                    now,
-                    now,
-                    JobStatus.QUEUED.value,
-                    job_type.value,
-                ),
-            )
-            
-            row = cur.fetchone()
-            
-            if row is None:
-                return None
-            
-            job = Job(**row)
-            logger.debug(f"Polled job {job.id} (type: {job.job_type.value})")
-            return job
+            cur.execute(_CLAIM_JOBS_QUERY, _claim_params(job_type, limit))
+            rows = cur.fetchall()
+
+    return _claimed_jobs(rows)
 
 
 def ack_job(job_id: UUID) -> None:
@@ -173,33 +1059,43 @@ def ack_job(job_id: UUID) -> None:
     Example:
         >>> ack_job(job.id)
     """
-    query = """
-        UPDATE jobs
-        SET status = %s, finished_at = %s, updated_at = %s
-        WHERE id = %s
-    """
+    ack_jobs([job_id])
+
+
+def ack_jobs(job_ids: Sequence[UUID]) -> None:
+    """Mark a batch of jobs as successfully completed in one statement.
     
-    now = datetime.now(UTC)
+    Only jobs still leased to this worker are updated; a job whose lease
+    expired and was reaped belongs to its next attempt.
+
+    Args:
+        job_ids: IDs of the jobs to acknowledge.
+
+    Example:
+        >>> ack_jobs([job.id for job in jobs])
+    """
+    if not job_ids:
+        return
     
     with get_db_connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(
-                query,
-                (JobStatus.DONE.value, now, now, job_id),
-            )
-            
-    logger.info(f"Job {job_id} marked as done")
+            cur.execute(_ACK_JOBS_QUERY, _ack_params(job_ids))
+            rows = cur.fetchall()
+
+    _log_ack_results(rows, job_ids)
 
 
-def nack_job(job_id: UUID, error: str) -> None:
+def nack_job(job_id: UUID, error: str, retryable: bool = True) -> None:
     """Mark a job as failed with error details and retry logic.
     
-    If retry_count < max_retries, the job is moved back to 'queued' status.
-    Otherwise, it remains in 'failed' status.
+    If retry_count < max_retries, the job is moved back to 'queued' status
+    and becomes claimable again after an exponential backoff. Otherwise, or
+    if the error is not retryable, it remains in 'failed' status.
     
     Args:
         job_id: ID of the job to mark as failed.
         error: Error message describing the failure.
+        retryable: Set to False to fail the job without retrying.
         
     Example:
         >>> try:
@@ -207,78 +1103,59 @@ def nack_job(job_id: UUID, error: str) -> None:
         ... except Exception as e:
         ...     nack_job(job.id, str(e))
     """
-    settings = get_settings()
+    nack_jobs([JobFailure(job_id, error, retryable)])
+
+
+def nack_jobs(failures: Sequence[JobFailure]) -> None:
+    """Mark a batch of jobs as failed in one statement.
     
-    query_get = "SELECT retry_count, payload FROM jobs WHERE id = %s"
+    Each job has its error appended to ``payload.errors`` and its retry count
+    incremented. Retryable jobs still under ``job_max_retries`` go back to
+    'queued' with ``run_after`` set by :func:`calculate_retry_delay`'s
+    backoff, the rest stay 'failed'. Jobs whose lease this worker no longer holds are
+    left untouched.
+
+    Args:
+        failures: Failed jobs with their error messages.
+
+    Example:
+        >>> nack_jobs([JobFailure(job.id, "TimeoutError: S3 read timed out")])
+    """
+    if not failures:
+        return
     
     with get_db_connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(query_get, (job_id,))
-            row = cur.fetchone()
-            
-            if row is None:
-                logger.error(f"Job {job_id} not found")
-                return
-            
-            retry_count = row["retry_count"]
-            payload = row["payload"] or {}
-            
-            if "errors" not in payload:
-                payload["errors"] = []
-            
-            payload["errors"].append({
-                "message": error,
-                "timestamp": datetime.now(UTC).isoformat(),
-                "retry_count": retry_count,
-            })
-            
-            new_retry_count = retry_count + 1
-            
-            if new_retry_count < settings.job_max_retries:
-                new_status = JobStatus.QUEUED.value
-                logger.info(
-                    f"Job {job_id} failed (retry {new_retry_count}/{settings.job_max_retries}), "
-                    f"moving back to queued"
-                )
-            else:
-                new_status = JobStatus.FAILED.value
-                logger.warning(
-                    f"Job {job_id} failed permanently after {new_retry_count} attempts"
-                )
-            
-            query_update = """
-                UPDATE jobs
-                SET status = %s,
-                    retry_count = %s,
-                    payload = %s,
-                    finished_at = %s,
-                    updated_at = %s
-                WHERE id = %s
-            """
-            
-            now = datetime.now(UTC)
-            finished_at = now if new_status == JobStatus.FAILED.value else None
-            
-            cur.execute(
-                query_update,
-                (new_status, new_retry_count, payload, finished_at, now, job_id),
-            )
+            cur.execute(_NACK_JOBS_QUERY, _nack_params(failures))
+            rows = cur.fetchall()
+
+    _log_nack_results(rows, failures)
 
 
 def enqueue_job(
     video_id: UUID,
     job_type: JobType,
     payload: dict[str, Any],
+    priority: int = 0,
 ) -> UUID:
     """Create a new job in the queue.
     
+    Jobs are claimed by priority, then fairly across tenants (the video's
+    team, or its owner): a tenant enqueuing a large batch is interleaved with
+    other tenants' jobs instead of delaying them by the whole batch.
+
+    Pipeline job types allow a single queued or processing job per video, so
+    enqueuing a duplicate is a no-op that returns the active job's ID.
+
     Args:
         video_id: Video ID for the job.
         job_type: Type of job to create.
         payload: Job payload dictionary.
+        priority: Claim priority; higher values are claimed first. Use it
+            for interactive work such as user-requested clips.
         
     Returns:
-        UUID of the created job.
+        UUID of the created job, or of the already active job.
         
     Example:
         >>> job_id = enqueue_job(
@@ -287,29 +1164,197 @@ def enqueue_job(
         ...     payload={"video_id": str(video.id), "s3_original_path": video.s3_original_path}
         ... )
     """
-    query = """
-        INSERT INTO jobs (video_id, job_type, status, payload)
-        VALUES (%s, %s, %s, %s)
-        RETURNING id
-    """
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            row = None
+            # No row only if the conflicting job finished mid-statement; retry
+            while row is None:
+                cur.execute(
+                    _ENQUEUE_JOB_QUERY, _enqueue_params(video_id, job_type, payload, priority)
+                )
+                row = cur.fetchone()
     
+    _log_enqueue(row, video_id, job_type)
+    return row["id"]
+
+
+def complete_and_chain(
+    job: Job,
+    next_type: JobType,
+    payload: dict[str, Any],
+    priority: int = 0,
+) -> Optional[UUID]:
+    """Mark a job as done and enqueue the next pipeline stage atomically.
+
+    Both happen in one statement and transaction, so a crash can never leave
+    a video with a finished stage and no follow-up job, and the hand-off
+    costs one round trip instead of two. If the next stage is already active
+    for the video, no duplicate is created.
+
+    Args:
+        job: The job being completed.
+        next_type: Type of the next job.
+        payload: Payload for the next job.
+        priority: Claim priority of the next job.
+
+    Returns:
+        UUID of the next job (new or already active), or None if this worker
+        no longer holds the lease on ``job`` and nothing was changed.
+
+    Example:
+        >>> complete_and_chain(job, JobType.SAMPLE, {"video_id": str(job.video_id)})
+    """
     with get_db_connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
-                query,
-                (video_id, job_type.value, JobStatus.QUEUED.value, payload),
+                _COMPLETE_AND_CHAIN_QUERY,
+                _complete_and_chain_params(job, next_type, payload, priority),
             )
+            row = cur.fetchone()
+
+            if not row["completed"]:
+                logger.warning(f"Job {job.id} not completed: not found or lease lost")
+                return None
+
+            logger.info(f"Job {job.id} marked as done")
+            if row["job_id"] is not None:
+                logger.info(
+                    f"Enqueued job {row['job_id']} (type: {next_type.value}, video: {job.video_id})"
+                )
+                return row["job_id"]
             
+            # The next stage is already active; resolve it in the same transaction
+            row = None
+            while row is None:
+                cur.execute(
+                    _ENQUEUE_JOB_QUERY, _enqueue_params(job.video_id, next_type, payload, priority)
+                )
+                row = cur.fetchone()
+
+    _log_enqueue(row, job.video_id, next_type)
+    return row["id"]
+
+
+def extend_leases(job_ids: Sequence[UUID]) -> list[UUID]:
+    """Renew this worker's lease on jobs it is still processing.
+
+    Args:
+        job_ids: IDs of the jobs to renew.
+
+    Returns:
+        IDs whose lease was extended. Missing IDs were reaped or settled
+        elsewhere and should no longer be considered owned.
+
+    Example:
+        >>> held = extend_leases([job.id for job in running])
+    """
+    if not job_ids:
+        return []
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(_EXTEND_LEASES_QUERY, _extend_leases_params(job_ids))
+            rows = cur.fetchall()
+
+    return [row["id"] for row in rows]
+
+
+def seconds_until_next_job(job_type: JobType) -> Optional[float]:
+    """Time until the earliest backed-off retry of a type becomes claimable.
+
+    Args:
+        job_type: Type of jobs to look at.
+
+    Returns:
+        Seconds until its ``run_after`` (zero or negative if it is
+        claimable now), or None if no retry is waiting.
+    """
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(_NEXT_RUN_AFTER_QUERY, (JobStatus.QUEUED.value, job_type.value))
             row = cur.fetchone()
-            job_id = row["id"]
+
+    return row["seconds"] if row else None
+
+
+def reap_expired_jobs(limit: int = 100) -> int:
+    """Requeue or fail jobs whose worker stopped renewing its lease.
+
+    A job left in ``processing`` past ``locked_until`` (worker crashed,
+    OOM-killed or partitioned) is treated as a failed attempt: the error is
+    recorded and the job is requeued, or failed once out of retries.
+
+    Args:
+        limit: Maximum number of jobs to reap in one call.
+
+    Returns:
+        Number of jobs reaped.
+
+    Example:
+        >>> reap_expired_jobs()
+        0
+    """
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(_REAP_EXPIRED_JOBS_QUERY, {**_fail_params(), "limit": limit})
+            rows = cur.fetchall()
+
+    if rows:
+        logger.warning(f"Reaped {len(rows)} jobs with expired leases")
+        _log_failed_jobs(rows)
+    return len(rows)
+
+
+def archive_finished_jobs(
+    older_than: Optional[timedelta] = None,
+    batch_size: Optional[int] = None,
+) -> int:
+    """Move finished jobs out of the live queue into ``jobs_history``.
+
+    Runs the ``archive_finished_jobs`` database function in batches, one
+    transaction each, until no more jobs qualify. Meant to run periodically
+    (e.g. from a CronJob), so the ``jobs`` table only holds live work.
+
+    Args:
+        older_than: Minimum age since ``finished_at`` (default:
+            ``job_archive_after_days``).
+        batch_size: Jobs moved per transaction (default:
+            ``job_archive_batch_size``).
             
-    logger.info(f"Enqueued job {job_id} (type: {job_type.value}, video: {video_id})")
-    return job_id
+    Returns:
+        Number of jobs archived.
+
+    Example:
+        >>> archive_finished_jobs(older_than=timedelta(days=1))
+        1520
+    """
+    settings = get_settings()
+    older_than = older_than or timedelta(days=settings.job_archive_after_days)
+    batch_size = batch_size or settings.job_archive_batch_size
+    total = 0
+
+    while True:
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT archive_finished_jobs(%s, %s) AS moved", (older_than, batch_size)
+                )
+                moved = cur.fetchone()["moved"]
+
+        total += moved
+        if moved < batch_size:
+            break
+
+    logger.info(f"Archived {total} finished jobs to jobs_history")
+    return total
 
 
 def calculate_retry_delay(retry_count: int) -> int:
     """Calculate retry delay with exponential backoff and jitter.
     
+    Nack and the lease reaper apply the same formula in SQL when setting a
+    requeued job's ``run_after``.
+
     Args:
         retry_count: Current retry attempt number (0-indexed).
         
@@ -46,6 +46,11 @@ class Job(BaseModel):
     payload: Optional[dict[str, Any]] = None
     started_at: Optional[datetime] = None
     finished_at: Optional[datetime] = None
+    locked_by: Optional[str] = None
+    locked_until: Optional[datetime] = None
+    run_after: Optional[datetime] = None
+    priority: int = 0
+    fair_key: float = 0.0
     created_at: datetime
     updated_at: datetime
 
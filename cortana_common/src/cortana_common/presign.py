@@ -0,0 +1,205 @@
+"""Cached presigned URLs and HLS playlist signing."""
+
+import logging
+import posixpath
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from cortana_common.s3 import S3Client, get_s3_client
+
+logger = logging.getLogger(__name__)
+
+# URI="..." attributes of tags such as #EXT-X-KEY and #EXT-X-MAP
+_TAG_URI = re.compile(r'URI="([^"]+)"')
+
+
+class PresignedUrlCache:
+    """Bounded LRU cache of presigned GET/PUT URLs.
+    
+    Signing is pure CPU work in botocore, but it adds up when every search
+    page signs 50 thumbnails and every playlist request signs hundreds of
+    segments. A cached URL is reused while it is still valid for at least
+    ``min_remaining`` seconds, so callers always hand out URLs with that much
+    validity left; past that point the entry counts as stale and is re-signed.
+    When the cache is full, stale entries are dropped first, then the least
+    recently used ones.
+    
+    Example:
+        cache = get_presigned_url_cache()
+        urls = cache.get_many(f"thumbs/{hit.video_id}/poster.jpg" for hit in hits)
+        print(cache.stats()["hit_ratio"])
+    """
+
+    def __init__(
+        self,
+        client: Optional[S3Client] = None,
+        max_entries: int = 10000,
+        expiration: int = 900,
+        min_remaining: int = 300,
+    ):
+        """Initialize the cache.
+        
+        Args:
+            client: S3 client used for signing (default: the cached client).
+            max_entries: Maximum number of cached URLs.
+            expiration: Validity of newly signed URLs in seconds.
+            min_remaining: Minimum validity in seconds of a URL served from
+                the cache; must be less than ``expiration``.
+        """
+        if not 0 <= min_remaining < expiration:
+            raise ValueError("min_remaining must be between 0 and expiration")
+        self.client = client or get_s3_client()
+        self.max_entries = max_entries
+        self.expiration = expiration
+        self.min_remaining = min_remaining
+        # (s3_key, http_method) -> (url, monotonic expiry time)
+        self._entries: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+        # (expiry, entry key) in signing order, which is also expiry order
+        self._expiries: deque[tuple[float, tuple[str, str]]] = deque()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, s3_key: str, http_method: str = "GET") -> str:
+        """Get a presigned URL, signing it only if no fresh one is cached.
+        
+        Args:
+            s3_key: S3 object key.
+            http_method: HTTP method (GET, PUT).
+        
+        Returns:
+            Presigned URL valid for at least ``min_remaining`` seconds.
+        """
+        entry_key = (s3_key, http_method)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None and entry[1] - time.monotonic() >= self.min_remaining:
+                self._entries.move_to_end(entry_key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        signed_at = time.monotonic()
+        url = self.client.generate_presigned_url(s3_key, self.expiration, http_method)
+
+        with self._lock:
+            self._entries[entry_key] = (url, signed_at + self.expiration)
+            self._entries.move_to_end(entry_key)
+            self._expiries.append((signed_at + self.expiration, entry_key))
+            self._evict()
+        return url
+
+    def get_many(self, s3_keys: Iterable[str], http_method: str = "GET") -> dict[str, str]:
+        """Get presigned URLs for several keys.
+        
+        Args:
+            s3_keys: S3 object keys.
+            http_method: HTTP method (GET, PUT).
+        
+        Returns:
+            Mapping of S3 key to presigned URL, in input order.
+        """
+        return {s3_key: self.get(s3_key, http_method) for s3_key in s3_keys}
+
+    def sign_playlist(self, playlist_key: str, playlist: Optional[str] = None) -> str:
+        """Rewrite an HLS media playlist so every URI is a presigned URL.
+        
+        Segment lines and ``URI="..."`` tag attributes (encryption keys,
+        init sections) are resolved relative to the playlist's own key and
+        replaced with cached presigned URLs in one pass; absolute URLs are
+        left alone. URLs only need to stay valid until the player requests
+        them, so use an ``expiration`` covering the longest video for VOD
+        playlists, which players fetch once.
+        
+        Args:
+            playlist_key: S3 key of the playlist, e.g.
+                ``videos/proxy/{video_id}/index.m3u8``.
+            playlist: Playlist text (default: read from ``playlist_key``).
+        
+        Returns:
+            Playlist text with signed URIs.
+        """
+        if playlist is None:
+            playlist = self.client.get_object_range(playlist_key, 0).decode("utf-8")
+
+        base = posixpath.dirname(playlist_key)
+        signed = 0
+
+        def sign(uri: str) -> str:
+            nonlocal signed
+            if "://" in uri:
+                return uri
+            signed += 1
+            return self.get(posixpath.normpath(posixpath.join(base, uri)))
+
+        lines = []
+        for line in playlist.splitlines():
+            stripped = line.strip()
+            if stripped.startswith("#"):
+                line = _TAG_URI.sub(lambda m: f'URI="{sign(m.group(1))}"', line)
+            elif stripped:
+                line = sign(stripped)
+            lines.append(line)
+
+        logger.debug(f"Signed {signed} URIs in {playlist_key}")
+        return "\n".join(lines) + "\n"
+
+    def stats(self) -> dict[str, float]:
+        """Get cache counters.
+        
+        Returns:
+            Dictionary with ``entries``, ``hits``, ``misses``, ``evictions``
+            and ``hit_ratio`` (0.0 before the first lookup).
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Drop all cached URLs (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._expiries.clear()
+
+    def _evict(self) -> None:
+        """Drop stale entries, then shrink to ``max_entries``; caller holds the lock."""
+        deadline = time.monotonic() + self.min_remaining
+        while self._expiries and self._expiries[0][0] < deadline:
+            expires, entry_key = self._expiries.popleft()
+            entry = self._entries.get(entry_key)
+            # Skip records of entries that were re-signed or already evicted
+            if entry is not None and entry[1] == expires:
+                del self._entries[entry_key]
+                self._evictions += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+        # Records of LRU-evicted or re-signed entries would otherwise pile up
+        # until they expire, growing with the signing rate instead of the cache
+        if len(self._expiries) > 2 * self.max_entries:
+            self._expiries = deque(
+                (expires, entry_key)
+                for expires, entry_key in self._expiries
+                if (entry := self._entries.get(entry_key)) is not None and entry[1] == expires
+            )
+
+
+@lru_cache
+def get_presigned_url_cache() -> PresignedUrlCache:
+    """Get cached presigned URL cache instance.
+    
+    Returns:
+        PresignedUrlCache: Process-wide cache over the cached S3 client.
+    """
+    return PresignedUrlCache()
@@ -1,35 +1,261 @@
 """S3 client utilities for object storage access."""
 
+import fcntl
+import hashlib
+import io
+import itertools
+import json
 import logging
-from typing import Optional
+import mimetypes
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack, contextmanager, suppress
+from datetime import datetime, timedelta
+from typing import Callable, Generator, Iterable, Iterator, Mapping, NamedTuple, Optional, Union
+from uuid import UUID
 from functools import lru_cache
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
 
 from cortana_common.config import get_settings
 
 logger = logging.getLogger(__name__)
 
 
+# Every prefix holding objects of one video (see docs/s3-bucket.md)
+VIDEO_PREFIXES = (
+    "videos/original/{video_id}/",
+    "videos/proxy/{video_id}/",
+    "videos/clips/{video_id}/",
+    "frames/{video_id}/",
+    "thumbs/{video_id}/",
+)
+
+# Maximum keys per DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+
+
+class TransferResult(NamedTuple):
+    """Outcome of one object in an :meth:`S3Client.upload_many`,
+    :meth:`S3Client.download_many` or :meth:`S3Client.delete_many` call."""
+
+    s3_key: str
+    error: Optional[Exception] = None
+    attempts: int = 1
+    data: Optional[bytes] = None
+    local_path: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ScanCursor(NamedTuple):
+    """Position of an incremental :meth:`S3Client.scan_new_objects` scan."""
+
+    # Every key up to this one has been yielded (used with ordered keys)
+    start_after: Optional[str] = None
+    # Every object modified at or before this time has been yielded
+    horizon: Optional[datetime] = None
+    # Keys modified after the horizon that have already been yielded
+    recent: frozenset[str] = frozenset()
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether a failed request may succeed if repeated.
+
+    Connection errors and 5xx/throttling responses are retried; other 4xx
+    responses (missing key, access denied, bad request) are not.
+    """
+    if isinstance(error, ClientError):
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 500)
+        return status >= 500 or status in (408, 429)
+    return isinstance(error, BotoCoreError)
+
+
+def _is_retryable_delete(error: Exception) -> bool:
+    """Whether a whole DeleteObjects request, or one key in it, may be retried.
+
+    Per-key errors carry only an error code, not an HTTP status.
+    """
+    if isinstance(error, ClientError) and "ResponseMetadata" not in error.response:
+        return error.response["Error"]["Code"] in ("InternalError", "SlowDown", "ServiceUnavailable")
+    return _is_retryable(error)
+
+
+def _log_transfer(action: str, s3_uri: str, local_path: str, size: int, elapsed: float) -> None:
+    """Log a completed transfer with its throughput."""
+    mb = size / 1024 / 1024
+    rate = mb / elapsed if elapsed > 0 else float("inf")
+    logger.info(f"{action} {s3_uri} ({local_path}): {mb:.1f} MiB in {elapsed:.2f}s ({rate:.1f} MiB/s)")
+
+
+class S3ObjectReader(io.RawIOBase):
+    """Seekable, read-only file object over an S3 object.
+
+    Data is fetched with ranged GETs of ``read_ahead`` bytes. While the caller
+    reads sequentially, the next range is fetched in the background so the
+    stream never waits on a full round trip; a seek elsewhere discards the
+    prefetch and fetches only the range around the new position. Every GET
+    is pinned to the ETag seen at open, so an object overwritten mid-read
+    fails with ``PreconditionFailed`` instead of returning mixed data.
+
+    Example:
+        with s3.open_object("videos/original/abc/master.mp4") as f:
+            f.seek(-1024 * 1024, io.SEEK_END)
+            tail = f.read()
+    """
+
+    def __init__(self, client, bucket: str, s3_key: str, read_ahead: int):
+        """Open an S3 object for reading.
+
+        Args:
+            client: boto3 S3 client.
+            bucket: Bucket name.
+            s3_key: S3 object key.
+            read_ahead: Size in bytes of each ranged GET.
+        """
+        super().__init__()
+        head = client.head_object(Bucket=bucket, Key=s3_key)
+        self.size: int = head["ContentLength"]
+        self.etag: str = head["ETag"]
+        self.name = f"s3://{bucket}/{s3_key}"
+        self._client = client
+        self._bucket = bucket
+        self._key = s3_key
+        self._read_ahead = max(1, read_ahead)
+        self._pos = 0
+        self._window_start = 0
+        self._window = b""
+        self._prefetch: Optional[tuple[int, Future]] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move the read position; seeking past the end is allowed."""
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError(f"Negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer) -> int:
+        """Fill ``buffer`` from the current position; returns 0 at EOF."""
+        view = memoryview(buffer).cast("B")
+        filled = 0
+        while filled < len(view) and self._pos < self.size:
+            offset = self._pos - self._window_start
+            if not 0 <= offset < len(self._window):
+                self._load_window(self._pos)
+                offset = 0
+            n = min(len(view) - filled, len(self._window) - offset)
+            view[filled:filled + n] = self._window[offset:offset + n]
+            filled += n
+            self._pos += n
+        return filled
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._prefetch = None
+        self._window = b""
+        super().close()
+
+    def _load_window(self, start: int) -> None:
+        """Make the range starting at ``start`` the current window."""
+        sequential = start == self._window_start + len(self._window)
+        prefetch, self._prefetch = self._prefetch, None
+        if prefetch is not None and prefetch[0] == start:
+            self._window = prefetch[1].result()
+        else:
+            if prefetch is not None:
+                prefetch[1].cancel()
+            self._window = self._get_range(start)
+        self._window_start = start
+
+        next_start = start + len(self._window)
+        if (sequential or start == 0) and next_start < self.size:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="s3-read-ahead")
+            self._prefetch = (next_start, self._executor.submit(self._get_range, next_start))
+
+    def _get_range(self, start: int) -> bytes:
+        """GET ``read_ahead`` bytes starting at ``start``."""
+        end = min(start + self._read_ahead, self.size) - 1
+        response = self._client.get_object(
+            Bucket=self._bucket,
+            Key=self._key,
+            Range=f"bytes={start}-{end}",
+            IfMatch=self.etag,
+        )
+        return response["Body"].read()
+
+
 class S3Client:
-    """S3 client wrapper with helper methods."""
+    """S3 client wrapper with helper methods.
+
+    Files above ``s3_multipart_threshold`` are transferred in
+    ``s3_multipart_chunksize`` parts, ``s3_max_concurrency`` at a time, so
+    multi-GB originals are not limited to single-stream throughput. The HTTP
+    connection pool is sized to match, since boto3's default of 10 would
+    otherwise cap part concurrency.
+    """
 
     def __init__(self):
         """Initialize S3 client from settings."""
         settings = get_settings()
         
         self.bucket = settings.s3_bucket
+        max_pool_connections = settings.s3_max_pool_connections or max(
+            settings.s3_max_concurrency, 10
+        )
+        self.max_pool_connections = max_pool_connections
         self.client = boto3.client(
             "s3",
             endpoint_url=settings.s3_endpoint,
             aws_access_key_id=settings.s3_access_key_id,
             aws_secret_access_key=settings.s3_secret_access_key,
             region_name=settings.s3_region,
-            config=Config(signature_version="s3v4"),
+            config=Config(
+                signature_version="s3v4",
+                max_pool_connections=max_pool_connections,
+            ),
+        )
+        self.read_ahead = settings.s3_read_ahead
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.s3_multipart_threshold,
+            multipart_chunksize=settings.s3_multipart_chunksize,
+            max_concurrency=settings.s3_max_concurrency,
+            use_threads=True,
+        )
+        logger.info(
+            f"S3 client initialized for bucket: {self.bucket} "
+            f"(max_concurrency={settings.s3_max_concurrency}, "
+            f"chunksize={settings.s3_multipart_chunksize}, "
+            f"max_pool_connections={max_pool_connections})"
         )
-        logger.info(f"S3 client initialized for bucket: {self.bucket}")
 
     def upload_file(
         self,
@@ -55,13 +281,21 @@ class S3Client:
             extra_args["ContentType"] = content_type
             
         try:
+            start = time.monotonic()
             self.client.upload_file(
                 file_path,
                 self.bucket,
                 s3_key,
                 ExtraArgs=extra_args if extra_args else None,
+                Config=self.transfer_config,
+            )
+            _log_transfer(
+                "Uploaded to",
+                f"s3://{self.bucket}/{s3_key}",
+                file_path,
+                os.path.getsize(file_path),
+                time.monotonic() - start,
             )
-            logger.info(f"Uploaded {file_path} to s3://{self.bucket}/{s3_key}")
             return s3_key
         except ClientError as e:
             logger.error(f"Failed to upload {file_path}: {e}")
@@ -81,13 +315,193 @@ class S3Client:
             ClientError: If download fails.
         """
         try:
-            self.client.download_file(self.bucket, s3_key, local_path)
-            logger.info(f"Downloaded s3://{self.bucket}/{s3_key} to {local_path}")
+            start = time.monotonic()
+            self.client.download_file(
+                self.bucket, s3_key, local_path, Config=self.transfer_config
+            )
+            _log_transfer(
+                "Downloaded",
+                f"s3://{self.bucket}/{s3_key}",
+                local_path,
+                os.path.getsize(local_path),
+                time.monotonic() - start,
+            )
             return local_path
         except ClientError as e:
             logger.error(f"Failed to download {s3_key}: {e}")
             raise
 
+    def upload_many(
+        self,
+        objects: Mapping[str, Union[str, bytes]],
+        content_type: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        attempts: int = 3,
+    ) -> list[TransferResult]:
+        """Upload many small objects concurrently.
+
+        Each upload is a single PUT from memory or from a local file, run on a
+        thread pool that shares the client's connection pool. Files at or
+        above ``s3_multipart_threshold`` fall back to :meth:`upload_file`.
+        Failed uploads are retried individually; one failure never aborts the
+        others.
+
+        Args:
+            objects: Mapping of S3 key to local file path or object bytes.
+            content_type: Content type for every object (default: guessed
+                from each key's extension).
+            max_workers: Concurrent uploads (default and maximum: the
+                connection pool size).
+            attempts: Tries per object for retryable errors.
+
+        Returns:
+            One result per key, in input order.
+
+        Example:
+            results = s3.upload_many({
+                f"frames/{video_id}/{ts}.jpg": jpeg for ts, jpeg in frames
+            })
+            failed = [r.s3_key for r in results if not r.ok]
+        """
+        def upload(s3_key: str, source: Union[str, bytes]) -> TransferResult:
+            extra_args = {}
+            object_type = content_type or mimetypes.guess_type(s3_key)[0]
+            if object_type:
+                extra_args["ContentType"] = object_type
+            if isinstance(source, bytes):
+                self.client.put_object(Bucket=self.bucket, Key=s3_key, Body=source, **extra_args)
+            elif os.path.getsize(source) >= self.transfer_config.multipart_threshold:
+                self.upload_file(source, s3_key, object_type)
+            else:
+                with open(source, "rb") as f:
+                    self.client.put_object(Bucket=self.bucket, Key=s3_key, Body=f, **extra_args)
+            return TransferResult(s3_key)
+
+        return self._transfer_many("Uploaded", objects.items(), upload, max_workers, attempts)
+
+    def download_many(
+        self,
+        s3_keys: Iterable[str],
+        local_dir: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        attempts: int = 3,
+    ) -> list[TransferResult]:
+        """Download many small objects concurrently.
+
+        Args:
+            s3_keys: S3 keys to download.
+            local_dir: Directory to write objects to, at their key's path
+                below it. If omitted, object bytes are returned in each
+                result's ``data`` and nothing touches the disk.
+            max_workers: Concurrent downloads (default and maximum: the
+                connection pool size).
+            attempts: Tries per object for retryable errors.
+
+        Returns:
+            One result per key, in input order.
+        """
+        def download(s3_key: str, _: None) -> TransferResult:
+            response = self.client.get_object(Bucket=self.bucket, Key=s3_key)
+            data = response["Body"].read()
+            if local_dir is None:
+                return TransferResult(s3_key, data=data)
+            local_path = os.path.join(local_dir, s3_key)
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            with open(local_path, "wb") as f:
+                f.write(data)
+            return TransferResult(s3_key, local_path=local_path)
+
+        items = [(s3_key, None) for s3_key in s3_keys]
+        return self._transfer_many("Downloaded", items, download, max_workers, attempts)
+
+    def _transfer_many(
+        self,
+        action: str,
+        items: Iterable[tuple],
+        transfer: Callable[..., TransferResult],
+        max_workers: Optional[int],
+        attempts: int,
+    ) -> list[TransferResult]:
+        """Run ``transfer(key, source)`` for each item on a bounded thread pool."""
+        def run(s3_key: str, source) -> TransferResult:
+            for attempt in range(1, attempts + 1):
+                try:
+                    return transfer(s3_key, source)._replace(attempts=attempt)
+                except (ClientError, BotoCoreError, OSError) as e:
+                    if attempt == attempts or not _is_retryable(e):
+                        logger.error(
+                            f"{action} s3://{self.bucket}/{s3_key} failed after "
+                            f"{attempt} attempt(s): {e}"
+                        )
+                        return TransferResult(s3_key, error=e, attempts=attempt)
+                    delay = min(0.1 * 2 ** (attempt - 1), 5.0) * random.uniform(0.5, 1.5)
+                    logger.warning(
+                        f"{action} s3://{self.bucket}/{s3_key} attempt {attempt} failed, "
+                        f"retrying in {delay:.2f}s: {e}"
+                    )
+                    time.sleep(delay)
+
+        # More workers than pooled connections would only churn connections
+        workers = min(max_workers or self.max_pool_connections, self.max_pool_connections)
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-bulk") as executor:
+            futures = [executor.submit(run, s3_key, source) for s3_key, source in items]
+            results = [future.result() for future in futures]
+
+        elapsed = time.monotonic() - start
+        failed = sum(1 for r in results if not r.ok)
+        rate = len(results) / elapsed if elapsed > 0 else float("inf")
+        logger.info(
+            f"{action} {len(results) - failed}/{len(results)} objects in {elapsed:.2f}s "
+            f"({rate:.0f} objects/s, {workers} workers, {failed} failed)"
+        )
+        return results
+
+    def open_object(self, s3_key: str, read_ahead: Optional[int] = None) -> S3ObjectReader:
+        """Open an object as a seekable, read-only file without downloading it.
+
+        Args:
+            s3_key: S3 object key to read.
+            read_ahead: Bytes fetched per ranged GET (default: ``s3_read_ahead``).
+
+        Returns:
+            File object positioned at the start of the object.
+
+        Raises:
+            ClientError: If the object does not exist or cannot be read.
+        """
+        try:
+            return S3ObjectReader(self.client, self.bucket, s3_key, read_ahead or self.read_ahead)
+        except ClientError as e:
+            logger.error(f"Failed to open {s3_key}: {e}")
+            raise
+
+    def get_object_range(self, s3_key: str, start: int, end: Optional[int] = None) -> bytes:
+        """Read a byte range of an object.
+
+        Args:
+            s3_key: S3 object key to read.
+            start: First byte offset.
+            end: Last byte offset, inclusive as in an HTTP Range header
+                (default: end of object).
+
+        Returns:
+            The requested bytes; shorter than requested if the range runs past
+            the end of the object.
+
+        Raises:
+            ClientError: If the object does not exist or the range is invalid.
+        """
+        byte_range = f"bytes={start}-" if end is None else f"bytes={start}-{end}"
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=s3_key, Range=byte_range)
+            data = response["Body"].read()
+            logger.debug(f"Read {len(data)} bytes ({byte_range}) of s3://{self.bucket}/{s3_key}")
+            return data
+        except ClientError as e:
+            logger.error(f"Failed to read {byte_range} of {s3_key}: {e}")
+            raise
+
     def generate_presigned_url(
         self,
         s3_key: str,
@@ -158,32 +572,312 @@ class S3Client:
             logger.error(f"Failed to delete {s3_key}: {e}")
             raise
 
-    def list_objects(self, prefix: str, max_keys: int = 1000) -> list[str]:
+    def delete_many(
+        self,
+        s3_keys: Iterable[str],
+        max_workers: Optional[int] = None,
+        attempts: int = 3,
+    ) -> list[TransferResult]:
+        """Delete many objects with concurrent 1000-key DeleteObjects requests.
+
+        Deleting a key that does not exist succeeds. Keys that fail with a
+        retryable error (throttling, internal errors) are retried in a later
+        request; other failures are reported without aborting the rest.
+
+        Args:
+            s3_keys: S3 keys to delete.
+            max_workers: Concurrent requests (default and maximum: the
+                connection pool size).
+            attempts: Tries per key for retryable errors.
+
+        Returns:
+            One result per key, in input order.
+        """
+        s3_keys = list(s3_keys)
+        batches = [
+            s3_keys[i:i + DELETE_BATCH_SIZE] for i in range(0, len(s3_keys), DELETE_BATCH_SIZE)
+        ]
+        workers = min(max_workers or self.max_pool_connections, self.max_pool_connections)
+        results: dict[str, TransferResult] = {}
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-delete") as executor:
+            for batch_results in executor.map(lambda b: self._delete_batch(b, attempts), batches):
+                results.update((r.s3_key, r) for r in batch_results)
+
+        ordered = [results[s3_key] for s3_key in s3_keys]
+        failed = sum(1 for r in ordered if not r.ok)
+        logger.info(
+            f"Deleted {len(ordered) - failed}/{len(ordered)} objects in "
+            f"{time.monotonic() - start:.2f}s ({len(batches)} requests, {failed} failed)"
+        )
+        return ordered
+
+    def delete_prefix(self, prefix: str, max_workers: Optional[int] = None) -> int:
+        """Delete every object below a prefix.
+
+        Pages are deleted while listing continues, with at most
+        ``max_workers`` DeleteObjects requests in flight.
+
+        Args:
+            prefix: S3 key prefix; must not be empty.
+            max_workers: Concurrent delete requests (default and maximum: the
+                connection pool size).
+
+        Returns:
+            Number of objects deleted.
+
+        Raises:
+            ValueError: If ``prefix`` is empty.
+            ClientError: If any object could not be deleted; the others are
+                still removed.
+        """
+        if not prefix:
+            raise ValueError("Refusing to delete an empty prefix (the whole bucket)")
+
+        workers = min(max_workers or self.max_pool_connections, self.max_pool_connections)
+        deleted = 0
+        failures: list[TransferResult] = []
+        pending: set[Future] = set()
+
+        def collect(done: Iterable[Future]) -> None:
+            nonlocal deleted
+            for future in done:
+                for result in future.result():
+                    if result.ok:
+                        deleted += 1
+                    else:
+                        failures.append(result)
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-delete") as executor:
+            keys = (obj["Key"] for obj in self.iter_objects(prefix, page_size=DELETE_BATCH_SIZE))
+            while batch := list(itertools.islice(keys, DELETE_BATCH_SIZE)):
+                if len(pending) >= workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(executor.submit(self._delete_batch, batch, 3))
+            collect(pending)
+
+        logger.info(
+            f"Deleted {deleted} objects under s3://{self.bucket}/{prefix} in "
+            f"{time.monotonic() - start:.2f}s ({len(failures)} failed)"
+        )
+        if failures:
+            raise failures[0].error
+        return deleted
+
+    def delete_video_objects(self, video_id: UUID, max_workers: Optional[int] = None) -> int:
+        """Delete every S3 object of a video.
+
+        The storage counterpart of deleting the ``videos`` row, whose jobs,
+        frames and segments go with it through ``on delete cascade``. Covers
+        the original, HLS proxy, clips, keyframes and thumbnails.
+
+        Args:
+            video_id: Video whose objects to delete.
+            max_workers: Concurrent delete requests per prefix.
+
+        Returns:
+            Number of objects deleted.
+
+        Raises:
+            ClientError: If any object could not be deleted. Every prefix is
+                still attempted, and repeating the call is safe.
+        """
+        deleted = 0
+        errors: list[ClientError] = []
+        for template in VIDEO_PREFIXES:
+            try:
+                deleted += self.delete_prefix(template.format(video_id=video_id), max_workers)
+            except ClientError as e:
+                errors.append(e)
+        logger.info(f"Deleted {deleted} objects of video {video_id}")
+        if errors:
+            raise errors[0]
+        return deleted
+
+    def _delete_batch(self, s3_keys: list[str], attempts: int) -> list[TransferResult]:
+        """Delete up to 1000 keys, retrying the keys that failed transiently."""
+        results: list[TransferResult] = []
+        remaining = s3_keys
+        for attempt in range(1, attempts + 1):
+            retry: list[str] = []
+            try:
+                response = self.client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": k} for k in remaining], "Quiet": True},
+                )
+                errors = {
+                    e["Key"]: ClientError(
+                        {"Error": {"Code": e.get("Code"), "Message": e.get("Message")}},
+                        "DeleteObjects",
+                    )
+                    for e in response.get("Errors", [])
+                }
+            except (ClientError, BotoCoreError) as e:
+                errors = dict.fromkeys(remaining, e)
+
+            for s3_key in remaining:
+                error = errors.get(s3_key)
+                if error is None:
+                    results.append(TransferResult(s3_key, attempts=attempt))
+                elif attempt < attempts and _is_retryable_delete(error):
+                    retry.append(s3_key)
+                else:
+                    logger.error(f"Failed to delete {s3_key}: {error}")
+                    results.append(TransferResult(s3_key, error=error, attempts=attempt))
+            if not retry:
+                break
+            remaining = retry
+            time.sleep(min(0.1 * 2 ** (attempt - 1), 5.0) * random.uniform(0.5, 1.5))
+        return results
+
+    def iter_objects(
+        self,
+        prefix: str,
+        start_after: Optional[str] = None,
+        page_size: int = 1000,
+    ) -> Iterator[dict]:
+        """Lazily iterate over every object below a prefix, page by page.
+
+        Args:
+            prefix: S3 key prefix to filter by.
+            start_after: Only list keys that sort after this key.
+            page_size: Keys requested per ``ListObjectsV2`` call.
+
+        Yields:
+            Object summaries (``Key``, ``LastModified``, ``ETag``, ``Size``)
+            in key order.
+        """
+        params = {"Bucket": self.bucket, "Prefix": prefix, "PaginationConfig": {"PageSize": page_size}}
+        if start_after:
+            params["StartAfter"] = start_after
+        pages = 0
+        try:
+            for page in self.client.get_paginator("list_objects_v2").paginate(**params):
+                pages += 1
+                yield from page.get("Contents", [])
+        except ClientError as e:
+            logger.error(f"Failed to list objects with prefix {prefix}: {e}")
+            raise
+        logger.debug(f"Listed {pages} page(s) with prefix: {prefix}")
+
+    def list_objects(self, prefix: str, max_keys: Optional[int] = None) -> list[str]:
         """List objects with a given prefix.
         
         Args:
             prefix: S3 key prefix to filter by.
-            max_keys: Maximum number of keys to return.
+            max_keys: Maximum number of keys to return (default: all).
             
         Returns:
             List of S3 object keys.
         """
-        try:
-            response = self.client.list_objects_v2(
-                Bucket=self.bucket,
-                Prefix=prefix,
-                MaxKeys=max_keys,
-            )
+        objects = self.iter_objects(prefix, page_size=min(max_keys or 1000, 1000))
+        keys = [obj["Key"] for obj in itertools.islice(objects, max_keys)]
+        logger.debug(f"Listed {len(keys)} objects with prefix: {prefix}")
+        return keys
+
+    def scan_new_objects(
+        self,
+        prefix: str,
+        cursor_key: str,
+        ordered_keys: bool = False,
+        overlap: timedelta = timedelta(hours=1),
+    ) -> Iterator[dict]:
+        """Yield objects below a prefix that earlier scans have not yielded.
+
+        The scan position is kept as a :class:`ScanCursor` in a JSON object at
+        ``cursor_key`` and only saved once the generator is exhausted, so a
+        scan that fails part way is repeated (at-least-once delivery).
+
+        Objects last modified more than ``overlap`` before the newest object
+        seen are considered settled; keys modified since then are remembered
+        in the cursor so they are not yielded twice. ``overlap`` must exceed
+        the longest upload, because a multipart object reports the time its
+        upload started as ``LastModified``.
+
+        With ``ordered_keys=False`` every scan still lists the whole prefix,
+        but only new objects are yielded. Set ``ordered_keys=True`` when new
+        keys always sort after older ones (e.g. UUIDv7 or date-prefixed
+        names); listing then resumes with ``StartAfter`` and each scan costs
+        O(new objects) requests. Random UUID keys must not use it, as new
+        keys could sort before the cursor and never be listed.
+
+        Args:
+            prefix: S3 key prefix to scan.
+            cursor_key: S3 key of the cursor object.
+            ordered_keys: Whether new keys sort after all existing keys.
+            overlap: How long a key may keep changing after its LastModified.
             
-            if "Contents" not in response:
-                return []
-                
-            keys = [obj["Key"] for obj in response["Contents"]]
-            logger.debug(f"Listed {len(keys)} objects with prefix: {prefix}")
-            return keys
+        Yields:
+            Object summaries, as from :meth:`iter_objects`.
+
+        Example:
+            for obj in s3.scan_new_objects("videos/original/", "scanner/cursors/original.json"):
+                register_video(obj["Key"])
+        """
+        cursor = self.load_scan_cursor(cursor_key)
+        start_after = cursor.start_after if ordered_keys else None
+
+        # Keys modified after the old horizon, for the next cursor's recent set
+        unsettled: dict[str, datetime] = {}
+        settled_max_key = cursor.start_after
+        newest = cursor.horizon
+        listed = yielded = 0
+        for obj in self.iter_objects(prefix, start_after=start_after):
+            listed += 1
+            key, modified = obj["Key"], obj["LastModified"]
+            newest = modified if newest is None else max(newest, modified)
+            if cursor.horizon is not None and modified <= cursor.horizon:
+                settled_max_key = max(settled_max_key or key, key)
+                continue
+            unsettled[key] = modified
+            if key not in cursor.recent:
+                yielded += 1
+                yield obj
+
+        horizon = cursor.horizon
+        if newest is not None:
+            horizon = max(horizon, newest - overlap) if horizon else newest - overlap
+        recent = frozenset(key for key, modified in unsettled.items() if modified > horizon)
+        for key in unsettled.keys() - recent:
+            settled_max_key = max(settled_max_key or key, key)
+
+        self.save_scan_cursor(cursor_key, ScanCursor(settled_max_key, horizon, recent))
+        logger.info(
+            f"Scanned {prefix}: {yielded} new of {listed} listed objects "
+            f"(horizon={horizon.isoformat() if horizon else None}, {len(recent)} recent keys)"
+        )
+
+    def load_scan_cursor(self, cursor_key: str) -> ScanCursor:
+        """Read a :meth:`scan_new_objects` cursor (empty if none is stored)."""
+        try:
+            body = self.client.get_object(Bucket=self.bucket, Key=cursor_key)["Body"].read()
         except ClientError as e:
-            logger.error(f"Failed to list objects with prefix {prefix}: {e}")
+            if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                return ScanCursor()
+            logger.error(f"Failed to read scan cursor {cursor_key}: {e}")
             raise
+        data = json.loads(body)
+        return ScanCursor(
+            start_after=data.get("start_after"),
+            horizon=datetime.fromisoformat(data["horizon"]) if data.get("horizon") else None,
+            recent=frozenset(data.get("recent", [])),
+        )
+
+    def save_scan_cursor(self, cursor_key: str, cursor: ScanCursor) -> None:
+        """Store a :meth:`scan_new_objects` cursor."""
+        body = json.dumps({
+            "start_after": cursor.start_after,
+            "horizon": cursor.horizon.isoformat() if cursor.horizon else None,
+            "recent": sorted(cursor.recent),
+        })
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=cursor_key,
+            Body=body.encode(),
+            ContentType="application/json",
+        )
 
 
 @lru_cache
@@ -194,3 +888,239 @@ def get_s3_client() -> S3Client:
         S3Client: Cached S3 client object.
     """
     return S3Client()
+
+
+class ObjectCache:
+    """Node-local, read-through disk cache of S3 objects.
+
+    Entries are keyed by bucket, key and ETag, so an overwritten object is
+    fetched again rather than served stale. The cache directory can be shared
+    by every worker process on a node (hostPath or shared volume):
+
+    - a miss downloads to a temporary file and renames it into place, and a
+      per-entry lock file makes concurrent misses for the same object wait
+      for one download instead of starting their own;
+    - readers hold a shared ``flock`` on the entry while using it, and
+      eviction only removes entries it can lock exclusively;
+    - recency is the entry's mtime, refreshed on every hit, and the least
+      recently used entries are evicted once the cache exceeds ``max_bytes``.
+
+    Counters in :meth:`stats` are per process.
+
+    Example:
+        cache = get_object_cache()
+        with cache.local_path(f"videos/original/{video_id}/master.mp4") as path:
+            subprocess.run(["ffmpeg", "-i", path, ...])
+    """
+
+    # Leftovers of downloads whose process died
+    STALE_PART_SECONDS = 24 * 3600
+
+    def __init__(self, cache_dir: str, max_bytes: int, client: Optional[S3Client] = None):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Cache directory, created if missing.
+            max_bytes: Total size of cached objects to keep.
+            client: S3 client for misses (default: the cached client).
+        """
+        self.client = client or get_s3_client()
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._objects_dir = os.path.join(cache_dir, "objects")
+        self._locks_dir = os.path.join(cache_dir, "locks")
+        os.makedirs(self._objects_dir, exist_ok=True)
+        os.makedirs(self._locks_dir, exist_ok=True)
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evicted_files = 0
+        self._evicted_bytes = 0
+
+    @contextmanager
+    def local_path(self, s3_key: str) -> Generator[str, None, None]:
+        """Get a local path to an object, downloading it on a miss.
+
+        The file must not be modified, and is only guaranteed to exist
+        inside the ``with`` block.
+
+        Args:
+            s3_key: S3 object key.
+
+        Yields:
+            Path of the cached copy.
+
+        Raises:
+            ClientError: If the object cannot be read from S3.
+        """
+        head = self.client.client.head_object(Bucket=self.client.bucket, Key=s3_key)
+        entry = hashlib.sha256(f"{self.client.bucket}/{s3_key}/{head['ETag']}".encode()).hexdigest()
+        path = os.path.join(self._objects_dir, entry)
+
+        f = self._open_entry(path)
+        if f is None:
+            with self._fill_lock(entry):
+                # Another process may have filled it while we waited
+                f = self._open_entry(path)
+                if f is None:
+                    f = self._fill(s3_key, head, path)
+                    self._count(misses=1)
+                else:
+                    self._count(hits=1)
+        else:
+            self._count(hits=1)
+
+        try:
+            yield path
+        finally:
+            f.close()
+
+    def stats(self) -> dict[str, int]:
+        """Get this process's cache counters.
+
+        Returns:
+            Dictionary with ``hits``, ``misses``, ``evicted_files`` and
+            ``evicted_bytes``.
+        """
+        with self._stats_lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evicted_files": self._evicted_files,
+                "evicted_bytes": self._evicted_bytes,
+            }
+
+    def _open_entry(self, path: str):
+        """Open and share-lock an entry and mark it recently used.
+
+        Returns:
+            The open file holding the lock, or None if the entry is missing.
+        """
+        try:
+            # Not a with block: the open file carries the lock and is returned
+            f = open(path, "rb")  # noqa: SIM115
+        except FileNotFoundError:
+            return None
+        fcntl.flock(f, fcntl.LOCK_SH)
+        # Eviction may have unlinked it between open() and flock()
+        try:
+            if os.stat(path).st_ino != os.fstat(f.fileno()).st_ino:
+                raise FileNotFoundError(path)
+            os.utime(path)
+        except FileNotFoundError:
+            f.close()
+            return None
+        return f
+
+    @contextmanager
+    def _fill_lock(self, entry: str) -> Generator[None, None, None]:
+        """Hold the exclusive lock serializing downloads of an entry.
+
+        Entries share 256 lock files, so the lock directory stays bounded.
+        """
+        with open(os.path.join(self._locks_dir, entry[:2]), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _fill(self, s3_key: str, head: dict, path: str):
+        """Download an object version into the cache.
+
+        Returns:
+            The new entry, opened under its temporary name and share-locked
+            before it is renamed into place, so it cannot be evicted first.
+        """
+        size = head["ContentLength"]
+        self._evict(self.max_bytes - size)
+        part = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            start = time.monotonic()
+            self.client.client.download_file(
+                self.client.bucket, s3_key, part, Config=self.client.transfer_config
+            )
+            # s3transfer does not accept IfMatch for downloads; an overwrite
+            # during the download shows up as a new ETag afterwards
+            etag = self.client.client.head_object(Bucket=self.client.bucket, Key=s3_key)["ETag"]
+            if etag != head["ETag"]:
+                raise RuntimeError(f"s3://{self.client.bucket}/{s3_key} changed during download")
+            with ExitStack() as stack:
+                f = stack.enter_context(open(part, "rb"))
+                fcntl.flock(f, fcntl.LOCK_SH)
+                os.rename(part, path)
+                # Handed to the caller, who closes it to release the lock
+                stack.pop_all()
+        except BaseException:
+            self._unlink(part)
+            raise
+        _log_transfer(
+            "Cached",
+            f"s3://{self.client.bucket}/{s3_key}",
+            path,
+            size,
+            time.monotonic() - start,
+        )
+        return f
+
+    def _evict(self, target_bytes: int) -> None:
+        """Remove least recently used entries until at most ``target_bytes`` remain."""
+        entries = []
+        now = time.time()
+        for item in os.scandir(self._objects_dir):
+            try:
+                st = item.stat()
+            except FileNotFoundError:
+                continue
+            if item.name.endswith(".part"):
+                if now - st.st_mtime > self.STALE_PART_SECONDS:
+                    self._unlink(item.path)
+                    continue
+                # Downloads in progress count towards the size bound
+                entries.append((float("inf"), st.st_size, None))
+            else:
+                entries.append((st.st_mtime, st.st_size, item.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= target_bytes or path is None:
+                break
+            if self._try_evict(path):
+                total -= size
+                self._count(evicted_files=1, evicted_bytes=size)
+
+        if total > target_bytes:
+            logger.warning(
+                f"Object cache {self.cache_dir} holds {total} bytes, over its "
+                f"target of {target_bytes}: remaining entries are in use"
+            )
+
+    def _try_evict(self, path: str) -> bool:
+        """Delete an entry unless a reader holds it."""
+        try:
+            with open(path, "rb") as f:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                self._unlink(path)
+                return True
+        except (BlockingIOError, FileNotFoundError):
+            return False
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        with suppress(FileNotFoundError):
+            os.unlink(path)
+
+    def _count(self, **increments: int) -> None:
+        with self._stats_lock:
+            for name, value in increments.items():
+                setattr(self, f"_{name}", getattr(self, f"_{name}") + value)
+
+
+@lru_cache
+def get_object_cache() -> Optional[ObjectCache]:
+    """Get the node-local object cache, if ``s3_cache_dir`` is configured.
+
+    Returns:
+        ObjectCache over the cached S3 client, or None when caching is off.
+    """
+    settings = get_settings()
+    if not settings.s3_cache_dir:
+        return None
+    return ObjectCache(settings.s3_cache_dir, settings.s3_cache_max_bytes)
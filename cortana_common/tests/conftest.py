@@ -0,0 +1,43 @@
+"""Shared fixtures for cortana_common tests."""
+
+import os
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cortana_common.config import get_settings
+
+
+@pytest.fixture
+def mock_env():
+    """Mock the required environment variables and reset cached settings."""
+    env_vars = {
+        "SUPABASE_URL": "https://test-project.supabase.co",
+        "SUPABASE_SERVICE_ROLE_KEY": "test-service-key",
+        "S3_ENDPOINT": "https://test.s3.amazonaws.com",
+        "S3_BUCKET": "test-bucket",
+        "S3_ACCESS_KEY_ID": "test-access-key",
+        "S3_SECRET_ACCESS_KEY": "test-secret-key",
+        "S3_REGION": "us-east-1",
+    }
+    
+    with patch.dict(os.environ, env_vars, clear=True):
+        get_settings.cache_clear()
+        yield env_vars
+        get_settings.cache_clear()
+
+
+@pytest.fixture
+def mock_cursor(mock_env):
+    """Patch the jobs module's connections and yield the shared mock cursor."""
+    cursor = MagicMock()
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    
+    @contextmanager
+    def fake_connection():
+        yield conn
+    
+    with patch("cortana_common.jobs.get_db_connection", fake_connection):
+        yield cursor
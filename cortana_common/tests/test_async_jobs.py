@@ -0,0 +1,145 @@
+"""Tests for the asyncio job runtime."""
+
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+
+from cortana_common.async_jobs import AsyncJobPoller
+from cortana_common.async_s3 import AsyncS3Client
+from cortana_common.jobs import JobFailure
+from cortana_common.models import Job, JobStatus, JobType
+
+
+def make_job() -> Job:
+    """Build a claimed job."""
+    now = datetime.now(UTC)
+    return Job(
+        id=uuid4(),
+        video_id=uuid4(),
+        job_type=JobType.OCR,
+        status=JobStatus.PROCESSING,
+        payload={},
+        run_after=now,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_poller_bounds_in_flight(mock_env):
+    """Test that the async poller never exceeds max_concurrency."""
+    queue = [make_job() for _ in range(10)]
+    acked: list[UUID] = []
+    active = 0
+    peak = 0
+    poller = AsyncJobPoller(JobType.OCR, max_concurrency=4)
+    
+    async def claim(limit):
+        claimed, queue[:] = queue[:limit], queue[limit:]
+        return claimed
+    
+    async def settle(job_ids):
+        acked.extend(job_ids)
+        if len(acked) == 10:
+            poller.stop()
+    
+    async def process(job):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+    
+    with (
+        patch.object(poller, "poll_next_jobs", side_effect=claim),
+        patch.object(poller, "ack_jobs", side_effect=settle),
+        patch.object(poller, "nack_jobs", new=AsyncMock()),
+        patch.object(poller, "reap_expired_jobs", new=AsyncMock()),
+    ):
+        await asyncio.wait_for(poller.run_forever(process), timeout=5)
+    
+    assert len(acked) == 10
+    assert peak == 4
+
+
+@pytest.mark.asyncio
+async def test_async_poller_nacks_failures(mock_env):
+    """Test that failing coroutines are nacked with their error."""
+    job = make_job()
+    poller = AsyncJobPoller(JobType.OCR, max_concurrency=2)
+    
+    async def process(job):
+        poller.stop()
+        raise ValueError("boom")
+    
+    with (
+        patch.object(poller, "poll_next_jobs", new=AsyncMock(side_effect=[[job]])),
+        patch.object(poller, "ack_jobs", new=AsyncMock()),
+        patch.object(poller, "nack_jobs", new=AsyncMock()) as nack,
+        patch.object(poller, "reap_expired_jobs", new=AsyncMock()),
+    ):
+        await asyncio.wait_for(poller.run_forever(process), timeout=5)
+    
+    nack.assert_awaited_with([JobFailure(job.id, "ValueError: boom")])
+
+
+@pytest.mark.asyncio
+async def test_async_poller_failed_ack_still_nacks(mock_env):
+    """Test that a failing ack does not skip the nacks of the same batch."""
+    good, bad = make_job(), make_job()
+    poller = AsyncJobPoller(JobType.OCR, max_concurrency=2)
+    
+    async def process(job):
+        poller.stop()
+        if job is bad:
+            raise ValueError("boom")
+    
+    with (
+        patch.object(poller, "poll_next_jobs", new=AsyncMock(side_effect=[[good, bad]])),
+        patch.object(poller, "ack_jobs", new=AsyncMock(side_effect=RuntimeError("gone"))),
+        patch.object(poller, "nack_jobs", new=AsyncMock()) as nack,
+        patch.object(poller, "reap_expired_jobs", new=AsyncMock()),
+    ):
+        await asyncio.wait_for(poller.run_forever(process), timeout=5)
+    
+    nack.assert_awaited_with([JobFailure(bad.id, "ValueError: boom")])
+
+
+@pytest.mark.asyncio
+async def test_async_poller_heartbeat_drops_lost_leases(mock_env):
+    """Test that jobs whose lease could not be extended stop being renewed."""
+    held, lost = make_job(), make_job()
+    poller = AsyncJobPoller(JobType.OCR)
+    in_flight = {MagicMock(): held, MagicMock(): lost}
+    
+    with (
+        patch.object(poller.settings, "job_heartbeat_interval", 0),
+        patch(
+            "cortana_common.async_jobs.extend_leases_async",
+            new=AsyncMock(side_effect=[[held.id], [held.id], RuntimeError("stop")]),
+        ) as extend,
+        pytest.raises(RuntimeError, match="stop"),
+    ):
+        await asyncio.wait_for(poller._heartbeat(in_flight), timeout=5)
+    
+    assert set(extend.await_args_list[0].args[0]) == {held.id, lost.id}
+    assert extend.await_args_list[1].args[0] == [held.id]
+
+
+@pytest.mark.asyncio
+async def test_async_s3_client_runs_off_loop(mock_env):
+    """Test that blocking S3 calls are delegated to the wrapped client."""
+    client = MagicMock()
+    client.bucket = "test-bucket"
+    client.object_exists.return_value = True
+    s3 = AsyncS3Client(client, max_concurrency=2)
+    
+    assert await s3.object_exists("videos/original/a/master.mp4") is True
+    await s3.download_file("videos/original/a/master.mp4", "/tmp/master.mp4")
+    
+    client.object_exists.assert_called_once_with("videos/original/a/master.mp4")
+    client.download_file.assert_called_once_with("videos/original/a/master.mp4", "/tmp/master.mp4")
+    s3.close()
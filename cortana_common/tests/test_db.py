@@ -0,0 +1,107 @@
+"""Tests for database connection pooling."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cortana_common import db
+from cortana_common.db import (
+    bulk_insert,
+    close_db_pool,
+    get_conninfo,
+    get_db_connection,
+    get_db_pool,
+    get_pool_stats,
+)
+
+
+@pytest.fixture
+def mock_pool(mock_env):
+    """Replace psycopg_pool.ConnectionPool with a mock."""
+    get_db_pool.cache_clear()
+    with patch.object(db, "ConnectionPool") as pool_cls:
+        yield pool_cls
+    get_db_pool.cache_clear()
+
+
+def test_conninfo_prefers_database_url(mock_env, monkeypatch):
+    """Test that DATABASE_URL takes precedence over the Supabase URL."""
+    monkeypatch.setenv("DATABASE_URL", "postgresql://user:pw@db.example.com:5432/postgres")
+    
+    assert get_conninfo() == "postgresql://user:pw@db.example.com:5432/postgres"
+
+
+def test_conninfo_from_supabase_url(mock_env):
+    """Test that the connection string falls back to the Supabase project ref."""
+    assert get_conninfo() == "postgresql://postgres.test-project:5432/postgres"
+
+
+def test_pool_is_shared(mock_pool):
+    """Test that the pool is created once and configured from settings."""
+    pool1 = get_db_pool()
+    pool2 = get_db_pool()
+    
+    assert pool1 is pool2
+    mock_pool.assert_called_once()
+    kwargs = mock_pool.call_args.kwargs
+    assert kwargs["min_size"] == 1
+    assert kwargs["max_size"] == 10
+    assert kwargs["check"] is mock_pool.check_connection
+    pool1.open.assert_called_once()
+
+
+def test_get_db_connection_uses_pool(mock_pool):
+    """Test that connections are checked out of the shared pool."""
+    conn = MagicMock()
+    mock_pool.return_value.connection.return_value.__enter__.return_value = conn
+    
+    with get_db_connection() as c1:
+        assert c1 is conn
+    with get_db_connection() as c2:
+        assert c2 is conn
+    
+    mock_pool.assert_called_once()
+    assert mock_pool.return_value.connection.call_count == 2
+
+
+def test_pool_stats_and_close(mock_pool):
+    """Test pool statistics and shutdown."""
+    assert get_pool_stats() == {}
+    
+    mock_pool.return_value.get_stats.return_value = {"pool_size": 1, "pool_available": 1}
+    get_db_pool()
+    assert get_pool_stats() == {"pool_size": 1, "pool_available": 1}
+    
+    close_db_pool()
+    mock_pool.return_value.close.assert_called_once()
+    assert get_pool_stats() == {}
+
+
+def test_bulk_insert_copies_in_batches(mock_env):
+    """Test that rows stream through binary COPY batches with generated ids."""
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = [
+        {"attname": "id", "oid": 2950},
+        {"attname": "segment_id", "oid": 2950},
+        {"attname": "entity_type", "oid": 25},
+        {"attname": "value", "oid": 25},
+    ]
+    copy = cur.copy.return_value.__enter__.return_value
+    rows = [(f"seg-{i}", "hashtag", f"#{i}") for i in range(5)]
+    
+    ids = bulk_insert(
+        "entities", ["segment_id", "entity_type", "value"], rows, id_column="id",
+        batch_size=2, conn=conn,
+    )
+    
+    assert cur.copy.call_count == 3
+    statement = cur.copy.call_args.args[0].as_string(None)
+    assert statement == (
+        'COPY "entities" ("id", "segment_id", "entity_type", "value") FROM STDIN (FORMAT BINARY)'
+    )
+    copy.set_types.assert_called_with([2950, 2950, 25, 25])
+    written = [c.args[0] for c in copy.write_row.call_args_list]
+    assert [row[1:] for row in written] == rows
+    assert [row[0] for row in written] == ids and len(set(ids)) == 5
+    conn.commit.assert_not_called()
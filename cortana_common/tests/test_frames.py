@@ -0,0 +1,103 @@
+"""Tests for packed keyframe shards."""
+
+import os
+from unittest.mock import patch
+from uuid import UUID
+
+import pytest
+from moto import mock_aws
+
+from cortana_common.config import get_settings
+from cortana_common.frames import (
+    FrameShardWriter,
+    frame_manifest_key,
+    load_frame_manifest,
+    read_frames,
+)
+from cortana_common.s3 import S3Client
+
+VIDEO_ID = UUID("a1b2c3d4-e5f6-7890-abcd-ef1234567890")
+
+
+@pytest.fixture
+def s3(mock_env):
+    """S3Client against a moto bucket."""
+    with patch.dict(os.environ, {"S3_ENDPOINT": "https://s3.amazonaws.com"}), mock_aws():
+        get_settings.cache_clear()
+        client = S3Client()
+        client.client.create_bucket(Bucket=client.bucket)
+        yield client
+
+
+def frame(ts: int) -> bytes:
+    return f"jpeg-{ts}-".encode() * (ts % 7 + 1)
+
+
+def test_write_and_read_shards(s3):
+    """Test that frames round-trip through shards and the manifest."""
+    timestamps = list(range(0, 10000, 100))
+    with FrameShardWriter(VIDEO_ID, s3, shard_bytes=1000) as writer:
+        for ts in timestamps:
+            writer.add(ts, frame(ts))
+
+    keys = s3.list_objects(f"frames/{VIDEO_ID}/")
+    assert frame_manifest_key(VIDEO_ID) in keys
+    assert f"frames/{VIDEO_ID}/shard-00000.bin" in keys
+
+    manifest = load_frame_manifest(writer.manifest_key, s3)
+    assert manifest.video_id == VIDEO_ID
+    assert manifest.frame_count == len(timestamps)
+    assert 1 < len(manifest.shards) == len(keys) - 1
+    assert all(shard.size >= 1000 for shard in manifest.shards[:-1])
+
+    frames = list(read_frames(manifest, s3))
+    assert [(r.timestamp_ms, data) for r, data in frames] == [(ts, frame(ts)) for ts in timestamps]
+
+
+def test_records_can_be_updated_until_close(s3):
+    """Test that a record changed after its shard was uploaded reaches the manifest."""
+    with FrameShardWriter(VIDEO_ID, s3, shard_bytes=10, duration_ms=4000) as writer:
+        first = writer.add(0, b"x" * 20)
+        writer.add(1000, b"y" * 20)
+        first.visible_until_ms = 3000
+
+    manifest = load_frame_manifest(writer.manifest_key, s3)
+    assert manifest.duration_ms == 4000
+    assert [r.visible_until_ms for shard in manifest.shards for r in shard.frames] == [3000, None]
+
+def test_read_frames_coalesces_ranges(s3):
+    """Test that neighbouring frames share a ranged GET and gaps split them."""
+    with FrameShardWriter(VIDEO_ID, s3) as writer:
+        for ts in range(10):
+            writer.add(ts, b"x" * 100)
+    manifest = load_frame_manifest(writer.manifest_key, s3)
+
+    with patch.object(s3, "get_object_range", wraps=s3.get_object_range) as get_range:
+        frames = list(read_frames(manifest, s3, timestamps=[0, 1, 2, 5, 6, 7, 8], max_range_bytes=300))
+
+    assert [r.timestamp_ms for r, _ in frames] == [0, 1, 2, 5, 6, 7, 8]
+    assert all(data == b"x" * 100 for _, data in frames)
+    assert [c.args[1:] for c in get_range.call_args_list] == [(0, 299), (500, 799), (800, 899)]
+
+
+def test_failed_writer_leaves_no_manifest(s3):
+    """Test that an exception while sampling does not publish a manifest."""
+    with pytest.raises(RuntimeError), FrameShardWriter(VIDEO_ID, s3, shard_bytes=10) as writer:
+        writer.add(0, b"x" * 20)
+        raise RuntimeError("decode failed")
+
+    assert not s3.object_exists(frame_manifest_key(VIDEO_ID))
+
+
+def test_region_records_map_boxes_to_full_frame(s3):
+    """Test that region offsets are kept and applied to OCR bounding boxes."""
+    with FrameShardWriter(VIDEO_ID, s3) as writer:
+        writer.add(1500, b"full")
+        writer.add(1600, b"strip", x=0, y=656)
+
+    manifest = load_frame_manifest(writer.manifest_key, s3)
+    records = [r for r, _ in read_frames(manifest, s3, timestamps=[1600])]
+
+    assert [(r.x, r.y) for r in records] == [(0, 656)]
+    box = {"x": 12, "y": 3, "width": 200, "height": 14}
+    assert records[0].to_frame_box(box) == {"x": 12, "y": 659, "width": 200, "height": 14}
@@ -1,14 +1,48 @@
 """Tests for job queue helpers."""
 
-from uuid import uuid4
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+from uuid import UUID, uuid4
 
+import psycopg
 import pytest
 
-from cortana_common.jobs import calculate_retry_delay
-from cortana_common.models import JobType
+from cortana_common.jobs import (
+    JobFailure,
+    JobNotificationListener,
+    JobPoller,
+    NextJob,
+    NonRetryableError,
+    ack_jobs,
+    archive_finished_jobs,
+    calculate_retry_delay,
+    complete_and_chain,
+    enqueue_job,
+    extend_leases,
+    get_worker_id,
+    job_channel,
+    nack_job,
+    nack_jobs,
+    poll_next_job,
+    poll_next_jobs,
+    reap_expired_jobs,
+    seconds_until_next_job,
+)
+from cortana_common.models import Job, JobStatus, JobType
 
 
-def test_calculate_retry_delay():
+def test_archive_finished_jobs_runs_until_drained(mock_cursor):
+    """Test that archival repeats full batches and stops on a partial one."""
+    mock_cursor.fetchone.side_effect = [{"moved": 100}, {"moved": 100}, {"moved": 7}]
+    
+    assert archive_finished_jobs(older_than=timedelta(days=1), batch_size=100) == 207
+    assert mock_cursor.execute.call_count == 3
+    assert mock_cursor.execute.call_args.args[1] == (timedelta(days=1), 100)
+
+
+def test_calculate_retry_delay(mock_env):
     """Test retry delay calculation with exponential backoff."""
     delay0 = calculate_retry_delay(0)
     assert 48 <= delay0 <= 72  # 60 * 0.8 to 60 * 1.2
@@ -30,3 +64,412 @@ def test_job_type_values():
     assert JobType.OCR.value == "ocr"
     assert JobType.SEGMENT_INDEX.value == "segment_index"
     assert JobType.CLIP_GENERATE.value == "clip_generate"
+
+
+def test_job_channel_names():
+    """Test that each job type has its own NOTIFY channel."""
+    assert job_channel(JobType.TRANSCODE) == "jobs_transcode"
+    assert job_channel(JobType.SEGMENT_INDEX) == "jobs_segment_index"
+
+
+def test_listener_wakes_on_notification(mock_env):
+    """Test that the listener subscribes and returns True on NOTIFY."""
+    conn = MagicMock()
+    conn.closed = False
+    conn.notifies.side_effect = [iter([MagicMock()]), iter([])]
+    
+    with patch("cortana_common.jobs.psycopg.connect", return_value=conn) as connect:
+        listener = JobNotificationListener(JobType.OCR)
+        assert listener.wait(timeout=1) is True
+    
+    connect.assert_called_once()
+    assert connect.call_args.kwargs["autocommit"] is True
+    conn.execute.assert_called_once()
+    conn.notifies.assert_any_call(timeout=1, stop_after=1)
+
+
+def test_listener_times_out(mock_env):
+    """Test that the listener returns False when nothing is queued."""
+    conn = MagicMock()
+    conn.closed = False
+    conn.notifies.return_value = iter([])
+    
+    with patch("cortana_common.jobs.psycopg.connect", return_value=conn):
+        listener = JobNotificationListener(JobType.OCR)
+        assert listener.wait(timeout=1) is False
+        assert listener.connected
+
+
+def test_listener_falls_back_on_error(mock_env):
+    """Test that connection errors are swallowed so the poller keeps polling."""
+    with patch(
+        "cortana_common.jobs.psycopg.connect",
+        side_effect=psycopg.OperationalError("no route"),
+    ):
+        listener = JobNotificationListener(JobType.OCR)
+        assert listener.wait(timeout=1) is False
+        assert not listener.connected
+
+
+def test_listen_wait_ends_when_delayed_job_is_due(mock_cursor):
+    """Test that a listening poller only blocks until the next run_after."""
+    poller = JobPoller(JobType.OCR, listen=True)
+    fallback = poller.settings.job_listen_fallback_interval
+    
+    mock_cursor.fetchone.return_value = {"seconds": 4.5}
+    assert seconds_until_next_job(JobType.OCR) == 4.5
+    assert mock_cursor.execute.call_args.args[1] == ("queued", "ocr")
+    assert poller._listen_wait() == 4.5
+    
+    mock_cursor.fetchone.return_value = {"seconds": fallback + 100.0}
+    assert poller._listen_wait() == fallback
+    
+    mock_cursor.fetchone.return_value = {"seconds": None}
+    assert poller._listen_wait() == fallback
+    
+    # Claimable but locked by someone else's claim: retry soon, not in a hot loop
+    mock_cursor.fetchone.return_value = {"seconds": -2.0}
+    assert poller._listen_wait() == 0.1
+
+
+def make_job_row(job_type: JobType = JobType.SEGMENT_INDEX, **overrides) -> dict:
+    """Build a jobs row as returned by the dict_row factory."""
+    now = datetime.now(UTC)
+    row = {
+        "id": uuid4(),
+        "video_id": uuid4(),
+        "job_type": job_type.value,
+        "status": JobStatus.PROCESSING.value,
+        "retry_count": 0,
+        "payload": {},
+        "started_at": now,
+        "finished_at": None,
+        "run_after": now,
+        "created_at": now,
+        "updated_at": now,
+    }
+    row.update(overrides)
+    return row
+
+
+def test_poll_next_jobs_claims_batch(mock_cursor):
+    """Test that a batch is claimed in one statement and returned in queue order."""
+    later = make_job_row(fair_key=2.0)
+    earlier = make_job_row(fair_key=1.0)
+    urgent = make_job_row(fair_key=5.0, priority=10)
+    mock_cursor.fetchall.return_value = [later, earlier, urgent]
+    
+    jobs = poll_next_jobs(JobType.SEGMENT_INDEX, 3)
+    
+    assert [job.id for job in jobs] == [urgent["id"], earlier["id"], later["id"]]
+    mock_cursor.execute.assert_called_once()
+    assert 3 in mock_cursor.execute.call_args.args[1]
+
+
+def test_enqueue_job_passes_priority(mock_cursor):
+    """Test that enqueue forwards the priority and leaves fair_key to the database."""
+    job_id = uuid4()
+    mock_cursor.fetchone.return_value = {"id": job_id, "created": True}
+    
+    assert enqueue_job(uuid4(), JobType.CLIP_GENERATE, {}, priority=10) == job_id
+    assert mock_cursor.execute.call_args.args[1]["priority"] == 10
+
+
+def test_enqueue_job_duplicate_returns_active_job(mock_cursor):
+    """Test that a duplicate enqueue resolves to the already active job."""
+    active_id = uuid4()
+    mock_cursor.fetchone.return_value = {"id": active_id, "created": False}
+    
+    assert enqueue_job(uuid4(), JobType.OCR, {}) == active_id
+    mock_cursor.execute.assert_called_once()
+
+
+def test_complete_and_chain_single_statement(mock_cursor):
+    """Test that completing a job and enqueuing the next stage is one statement."""
+    job = Job(**make_job_row(JobType.TRANSCODE))
+    next_id = uuid4()
+    mock_cursor.fetchone.return_value = {"completed": True, "job_id": next_id}
+    
+    assert complete_and_chain(job, JobType.SAMPLE, {"target_fps": 10}) == next_id
+    
+    mock_cursor.execute.assert_called_once()
+    params = mock_cursor.execute.call_args.args[1]
+    assert params["job_id"] == job.id
+    assert params["video_id"] == job.video_id
+    assert params["job_type"] == "sample"
+
+
+def test_complete_and_chain_lost_lease(mock_cursor):
+    """Test that nothing is enqueued when the job's lease was lost."""
+    job = Job(**make_job_row(JobType.TRANSCODE))
+    mock_cursor.fetchone.return_value = {"completed": False, "job_id": None}
+    
+    assert complete_and_chain(job, JobType.SAMPLE, {}) is None
+    mock_cursor.execute.assert_called_once()
+
+
+def test_poll_next_job_returns_none_when_empty(mock_cursor):
+    """Test that single-job polling returns None on an empty queue."""
+    mock_cursor.fetchall.return_value = []
+    
+    assert poll_next_job(JobType.OCR) is None
+
+
+def test_ack_jobs_single_statement(mock_cursor):
+    """Test that a batch of acks is one UPDATE."""
+    job_ids = [uuid4(), uuid4(), uuid4()]
+    
+    mock_cursor.fetchall.return_value = [{"id": job_id} for job_id in job_ids]
+    
+    ack_jobs(job_ids)
+    ack_jobs([])
+    
+    mock_cursor.execute.assert_called_once()
+    params = mock_cursor.execute.call_args.args[1]
+    assert params[3] == job_ids
+    assert params[-1] == get_worker_id()
+
+
+def test_nack_jobs_single_statement(mock_cursor):
+    """Test that a batch of nacks is one UPDATE with parallel arrays."""
+    failures = [JobFailure(uuid4(), "TimeoutError: slow"), JobFailure(uuid4(), "KeyError: x")]
+    mock_cursor.fetchall.return_value = [
+        {"id": failures[0].job_id, "status": "queued", "retry_count": 1, "run_after": None},
+        {"id": failures[1].job_id, "status": "failed", "retry_count": 3},
+    ]
+    
+    nack_jobs(failures)
+    
+    mock_cursor.execute.assert_called_once()
+    params = mock_cursor.execute.call_args.args[1]
+    assert params["job_ids"] == [f.job_id for f in failures]
+    assert params["errors"] == ["TimeoutError: slow", "KeyError: x"]
+    assert params["retryable"] == [True, True]
+    assert params["retry_base_delay"] == 60
+    assert params["worker_id"] == get_worker_id()
+
+
+def test_nack_job_non_retryable(mock_cursor):
+    """Test that a non-retryable failure is flagged for immediate failure."""
+    job_id = uuid4()
+    mock_cursor.fetchall.return_value = [{"id": job_id, "status": "failed", "retry_count": 1}]
+    
+    nack_job(job_id, "ValidationError: bad payload", retryable=False)
+    
+    assert mock_cursor.execute.call_args.args[1]["retryable"] == [False]
+
+
+def test_claim_stamps_lease(mock_cursor):
+    """Test that claiming records the worker ID and lease duration."""
+    mock_cursor.fetchall.return_value = []
+    
+    poll_next_jobs(JobType.OCR, 5)
+    
+    params = mock_cursor.execute.call_args.args[1]
+    assert params[-2:] == (get_worker_id(), 300)
+
+
+def test_extend_leases_returns_held_ids(mock_cursor):
+    """Test that only jobs still leased to this worker are reported as held."""
+    held, lost = uuid4(), uuid4()
+    mock_cursor.fetchall.return_value = [{"id": held}]
+    
+    assert extend_leases([held, lost]) == [held]
+    assert extend_leases([]) == []
+    mock_cursor.execute.assert_called_once()
+
+
+def test_reap_expired_jobs_counts_rows(mock_cursor):
+    """Test that the reaper reports how many expired jobs it requeued or failed."""
+    mock_cursor.fetchall.return_value = [
+        {"id": uuid4(), "status": "queued", "retry_count": 1, "run_after": None},
+        {"id": uuid4(), "status": "failed", "retry_count": 3},
+    ]
+    
+    assert reap_expired_jobs(limit=10) == 2
+    assert mock_cursor.execute.call_args.args[1]["limit"] == 10
+
+
+def test_poller_batch_mode_settles_in_bulk(mock_env):
+    """Test that batch mode processes each job and settles the batch in bulk."""
+    good, bad = Job(**make_job_row()), Job(**make_job_row())
+    poller = JobPoller(JobType.SEGMENT_INDEX, batch_size=2)
+    
+    def process(job):
+        if job is bad:
+            raise ValueError("boom")
+    
+    with (
+        patch.object(poller, "poll_next_jobs", side_effect=[[good, bad], KeyboardInterrupt]),
+        patch.object(poller, "ack_jobs") as ack,
+        patch.object(poller, "nack_jobs") as nack,
+        patch.object(poller, "reap_expired_jobs"),
+    ):
+        poller.run_forever(process)
+    
+    ack.assert_called_once_with([good.id])
+    nack.assert_called_once_with([JobFailure(bad.id, "ValueError: boom")])
+
+
+def test_poller_chains_next_job(mock_env):
+    """Test that returning a NextJob completes and chains instead of acking."""
+    chained, plain = Job(**make_job_row()), Job(**make_job_row())
+    poller = JobPoller(JobType.SAMPLE, batch_size=2)
+    next_job = NextJob(JobType.OCR, {"frames": 12})
+    
+    def process(job):
+        return next_job if job is chained else None
+    
+    with (
+        patch.object(poller, "poll_next_jobs", side_effect=[[chained, plain], KeyboardInterrupt]),
+        patch.object(poller, "ack_jobs") as ack,
+        patch.object(poller, "complete_and_chain") as chain,
+        patch.object(poller, "nack_jobs"),
+        patch.object(poller, "reap_expired_jobs"),
+    ):
+        poller.run_forever(process)
+    
+    ack.assert_called_once_with([plain.id])
+    chain.assert_called_once_with(chained, JobType.OCR, {"frames": 12}, 0)
+
+
+def test_poller_skips_retries_for_non_retryable_errors(mock_env):
+    """Test that NonRetryableError is nacked with retries disabled."""
+    job = Job(**make_job_row())
+    poller = JobPoller(JobType.OCR)
+    
+    def process(job):
+        raise NonRetryableError("original video deleted")
+    
+    with (
+        patch.object(poller, "poll_next_jobs", side_effect=[[job], KeyboardInterrupt]),
+        patch.object(poller, "ack_jobs"),
+        patch.object(poller, "nack_jobs") as nack,
+        patch.object(poller, "reap_expired_jobs"),
+    ):
+        poller.run_forever(process)
+    
+    nack.assert_called_once_with(
+        [JobFailure(job.id, "NonRetryableError: original video deleted", retryable=False)]
+    )
+
+
+def test_poller_concurrent_mode_bounds_in_flight(mock_env):
+    """Test that concurrent mode never claims more jobs than free slots."""
+    queue = [Job(**make_job_row()) for _ in range(5)]
+    limits: list[int] = []
+    acked: list[UUID] = []
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    poller = JobPoller(JobType.OCR, max_concurrency=2)
+    
+    def claim(limit):
+        limits.append(limit)
+        claimed, queue[:] = queue[:limit], queue[limit:]
+        return claimed
+    
+    def settle(job_ids):
+        acked.extend(job_ids)
+        if len(acked) == 5:
+            poller.stop()
+    
+    def process(job):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+    
+    with (
+        patch.object(poller, "poll_next_jobs", side_effect=claim),
+        patch.object(poller, "ack_jobs", side_effect=settle),
+        patch.object(poller, "nack_jobs"),
+        patch.object(poller, "reap_expired_jobs"),
+    ):
+        poller.run_forever(process)
+    
+    assert len(acked) == 5
+    assert peak <= 2
+    assert all(1 <= limit <= 2 for limit in limits)
+
+
+def test_poller_stop_drains_in_flight(mock_env):
+    """Test that stopping waits for and settles jobs that are already running."""
+    job = Job(**make_job_row())
+    poller = JobPoller(JobType.OCR, max_concurrency=4)
+    
+    def process(job):
+        poller.stop()
+        time.sleep(0.05)
+    
+    with (
+        patch.object(poller, "poll_next_jobs", side_effect=[[job]]),
+        patch.object(poller, "ack_jobs") as ack,
+        patch.object(poller, "nack_jobs"),
+        patch.object(poller, "reap_expired_jobs"),
+    ):
+        poller.run_forever(process)
+    
+    ack.assert_any_call([job.id])
+
+
+def test_poller_heartbeat_drops_lost_leases(mock_env):
+    """Test that jobs whose lease could not be extended stop being renewed."""
+    held, lost = Job(**make_job_row()), Job(**make_job_row())
+    poller = JobPoller(JobType.OCR)
+    
+    with patch("cortana_common.jobs.poll_next_jobs", return_value=[held, lost]):
+        poller.poll_next_jobs()
+    
+    with patch("cortana_common.jobs.extend_leases", return_value=[held.id]) as extend:
+        poller.heartbeat()
+        poller.heartbeat()
+    
+    assert set(extend.call_args_list[0].args[0]) == {held.id, lost.id}
+    assert extend.call_args_list[1].args[0] == [held.id]
+
+
+def test_poller_failed_ack_releases_jobs_and_still_nacks(mock_env):
+    """Test that a failing ack neither keeps leases alive nor skips the rest of the batch."""
+    good, chained, bad = Job(**make_job_row()), Job(**make_job_row()), Job(**make_job_row())
+    poller = JobPoller(JobType.OCR, batch_size=3)
+
+    def process(job):
+        if job is bad:
+            raise ValueError("boom")
+        return NextJob(JobType.SEGMENT_INDEX, {}) if job is chained else None
+
+    with (
+        patch("cortana_common.jobs.poll_next_jobs", side_effect=[[good, chained, bad], KeyboardInterrupt]),
+        patch("cortana_common.jobs.ack_jobs", side_effect=psycopg.OperationalError("gone")),
+        patch("cortana_common.jobs.complete_and_chain") as chain,
+        patch("cortana_common.jobs.nack_jobs") as nack,
+        patch.object(poller, "reap_expired_jobs"),
+    ):
+        poller.run_forever(process)
+
+    chain.assert_called_once_with(chained, JobType.SEGMENT_INDEX, {}, 0)
+    nack.assert_called_once_with([JobFailure(bad.id, "ValueError: boom")])
+    with patch("cortana_common.jobs.extend_leases") as extend:
+        poller.heartbeat()
+    extend.assert_not_called()
+
+
+def test_poller_reaps_at_most_once_per_interval(mock_env):
+    """Test that pollers rate-limit the expired lease sweep."""
+    poller = JobPoller(JobType.OCR)
+    
+    with patch("cortana_common.jobs.reap_expired_jobs", return_value=1) as reap:
+        assert poller.reap_expired_jobs() == 1
+        assert poller.reap_expired_jobs() == 0
+    
+    reap.assert_called_once()
+
+
+def test_poller_rejects_unknown_executor(mock_env):
+    """Test that only thread and process executors are accepted."""
+    with pytest.raises(ValueError):
+        JobPoller(JobType.OCR, max_concurrency=2, executor="greenlet")
@@ -0,0 +1,81 @@
+"""Tests for archive_finished_jobs() against a scratch database.
+
+Run with ``TEST_DATABASE_URL`` pointing at a database with the migrations
+applied; the tests are skipped otherwise. They only touch rows and
+partitions of January to March 2001.
+"""
+
+import os
+import uuid
+
+import psycopg
+import pytest
+
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+PARTITIONS = ["jobs_history_2001_01", "jobs_history_2001_02", "jobs_history_2001_03"]
+
+
+@pytest.fixture
+def conn():
+    """Autocommit connection; removes the test's video, history rows and partitions."""
+    with psycopg.connect(DATABASE_URL, autocommit=True) as conn:
+        video_id = conn.execute(
+            "INSERT INTO videos (owner_id, s3_original_path) "
+            "VALUES (gen_random_uuid(), 'test/history') RETURNING id"
+        ).fetchone()[0]
+        conn.video_id = video_id
+        try:
+            yield conn
+        finally:
+            conn.execute("DELETE FROM jobs_history WHERE video_id = %s", (video_id,))
+            conn.execute("DELETE FROM videos WHERE id = %s", (video_id,))
+            for name in PARTITIONS:
+                conn.execute(f"DROP TABLE IF EXISTS {name}")
+
+
+def add_finished_job(conn, finished_at: str) -> uuid.UUID:
+    return conn.execute(
+        "INSERT INTO jobs (video_id, job_type, status, started_at, finished_at) "
+        "VALUES (%s, 'ocr', 'done', %s, %s) RETURNING id",
+        (conn.video_id, finished_at, finished_at),
+    ).fetchone()[0]
+
+
+def partition_of(conn, job_id: uuid.UUID) -> str:
+    return conn.execute(
+        "SELECT tableoid::regclass::text FROM jobs_history WHERE id = %s", (job_id,)
+    ).fetchone()[0]
+
+
+def test_locked_rows_do_not_send_a_month_to_the_default_partition(conn):
+    """Test that a batch skipping a locked January row still gets a February partition."""
+    january = add_finished_job(conn, "2001-01-31 23:59:00+00")
+    february = add_finished_job(conn, "2001-02-01 00:01:00+00")
+
+    with psycopg.connect(DATABASE_URL) as locker:
+        locker.execute("SELECT 1 FROM jobs WHERE id = %s FOR UPDATE", (january,))
+        moved = conn.execute("SELECT archive_finished_jobs(interval '1 day', 1)").fetchone()[0]
+        locker.rollback()
+
+    assert moved == 1
+    assert partition_of(conn, february) == "jobs_history_2001_02"
+
+    assert conn.execute("SELECT archive_finished_jobs(interval '1 day', 10)").fetchone()[0] >= 1
+    assert partition_of(conn, january) == "jobs_history_2001_01"
+
+
+def test_partition_takes_over_rows_from_the_default_partition(conn):
+    """Test that creating a month's partition moves its rows out of the default."""
+    march = add_finished_job(conn, "2001-03-15 12:00:00+00")
+    conn.execute(
+        "WITH moved AS (DELETE FROM jobs WHERE id = %s RETURNING *) "
+        "INSERT INTO jobs_history_default SELECT * FROM moved",
+        (march,),
+    )
+
+    conn.execute("SELECT create_jobs_history_partition('2001-03-01')")
+
+    assert partition_of(conn, march) == "jobs_history_2001_03"
@@ -0,0 +1,124 @@
+"""Tests for presigned URL caching."""
+
+from itertools import count
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cortana_common.presign import PresignedUrlCache
+
+
+@pytest.fixture
+def client():
+    """Fake S3 client whose signatures change on every call."""
+    client = MagicMock()
+    signatures = count()
+    client.generate_presigned_url.side_effect = (
+        lambda key, expiration, method: f"https://s3.test/{key}?X-Amz-Signature={next(signatures)}"
+    )
+    return client
+
+
+@pytest.fixture
+def clock():
+    """Patch the monotonic clock used for URL validity."""
+    with patch("cortana_common.presign.time.monotonic", return_value=1000.0) as monotonic:
+        yield monotonic
+
+
+def test_get_reuses_fresh_urls(client, clock):
+    """Test that URLs are re-signed only once their remaining validity is too short."""
+    cache = PresignedUrlCache(client, expiration=900, min_remaining=300)
+
+    url = cache.get("thumbs/abc/poster.jpg")
+    clock.return_value += 600
+    assert cache.get("thumbs/abc/poster.jpg") == url
+    assert cache.get("thumbs/abc/poster.jpg", "PUT") != url
+
+    clock.return_value += 1
+    assert cache.get("thumbs/abc/poster.jpg") != url
+    assert cache.stats() == {
+        "entries": 2,
+        "hits": 1,
+        "misses": 3,
+        "evictions": 0,
+        "hit_ratio": 0.25,
+    }
+
+
+def test_eviction_prefers_stale_entries(client, clock):
+    """Test that stale entries go first, then the least recently used."""
+    cache = PresignedUrlCache(client, max_entries=2, expiration=900, min_remaining=300)
+
+    cache.get("a")
+    clock.return_value += 700
+    cache.get("b")  # "a" is stale and evicted, even though the cache had room
+    cache.get("c")
+    assert cache.get_many(["b", "c"]).keys() == {"b", "c"}
+    assert cache.stats()["evictions"] == 1
+
+    cache.get("b")
+    cache.get("d")  # full: "c" is least recently used
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["evictions"] == 2
+    misses = cache.stats()["misses"]
+    cache.get("b")
+    assert cache.stats()["misses"] == misses
+
+
+def test_expiry_records_stay_bounded_under_key_churn(client, clock):
+    """Test that records of LRU-evicted entries do not pile up until they expire."""
+    cache = PresignedUrlCache(client, max_entries=10, expiration=900, min_remaining=300)
+
+    for i in range(1000):
+        cache.get(f"thumbs/{i}/poster.jpg")
+        assert len(cache._expiries) <= 2 * cache.max_entries + 1
+
+    assert cache.stats()["entries"] == 10
+    assert cache.get("thumbs/999/poster.jpg") == cache.get("thumbs/999/poster.jpg")
+
+
+def test_sign_playlist(client, clock):
+    """Test that segment and tag URIs are signed relative to the playlist."""
+    playlist = "\n".join([
+        "#EXTM3U",
+        "#EXT-X-VERSION:7",
+        '#EXT-X-MAP:URI="init.mp4"',
+        "#EXTINF:4.0,",
+        "segment_000.ts",
+        "#EXTINF:4.0,",
+        "../abc/segment_001.ts",
+        "#EXTINF:4.0,",
+        "https://cdn.example.com/segment_002.ts",
+        "#EXT-X-ENDLIST",
+    ])
+    cache = PresignedUrlCache(client)
+
+    signed = cache.sign_playlist("videos/proxy/abc/index.m3u8", playlist).splitlines()
+
+    assert signed[2] == '#EXT-X-MAP:URI="https://s3.test/videos/proxy/abc/init.mp4?X-Amz-Signature=0"'
+    assert signed[4] == "https://s3.test/videos/proxy/abc/segment_000.ts?X-Amz-Signature=1"
+    assert signed[6] == "https://s3.test/videos/proxy/abc/segment_001.ts?X-Amz-Signature=2"
+    assert signed[8] == "https://cdn.example.com/segment_002.ts"
+    assert signed[9] == "#EXT-X-ENDLIST"
+
+    # A second request for the playlist reuses every signature
+    assert cache.sign_playlist("videos/proxy/abc/index.m3u8", playlist).splitlines() == signed
+    assert client.generate_presigned_url.call_count == 3
+
+
+def test_sign_playlist_reads_from_s3(client, clock):
+    """Test that the playlist is fetched when no text is given."""
+    client.get_object_range.return_value = b"#EXTM3U\nsegment_000.ts\n"
+    cache = PresignedUrlCache(client)
+
+    signed = cache.sign_playlist("videos/proxy/abc/index.m3u8")
+
+    client.get_object_range.assert_called_once_with("videos/proxy/abc/index.m3u8", 0)
+    assert "videos/proxy/abc/segment_000.ts?X-Amz-Signature=0" in signed
+
+
+def test_min_remaining_must_be_below_expiration(client):
+    """Test that a cache which could never serve a hit is rejected."""
+    with pytest.raises(ValueError):
+        PresignedUrlCache(client, expiration=300, min_remaining=300)
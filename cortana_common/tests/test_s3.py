@@ -0,0 +1,380 @@
+"""Tests for S3 client helpers."""
+
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+from uuid import UUID
+
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from cortana_common.config import get_settings
+from cortana_common.s3 import ObjectCache, S3Client, get_object_cache
+
+MIB = 1024 * 1024
+
+
+@pytest.fixture
+def s3(mock_env):
+    """S3Client against a moto bucket, with 5 MiB multipart parts."""
+    env_vars = {
+        # Path-style endpoint; moto reads test.s3.amazonaws.com as bucket "test"
+        "S3_ENDPOINT": "https://s3.amazonaws.com",
+        "S3_MULTIPART_THRESHOLD": str(5 * MIB),
+        "S3_MULTIPART_CHUNKSIZE": str(5 * MIB),
+        "S3_MAX_CONCURRENCY": "4",
+    }
+    with patch.dict(os.environ, env_vars), mock_aws():
+        get_settings.cache_clear()
+        client = S3Client()
+        client.client.create_bucket(Bucket=client.bucket)
+        yield client
+
+
+def test_transfer_config_from_settings(s3):
+    """Test that transfer and connection pool settings come from config."""
+    assert s3.transfer_config.multipart_threshold == 5 * MIB
+    assert s3.transfer_config.multipart_chunksize == 5 * MIB
+    assert s3.transfer_config.max_concurrency == 4
+    # Never below botocore's default pool size
+    assert s3.client.meta.config.max_pool_connections == 10
+
+
+def test_max_pool_connections_follows_concurrency(mock_env):
+    """Test that the connection pool grows with transfer concurrency."""
+    with patch.dict(os.environ, {"S3_MAX_CONCURRENCY": "32"}):
+        get_settings.cache_clear()
+        assert S3Client().client.meta.config.max_pool_connections == 32
+
+    with patch.dict(os.environ, {"S3_MAX_CONCURRENCY": "32", "S3_MAX_POOL_CONNECTIONS": "64"}):
+        get_settings.cache_clear()
+        assert S3Client().client.meta.config.max_pool_connections == 64
+
+
+def test_multipart_round_trip(s3, tmp_path, caplog):
+    """Test that large files go multipart and transfers log throughput."""
+    source = tmp_path / "master.mp4"
+    data = os.urandom(12 * MIB)
+    source.write_bytes(data)
+    target = tmp_path / "downloaded.mp4"
+
+    with caplog.at_level(logging.INFO, logger="cortana_common.s3"):
+        s3.upload_file(str(source), "videos/original/abc/master.mp4", content_type="video/mp4")
+        s3.download_file("videos/original/abc/master.mp4", str(target))
+
+    head = s3.client.head_object(Bucket=s3.bucket, Key="videos/original/abc/master.mp4")
+    assert head["ETag"].strip('"').endswith("-3")
+    assert target.read_bytes() == data
+    messages = [r.getMessage() for r in caplog.records]
+    assert any(m.startswith("Uploaded to s3://") and "12.0 MiB in" in m for m in messages)
+    assert any(m.startswith("Downloaded s3://") and "MiB/s" in m for m in messages)
+
+
+def test_get_object_range(s3):
+    """Test that byte ranges are inclusive and may be open-ended."""
+    s3.client.put_object(Bucket=s3.bucket, Key="k", Body=b"0123456789")
+
+    assert s3.get_object_range("k", 2, 5) == b"2345"
+    assert s3.get_object_range("k", 7) == b"789"
+
+
+def test_open_object_streams_with_read_ahead(s3):
+    """Test sequential reads across ranged windows."""
+    data = os.urandom(1000)
+    s3.client.put_object(Bucket=s3.bucket, Key="k", Body=data)
+
+    with patch.object(s3.client, "get_object", wraps=s3.client.get_object) as get_object:
+        with s3.open_object("k", read_ahead=300) as f:
+            assert f.size == 1000
+            chunks = iter(lambda: f.read(128), b"")
+            assert b"".join(chunks) == data
+
+    ranges = sorted(call.kwargs["Range"] for call in get_object.call_args_list)
+    assert ranges == ["bytes=0-299", "bytes=300-599", "bytes=600-899", "bytes=900-999"]
+
+
+def test_open_object_seek(s3):
+    """Test that seeks fetch only the range around the new position."""
+    data = bytes(range(256)) * 4
+    s3.client.put_object(Bucket=s3.bucket, Key="k", Body=data)
+
+    with patch.object(s3.client, "get_object", wraps=s3.client.get_object) as get_object:
+        with s3.open_object("k", read_ahead=100) as f:
+            f.seek(-10, io.SEEK_END)
+            assert f.read() == data[-10:]
+            assert f.read() == b""
+            f.seek(500)
+            assert f.read(4) == data[500:504]
+            assert f.tell() == 504
+
+    ranges = [call.kwargs["Range"] for call in get_object.call_args_list]
+    assert ranges == ["bytes=1014-1023", "bytes=500-599"]
+
+
+def test_open_object_detects_overwrite(s3):
+    """Test that reads fail if the object changes after it was opened."""
+    s3.client.put_object(Bucket=s3.bucket, Key="k", Body=b"a" * 100)
+
+    with s3.open_object("k", read_ahead=10) as f:
+        s3.client.put_object(Bucket=s3.bucket, Key="k", Body=b"b" * 100)
+        with pytest.raises(ClientError):
+            f.read()
+
+
+def test_upload_many_and_download_many(s3, tmp_path):
+    """Test bulk transfers from bytes and files, to memory and to disk."""
+    frame = tmp_path / "1000.jpg"
+    frame.write_bytes(b"jpeg-from-disk")
+    objects = {f"frames/abc/{ts}.jpg": f"jpeg-{ts}".encode() for ts in range(50)}
+    objects["frames/abc/1000.jpg"] = str(frame)
+
+    results = s3.upload_many(objects)
+
+    assert [r.s3_key for r in results] == list(objects)
+    assert all(r.ok and r.attempts == 1 for r in results)
+    head = s3.client.head_object(Bucket=s3.bucket, Key="frames/abc/7.jpg")
+    assert head["ContentType"] == "image/jpeg"
+
+    in_memory = s3.download_many(["frames/abc/7.jpg", "frames/abc/1000.jpg"])
+    assert [r.data for r in in_memory] == [b"jpeg-7", b"jpeg-from-disk"]
+
+    on_disk = s3.download_many(["frames/abc/7.jpg"], local_dir=str(tmp_path / "out"))
+    assert open(on_disk[0].local_path, "rb").read() == b"jpeg-7"
+    assert on_disk[0].data is None
+
+
+def test_upload_many_retries_individual_failures(s3):
+    """Test that transient errors are retried and permanent ones are not."""
+    put_object = s3.client.put_object
+    failures = {"flaky": 1}
+
+    def fake_put_object(**kwargs):
+        if kwargs["Key"] == "denied":
+            raise ClientError(
+                {"Error": {"Code": "AccessDenied"}, "ResponseMetadata": {"HTTPStatusCode": 403}},
+                "PutObject",
+            )
+        if failures.get(kwargs["Key"]):
+            failures[kwargs["Key"]] -= 1
+            raise ClientError(
+                {"Error": {"Code": "InternalError"}, "ResponseMetadata": {"HTTPStatusCode": 500}},
+                "PutObject",
+            )
+        return put_object(**kwargs)
+
+    with patch.object(s3.client, "put_object", side_effect=fake_put_object), patch("time.sleep"):
+        results = s3.upload_many({"ok": b"1", "flaky": b"2", "denied": b"3"})
+
+    assert [(r.s3_key, r.ok, r.attempts) for r in results] == [
+        ("ok", True, 1),
+        ("flaky", True, 2),
+        ("denied", False, 1),
+    ]
+    assert isinstance(results[2].error, ClientError)
+
+
+def test_download_many_missing_key(s3):
+    """Test that a missing key fails without retries or affecting others."""
+    s3.client.put_object(Bucket=s3.bucket, Key="present", Body=b"x")
+
+    results = s3.download_many(["missing", "present"])
+
+    assert not results[0].ok and results[0].attempts == 1
+    assert results[1].data == b"x"
+
+
+def test_list_objects_paginates(s3):
+    """Test that listing follows continuation tokens past the first page."""
+    for i in range(25):
+        s3.client.put_object(Bucket=s3.bucket, Key=f"frames/abc/{i:03d}.jpg", Body=b"")
+
+    assert len(list(s3.iter_objects("frames/abc/", page_size=10))) == 25
+    assert len(s3.list_objects("frames/abc/")) == 25
+    assert s3.list_objects("frames/abc/", max_keys=12)[-1] == "frames/abc/011.jpg"
+    assert [o["Key"] for o in s3.iter_objects("frames/", start_after="frames/abc/022.jpg")] == [
+        "frames/abc/023.jpg",
+        "frames/abc/024.jpg",
+    ]
+
+
+def _put_at(s3, key, modified):
+    """Put an empty object and pretend it was last modified at ``modified``."""
+    s3.client.put_object(Bucket=s3.bucket, Key=key, Body=b"")
+    s3._fake_modified[key] = modified
+
+
+@pytest.fixture
+def scan_s3(s3):
+    """S3 client whose listings report controllable LastModified times."""
+    s3._fake_modified = {}
+    iter_objects = s3.iter_objects
+
+    def fake_iter_objects(prefix, start_after=None, page_size=1000):
+        for obj in iter_objects(prefix, start_after, page_size):
+            yield {**obj, "LastModified": s3._fake_modified.get(obj["Key"], obj["LastModified"])}
+
+    with patch.object(s3, "iter_objects", side_effect=fake_iter_objects) as listing:
+        s3.listing = listing
+        yield s3
+
+
+def _scan(s3, **kwargs):
+    return [o["Key"] for o in s3.scan_new_objects("videos/original/", "cursors/original.json", **kwargs)]
+
+
+@pytest.mark.parametrize("ordered_keys", [False, True])
+def test_scan_new_objects(scan_s3, ordered_keys):
+    """Test that each object is yielded once, including late-finishing uploads."""
+    t0 = datetime(2025, 1, 1, tzinfo=UTC)
+    _put_at(scan_s3, "videos/original/01/master.mp4", t0)
+    _put_at(scan_s3, "videos/original/02/master.mp4", t0 + timedelta(hours=2))
+
+    assert _scan(scan_s3, ordered_keys=ordered_keys) == [
+        "videos/original/01/master.mp4",
+        "videos/original/02/master.mp4",
+    ]
+    assert _scan(scan_s3, ordered_keys=ordered_keys) == []
+
+    # 03's multipart upload started before 02's but completed after the scan
+    _put_at(scan_s3, "videos/original/03/master.mp4", t0 + timedelta(hours=1, minutes=30))
+    _put_at(scan_s3, "videos/original/04/master.mp4", t0 + timedelta(hours=3))
+    assert _scan(scan_s3, ordered_keys=ordered_keys) == [
+        "videos/original/03/master.mp4",
+        "videos/original/04/master.mp4",
+    ]
+
+    cursor = scan_s3.load_scan_cursor("cursors/original.json")
+    assert cursor.horizon == t0 + timedelta(hours=2)
+    assert cursor.start_after == "videos/original/03/master.mp4"
+    assert cursor.recent == {"videos/original/04/master.mp4"}
+    scan_s3.listing.reset_mock()
+    assert _scan(scan_s3, ordered_keys=ordered_keys) == []
+    expected_start = "videos/original/03/master.mp4" if ordered_keys else None
+    assert scan_s3.listing.call_args.kwargs["start_after"] == expected_start
+
+
+def test_scan_cursor_saved_only_when_exhausted(scan_s3):
+    """Test that an interrupted scan yields the same objects again."""
+    _put_at(scan_s3, "videos/original/01/master.mp4", datetime(2025, 1, 1, tzinfo=UTC))
+
+    scan = scan_s3.scan_new_objects("videos/original/", "cursors/original.json")
+    next(scan)
+    scan.close()
+
+    assert _scan(scan_s3) == ["videos/original/01/master.mp4"]
+
+
+def test_object_cache_read_through(s3, tmp_path):
+    """Test hits, ETag-keyed invalidation and concurrent misses."""
+    cache = ObjectCache(str(tmp_path / "cache"), max_bytes=10 * MIB, client=s3)
+    s3.client.put_object(Bucket=s3.bucket, Key="videos/original/abc/master.mp4", Body=b"v1")
+
+    with patch.object(s3.client, "download_file", wraps=s3.client.download_file) as download:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            def read(_):
+                with cache.local_path("videos/original/abc/master.mp4") as path:
+                    return open(path, "rb").read()
+
+            assert list(executor.map(read, range(4))) == [b"v1"] * 4
+        assert download.call_count == 1
+
+        s3.client.put_object(Bucket=s3.bucket, Key="videos/original/abc/master.mp4", Body=b"v2")
+        with cache.local_path("videos/original/abc/master.mp4") as path:
+            assert open(path, "rb").read() == b"v2"
+        assert download.call_count == 2
+
+    assert cache.stats() == {"hits": 3, "misses": 2, "evicted_files": 0, "evicted_bytes": 0}
+
+
+def test_object_cache_evicts_least_recently_used(s3, tmp_path):
+    """Test the size bound, LRU order and that entries in use are kept."""
+    cache = ObjectCache(str(tmp_path / "cache"), max_bytes=3 * MIB, client=s3)
+    for key in "abcd":
+        s3.client.put_object(Bucket=s3.bucket, Key=key, Body=b"x" * MIB)
+
+    with cache.local_path("a") as a_path:
+        for key in "bc":
+            with cache.local_path(key):
+                pass
+        with cache.local_path("b"):
+            pass
+        # Full: "a" is least recently used but open, so "c" goes
+        with cache.local_path("d"):
+            pass
+        assert os.path.exists(a_path)
+
+    assert cache.stats()["evicted_files"] == 1
+    assert cache.stats()["evicted_bytes"] == MIB
+    misses = cache.stats()["misses"]
+    for key in "abd":
+        with cache.local_path(key):
+            pass
+    assert cache.stats()["misses"] == misses
+    with cache.local_path("c"):
+        pass
+    assert cache.stats()["misses"] == misses + 1
+
+
+def test_get_object_cache_disabled_by_default(mock_env):
+    """Test that caching is off unless a cache directory is configured."""
+    get_object_cache.cache_clear()
+    assert get_object_cache() is None
+
+
+def test_delete_many_batches_and_retries(s3):
+    """Test 1000-key batches and retries of keys that failed transiently."""
+    keys = [f"frames/abc/{i:05d}.jpg" for i in range(2500)]
+    for key in keys[:10]:
+        s3.client.put_object(Bucket=s3.bucket, Key=key, Body=b"")
+    delete_objects = s3.client.delete_objects
+    throttled = {keys[1]}
+
+    def fake_delete_objects(**kwargs):
+        objects = kwargs["Delete"]["Objects"]
+        errors = [{"Key": o["Key"], "Code": "SlowDown"} for o in objects if o["Key"] in throttled]
+        throttled.clear()
+        if {o["Key"] for o in objects} & {"denied"}:
+            errors.append({"Key": "denied", "Code": "AccessDenied", "Message": "Access Denied"})
+        delete_objects(**kwargs)
+        return {"Errors": errors}
+
+    with patch.object(s3.client, "delete_objects", side_effect=fake_delete_objects) as request, \
+            patch("time.sleep"):
+        results = s3.delete_many(keys + ["denied"])
+
+    assert request.call_count == 4
+    assert [r.s3_key for r in results] == keys + ["denied"]
+    assert all(r.ok for r in results[:-1])
+    assert results[1].attempts == 2
+    assert results[-1].error.response["Error"]["Code"] == "AccessDenied"
+    assert s3.list_objects("frames/abc/") == []
+
+
+def test_delete_video_objects(s3):
+    """Test that every prefix of the video goes and nothing else does."""
+    video_id = UUID("a1b2c3d4-e5f6-7890-abcd-ef1234567890")
+    other_id = UUID("00000000-0000-0000-0000-000000000001")
+    for vid in (video_id, other_id):
+        s3.client.put_object(Bucket=s3.bucket, Key=f"videos/original/{vid}/master.mp4", Body=b"")
+        s3.client.put_object(Bucket=s3.bucket, Key=f"videos/proxy/{vid}/index.m3u8", Body=b"")
+        s3.client.put_object(Bucket=s3.bucket, Key=f"thumbs/{vid}/poster.jpg", Body=b"")
+        for ts in range(25):
+            s3.client.put_object(Bucket=s3.bucket, Key=f"frames/{vid}/{ts}.jpg", Body=b"")
+
+    # Small batches so the frames span several listing pages and requests
+    with patch("cortana_common.s3.DELETE_BATCH_SIZE", 10):
+        assert s3.delete_video_objects(video_id, max_workers=2) == 28
+    remaining = s3.list_objects("")
+    assert len(remaining) == 28
+    assert all(str(other_id) in key for key in remaining)
+    assert s3.delete_video_objects(video_id) == 0
+
+
+def test_delete_prefix_refuses_empty_prefix(s3):
+    """Test that an empty prefix cannot wipe the bucket."""
+    with pytest.raises(ValueError):
+        s3.delete_prefix("")
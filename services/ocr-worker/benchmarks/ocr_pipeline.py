@@ -0,0 +1,149 @@
+"""Benchmark an ``ocr`` job run step by step against the streaming pipeline.
+
+Packs ``--frames`` synthetic keyframe regions (see ``ocr_throughput.py``)
+into 2 MiB shards and serves them from a simulated S3 that adds
+``--latency-ms`` per request and transfers at ``--mbps``. Then OCRs them and
+inserts their segments into the database two ways:
+
+- sequential: read every frame, then recognize every frame, then insert;
+- :class:`OcrPipeline`: fetch, recognize, normalize and insert as
+  concurrent stages with bounded queues.
+
+Both use the same warmed-up :class:`OcrPool`. Reports the wall time of each
+and the pipeline's per-stage counters. Run against a scratch database only:
+
+    TESSDATA_PREFIX=/usr/share/tesseract-ocr/5/tessdata DATABASE_URL=postgresql://... \\
+        uv run python services/ocr-worker/benchmarks/ocr_pipeline.py --frames 400
+"""
+
+import argparse
+import os
+import time
+import uuid
+
+from ocr_throughput import synthetic_regions
+
+from cortana_common.db import bulk_insert, get_db_connection
+from cortana_common.frames import FrameManifest, FrameRecord, FrameShard, read_frames
+
+from cortana_ocr_worker.pipeline import SEGMENT_COLUMNS, OcrPipeline, normalize_text, text_hash
+from cortana_ocr_worker.pool import OcrPool
+
+SHARD_BYTES = 2 * 1024 * 1024
+
+
+class SimulatedS3:
+    """In-memory objects behind a fixed request latency and bandwidth."""
+
+    def __init__(self, latency_ms: float, mbps: float):
+        self.objects: dict[str, bytes] = {}
+        self.latency = latency_ms / 1000
+        self.bytes_per_second = mbps * 1_000_000 / 8
+
+    def get_object_range(self, key: str, start: int, end: int) -> bytes:
+        data = self.objects[key][start:end + 1]
+        time.sleep(self.latency + len(data) / self.bytes_per_second)
+        return data
+
+
+def pack(video_id: uuid.UUID, images: list[bytes], s3: SimulatedS3) -> FrameManifest:
+    """Lay frames out in shards as FrameShardWriter does, one keyframe per second."""
+    shards: list[FrameShard] = []
+    data, records = bytearray(), []
+    for i, image in enumerate(images):
+        records.append(FrameRecord(timestamp_ms=i * 1000, offset=len(data), length=len(image)))
+        data += image
+        if len(data) >= SHARD_BYTES or i == len(images) - 1:
+            key = f"frames/{video_id}/shard-{len(shards):05d}.bin"
+            s3.objects[key] = bytes(data)
+            shards.append(FrameShard(key=key, size=len(data), frames=records))
+            data, records = bytearray(), []
+    return FrameManifest(video_id=video_id, shards=shards)
+
+
+def sequential(
+    manifest: FrameManifest,
+    s3: SimulatedS3,
+    pool: OcrPool,
+    owner_id: uuid.UUID,
+    languages: list[str],
+) -> int:
+    """Each step finishes before the next starts."""
+    frames = list(read_frames(manifest, s3))
+    results = list(pool.recognize([data for _, data in frames], languages))
+    rows = []
+    for (record, _), words in zip(frames, results, strict=True):
+        for word in words:
+            normalized = normalize_text(word.text)
+            if word.confidence >= 0.6 and normalized:
+                rows.append((
+                    manifest.video_id, owner_id, None, word.text, normalized,
+                    text_hash(normalized), word.language, word.confidence,
+                    record.timestamp_ms, record.timestamp_ms + 1000,
+                    record.to_frame_box(word.bounding_box),
+                ))
+    bulk_insert("segments", SEGMENT_COLUMNS, rows)
+    return len(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=400)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--mbps", type=float, default=50)
+    parser.add_argument("--languages", default="eng")
+    args = parser.parse_args()
+
+    languages = args.languages.split("+")
+    s3 = SimulatedS3(args.latency_ms, args.mbps)
+    with get_db_connection() as conn:
+        owner_id = uuid.uuid4()
+        video_id = conn.execute(
+            "INSERT INTO videos (owner_id, s3_original_path) "
+            "VALUES (%s, 'benchmark/ocr') RETURNING id",
+            (owner_id,),
+        ).fetchone()["id"]
+    images = synthetic_regions(args.frames)
+    manifest = pack(video_id, images, s3)
+
+    with OcrPool(args.processes, preload=[languages]) as pool:
+        # Wait for every process to start and load its engine
+        list(pool.recognize(images[: args.processes * pool.batch_size], languages))
+        ocr = OcrPipeline(pool, client=s3)
+        runs = [
+            ("sequential", lambda: sequential(manifest, s3, pool, owner_id, languages)),
+            ("pipeline", lambda: ocr.run(manifest, owner_id, languages=languages)),
+        ]
+        print(
+            f"{args.frames} regions in {len(manifest.shards)} shards, {args.processes} "
+            f"OCR processes, S3 {args.latency_ms:.0f} ms + {args.mbps:.0f} Mbit/s"
+        )
+        baseline = None
+        for name, run in runs:
+            start = time.perf_counter()
+            segments = run()
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(
+                f"  {name:<11} {elapsed:6.2f}s | {args.frames / elapsed:6.1f} frames/s | "
+                f"{segments} segments | {baseline / elapsed:4.2f}x"
+            )
+            with get_db_connection() as conn:
+                conn.execute("DELETE FROM segments WHERE video_id = %s", (video_id,))
+
+    for stage, stats in ocr.stats().items():
+        print(
+            f"  {stage:<10} {stats['workers']} workers | {stats['items_in']:6} in "
+            f"{stats['items_out']:6} out | busy {stats['busy_seconds']:6.2f}s "
+            f"starved {stats['starved_seconds']:6.2f}s blocked {stats['blocked_seconds']:6.2f}s "
+            f"| {stats['utilization']:4.0%}"
+        )
+    print(f"  limited by {ocr.bottleneck}")
+
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM videos WHERE id = %s", (video_id,))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark OCR throughput of the persistent engine pool against per-frame engines.
+
+Renders ``--frames`` synthetic keyframe regions (a few lines of UI text on a
+1280px wide strip, as emitted by the sampler's region tracker) and
+recognizes them three ways:
+
+- a fresh engine per frame, which is what spawning the ``tesseract`` CLI per
+  keyframe costs at least (the CLI is also timed if it is installed);
+- :class:`OcrPool` with one process;
+- :class:`OcrPool` with ``--processes`` processes (default: CPU count).
+
+Reports frames/sec and frames/sec per core.
+
+    TESSDATA_PREFIX=/usr/share/tesseract-ocr/5/tessdata \\
+        uv run python services/ocr-worker/benchmarks/ocr_throughput.py --frames 400
+"""
+
+import argparse
+import io
+import os
+import shutil
+import subprocess
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from cortana_ocr_worker.engine import OcrEngine
+from cortana_ocr_worker.pool import OcrPool
+
+WORDS = (
+    "deploy build status failed passed merge request pipeline cluster node "
+    "memory latency p99 error warning invoice total revenue quarter report"
+).split()
+
+
+def synthetic_regions(frames: int, seed: int = 0) -> list[bytes]:
+    """Render JPEG strips of 1280x120 with three lines of random words."""
+    rng = np.random.default_rng(seed)
+    font = ImageFont.load_default(size=22)
+    out = []
+    for _ in range(frames):
+        image = Image.new("L", (1280, 120), 245)
+        draw = ImageDraw.Draw(image)
+        for line in range(3):
+            text = " ".join(rng.choice(WORDS, int(rng.integers(4, 10))))
+            draw.text((16, 10 + 34 * line), text, fill=30, font=font)
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=85)
+        out.append(buffer.getvalue())
+    return out
+
+
+def per_frame_engines(images: list[bytes], languages: list[str]) -> float:
+    """Frames/sec when every frame loads its own engine."""
+    start = time.perf_counter()
+    for image in images:
+        engine = OcrEngine(languages)
+        engine.recognize(image)
+        engine.close()
+    return len(images) / (time.perf_counter() - start)
+
+
+def per_frame_cli(images: list[bytes], languages: list[str]) -> float:
+    """Frames/sec when every frame spawns the tesseract CLI."""
+    start = time.perf_counter()
+    for image in images:
+        subprocess.run(
+            ["tesseract", "stdin", "stdout", "-l", "+".join(languages), "tsv"],
+            input=image,
+            capture_output=True,
+            check=True,
+        )
+    return len(images) / (time.perf_counter() - start)
+
+
+def pooled(images: list[bytes], languages: list[str], processes: int, batch_size: int) -> float:
+    """Frames/sec of a warmed-up OcrPool."""
+    with OcrPool(processes, batch_size, preload=[languages]) as pool:
+        # Wait for every process to start and load its engine
+        list(pool.recognize(images[: processes * batch_size], languages))
+        start = time.perf_counter()
+        list(pool.recognize(images, languages))
+        return len(images) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=400)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--languages", default="eng")
+    args = parser.parse_args()
+
+    languages = args.languages.split("+")
+    images = synthetic_regions(args.frames)
+    baseline = min(args.frames, 50)
+
+    results = [("engine per frame", 1, per_frame_engines(images[:baseline], languages))]
+    if shutil.which("tesseract"):
+        results.append(("tesseract CLI per frame", 1, per_frame_cli(images[:baseline], languages)))
+    results.append(("pool, 1 process", 1, pooled(images, languages, 1, args.batch_size)))
+    if args.processes > 1:
+        results.append((
+            f"pool, {args.processes} processes",
+            args.processes,
+            pooled(images, languages, args.processes, args.batch_size),
+        ))
+
+    print(f"{args.frames} regions of 1280x120, languages {'+'.join(languages)}")
+    for name, cores, fps in results:
+        print(f"  {name:<28} {fps:8.1f} frames/s | {fps / cores:6.1f} frames/s per core")
+
+
+if __name__ == "__main__":
+    main()
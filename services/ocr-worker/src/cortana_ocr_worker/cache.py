@@ -0,0 +1,253 @@
+"""Cross-video OCR result cache in Postgres, keyed by image content hash.
+
+The same UI chrome (app headers, nav bars, "Like · Reply" buttons) shows up
+in many recordings. Results are stored in ``ocr_result_cache`` under
+``sha256(OCR settings + image)``, and a frame or region whose hash is
+already there is not sent to Tesseract at all.
+
+Encoded images are hashed as they are: the sampler's JPEG encoder is
+deterministic, so identical pixels give identical bytes, and the parent
+process does not have to decode frames just to look them up.
+"""
+
+import hashlib
+import json
+import logging
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import timedelta
+from itertools import islice
+from typing import Optional, Union
+
+from PIL import Image
+
+from cortana_common.config import get_settings
+from cortana_common.db import get_db_connection
+
+from cortana_ocr_worker.models import Word
+from cortana_ocr_worker.pool import OcrPool
+
+logger = logging.getLogger(__name__)
+
+# Hits refresh last_used_at at most this often, so hot entries are not
+# rewritten on every lookup
+TOUCH_INTERVAL = timedelta(hours=1)
+
+_GET_QUERY = """
+WITH hit AS (
+    SELECT content_hash, words
+    FROM ocr_result_cache
+    WHERE content_hash = ANY(%s)
+), touched AS (
+    UPDATE ocr_result_cache
+    SET last_used_at = now()
+    WHERE content_hash IN (SELECT content_hash FROM hit)
+      AND last_used_at < now() - %s
+)
+SELECT content_hash, words FROM hit
+"""
+
+_PUT_QUERY = """
+INSERT INTO ocr_result_cache (content_hash, words, byte_size)
+SELECT * FROM unnest(%s::bytea[], %s::jsonb[], %s::integer[])
+ON CONFLICT (content_hash) DO NOTHING
+"""
+
+
+def tesseract_version() -> str:
+    """Version of the libtesseract the engines use, e.g. ``"5.3.4"``."""
+    # Imported here so cache lookups do not load libtesseract in the parent
+    import tesserocr
+
+    return tesserocr.tesseract_version().split()[1]
+
+
+def settings_key(languages: Sequence[str], psm: int) -> bytes:
+    """Identify the OCR settings a cached result was produced with."""
+    return f"tesseract {tesseract_version()}|{'+'.join(languages)}|psm {psm}".encode()
+
+
+def content_hash(image: Union[bytes, Image.Image], key: bytes) -> bytes:
+    """Hash an image together with the OCR settings key.
+    
+    Args:
+        image: Encoded image bytes or a PIL image (hashed by mode, size and
+            raw pixels).
+        key: Result of :func:`settings_key`.
+    
+    Returns:
+        32-byte sha256 digest.
+    """
+    digest = hashlib.sha256(key)
+    digest.update(b"\0")
+    if isinstance(image, Image.Image):
+        digest.update(f"{image.mode} {image.size}\0".encode())
+        digest.update(image.tobytes())
+    else:
+        digest.update(image)
+    return digest.digest()
+
+
+class OcrResultCache:
+    """Look up and store OCR results shared across videos.
+    
+    Example:
+        cache = OcrResultCache()
+        with OcrPool() as pool:
+            for words in cache.recognize(pool, images, ["eng"]):
+                ...
+        print(cache.stats())  # {"hits": ..., "misses": ..., "hit_ratio": ...}
+    """
+
+    def __init__(self, chunk_size: int = 256):
+        """Initialize the cache.
+        
+        Args:
+            chunk_size: Images looked up per query.
+        """
+        self.chunk_size = chunk_size
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    def get_many(self, hashes: Iterable[bytes]) -> dict[bytes, list[Word]]:
+        """Fetch cached results in one query.
+        
+        Args:
+            hashes: Content hashes.
+        
+        Returns:
+            Words per hash that is in the cache.
+        """
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(_GET_QUERY, (list(hashes), TOUCH_INTERVAL))
+                rows = cur.fetchall()
+        return {bytes(row["content_hash"]): [Word(*word) for word in row["words"]] for row in rows}
+
+    def put_many(self, results: dict[bytes, list[Word]]) -> None:
+        """Store results in one query; hashes already cached are left alone.
+        
+        Args:
+            results: Words per content hash.
+        """
+        if not results:
+            return
+        documents = [json.dumps([list(word) for word in words]) for words in results.values()]
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(_PUT_QUERY, (
+                    list(results),
+                    documents,
+                    [len(document.encode()) + 64 for document in documents],
+                ))
+        self.stored += len(results)
+
+    def recognize(
+        self,
+        pool: OcrPool,
+        images: Iterable[Union[bytes, Image.Image]],
+        languages: Sequence[str] = ("eng",),
+    ) -> Iterator[list[Word]]:
+        """Recognize frames, reusing cached results.
+        
+        Images are looked up ``chunk_size`` at a time. Only misses go to the
+        pool, each distinct image of a chunk once, and their results are
+        stored. The misses of all chunks stream into a single pool call, so
+        the engines keep working through the next chunk's lookup instead of
+        draining at every chunk boundary.
+        
+        Args:
+            pool: Engine pool for cache misses.
+            images: Encoded images or PIL images.
+            languages: Tesseract language codes.
+        
+        Yields:
+            The words of each image, in input order.
+        """
+        key = settings_key(languages, pool.psm)
+        # Looked-up chunks not yet yielded: hashes, hits and missed hashes
+        chunks: deque[tuple[list[bytes], dict[bytes, list[Word]], list[bytes]]] = deque()
+        recognized: deque[list[Word]] = deque()
+
+        def misses() -> Iterator[Union[bytes, Image.Image]]:
+            iterator = iter(images)
+            while chunk := list(islice(iterator, self.chunk_size)):
+                hashes = [content_hash(image, key) for image in chunk]
+                cached = self.get_many(set(hashes))
+                missing = {}
+                for digest, image in zip(hashes, chunk, strict=True):
+                    if digest not in cached:
+                        missing.setdefault(digest, image)
+                chunks.append((hashes, cached, list(missing)))
+                yield from missing.values()
+
+        def ready() -> Iterator[list[Word]]:
+            # Chunks complete once the pool has returned all of their misses
+            while chunks and len(recognized) >= len(chunks[0][2]):
+                hashes, cached, missing = chunks.popleft()
+                fresh = {digest: recognized.popleft() for digest in missing}
+                self.put_many(fresh)
+                self.hits += len(hashes) - len(missing)
+                self.misses += len(missing)
+                for digest in hashes:
+                    yield cached[digest] if digest in cached else fresh[digest]
+
+        for words in pool.recognize(misses(), languages):
+            recognized.append(words)
+            yield from ready()
+        yield from ready()
+
+    def stats(self) -> dict[str, float]:
+        """Get cache counters for this run.
+        
+        Returns:
+            Dictionary with ``hits`` (images not sent to Tesseract, including
+            repeats within the run), ``misses``, ``stored`` and ``hit_ratio``.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stored": self.stored,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+def evict_ocr_result_cache(max_bytes: Optional[int] = None, batch_size: int = 10000) -> int:
+    """Delete least recently used cache entries beyond a size bound.
+    
+    Finds the cutoff once with ``ocr_result_cache_cutoff``, then runs the
+    ``evict_ocr_result_cache`` database function in batches, one transaction
+    each, until every entry up to the cutoff is gone. Meant to run
+    periodically (e.g. from a CronJob).
+    
+    Args:
+        max_bytes: Size bound (default: ``ocr_cache_max_bytes``).
+        batch_size: Entries deleted per transaction.
+    
+    Returns:
+        Number of entries deleted.
+    """
+    max_bytes = max_bytes if max_bytes is not None else get_settings().ocr_cache_max_bytes
+    total = 0
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT ocr_result_cache_cutoff(%s) AS cutoff", (max_bytes,))
+            cutoff = cur.fetchone()["cutoff"]
+
+    while cutoff is not None:
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT evict_ocr_result_cache(%s, %s) AS deleted", (cutoff, batch_size)
+                )
+                deleted = cur.fetchone()["deleted"]
+
+        total += deleted
+        if deleted < batch_size:
+            break
+
+    logger.info(f"Evicted {total} OCR result cache entries")
+    return total
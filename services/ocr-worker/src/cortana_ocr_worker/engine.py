@@ -0,0 +1,85 @@
+"""Tesseract engine that loads its language models once and is reused across frames.
+
+Spawning the ``tesseract`` CLI per keyframe pays for process startup and for
+loading every ``*.traineddata`` model on each call, which costs several times
+more than recognizing a typical keyframe region. :class:`OcrEngine` keeps one
+``TessBaseAPI`` handle (via tesserocr) alive for a set of languages.
+
+Language models are looked up in ``TESSDATA_PREFIX``.
+"""
+
+import io
+from collections.abc import Sequence
+from typing import Union
+
+from PIL import Image
+from tesserocr import PSM, RIL, PyTessBaseAPI, iterate_level
+
+from cortana_ocr_worker.models import Word
+
+
+class OcrEngine:
+    """A persistent Tesseract handle for one set of languages.
+    
+    Not thread-safe: use one engine per thread or process.
+    
+    Example:
+        engine = OcrEngine(["eng", "deu"])
+        for word in engine.recognize(jpeg_bytes):
+            print(word.text, word.confidence, word.bounding_box)
+        engine.close()
+    """
+
+    def __init__(self, languages: Sequence[str] = ("eng",), psm: int = PSM.AUTO):
+        """Load the language models.
+        
+        Args:
+            languages: Tesseract language codes, e.g. ``["eng", "deu"]``.
+            psm: Page segmentation mode (default: automatic).
+        
+        Raises:
+            RuntimeError: If a language model cannot be loaded.
+        """
+        self.languages = tuple(languages)
+        self.api = PyTessBaseAPI(lang="+".join(self.languages), psm=psm)
+
+    def recognize(self, image: Union[bytes, Image.Image]) -> list[Word]:
+        """Recognize the words of one image.
+        
+        Args:
+            image: Encoded image bytes (e.g. a JPEG keyframe) or a PIL image.
+        
+        Returns:
+            Words in reading order; empty words are skipped.
+        """
+        if not isinstance(image, Image.Image):
+            image = Image.open(io.BytesIO(image))
+            # JPEGs decode straight to grayscale; Tesseract binarizes anyway
+            image.draft("L", image.size)
+            image = image.convert("L")
+        self.api.SetImage(image)
+        self.api.Recognize()
+
+        words = []
+        for word in iterate_level(self.api.GetIterator(), RIL.WORD):
+            if word.Empty(RIL.WORD):
+                continue
+            text = word.GetUTF8Text(RIL.WORD).strip()
+            if not text:
+                continue
+            left, top, right, bottom = word.BoundingBox(RIL.WORD)
+            words.append(Word(
+                text,
+                word.Confidence(RIL.WORD) / 100,
+                left,
+                top,
+                right - left,
+                bottom - top,
+                word.WordRecognitionLanguage(),
+            ))
+        self.api.Clear()
+        return words
+
+    def close(self) -> None:
+        """Release the Tesseract handle."""
+        self.api.End()
@@ -0,0 +1,28 @@
+"""Data types of the OCR worker that do not need libtesseract.
+
+The parent process only streams frames, caches results and inserts rows;
+importing these from here keeps it (and the tests) from loading tesserocr,
+which only the pool's engine processes need.
+"""
+
+from typing import NamedTuple, Optional
+
+# tesserocr.PSM.AUTO: fully automatic page segmentation
+PSM_AUTO = 3
+
+
+class Word(NamedTuple):
+    """A recognized word, ready to become a ``Segment`` row."""
+
+    text: str
+    confidence: float  # 0-1, as in Segment.confidence
+    x: int
+    y: int
+    width: int
+    height: int
+    language: Optional[str]
+
+    @property
+    def bounding_box(self) -> dict[str, int]:
+        """Box in image coordinates, in the ``segments.bounding_box`` format."""
+        return {"x": self.x, "y": self.y, "width": self.width, "height": self.height}
@@ -0,0 +1,423 @@
+"""Streaming OCR pipeline that overlaps frame fetching, recognition and inserts.
+
+Run one step after another, an ``ocr`` job leaves either the network or the
+CPU idle: nothing is recognized while frames download, and nothing
+downloads while frames are recognized. :class:`OcrPipeline` runs the steps
+as stages connected by bounded queues::
+
+    fetch      threads, ranged GETs of one shard each
+    recognize  OcrPool processes, optionally through OcrResultCache
+    normalize  confidence filter, normalized text and hash, segment rows
+    insert     bulk_insert (binary COPY), one transaction per job
+
+A full queue blocks the stage in front of it, so memory depends on the queue
+sizes and the frames in flight in the pool, not on how many keyframes a
+video has. Each stage counts the items it consumed and produced and how
+long its workers were busy, starved (waiting for input) or blocked
+(waiting for room downstream). The stage with the highest utilization is
+the one limiting throughput.
+
+Frames stay encoded until they reach a pool process, which decodes them:
+a JPEG region crosses the process boundary as a few kilobytes instead of
+its raw pixels, and the cache hashes the encoded bytes.
+"""
+
+import hashlib
+import logging
+import queue
+import threading
+import time
+import unicodedata
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from functools import partial
+from typing import Any, Optional
+from uuid import UUID
+
+from cortana_common.db import bulk_insert
+from cortana_common.frames import FrameManifest, FrameRecord, FrameShard, read_frames
+from cortana_common.s3 import S3Client, get_s3_client
+
+from cortana_ocr_worker.cache import OcrResultCache
+from cortana_ocr_worker.models import Word
+from cortana_ocr_worker.pool import OcrPool
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_COLUMNS = (
+    "video_id",
+    "owner_id",
+    "team_id",
+    "text",
+    "normalized_text",
+    "text_hash",
+    "language",
+    "confidence",
+    "t_start",
+    "t_end",
+    "bounding_box",
+)
+
+# Ends a queue; the last worker of a stage puts one per downstream worker
+_DONE = object()
+
+# How often a blocked worker checks whether another stage failed
+_POLL_SECONDS = 0.1
+
+
+class _AbortedError(Exception):
+    """Raised in a stage's worker when another stage failed."""
+
+
+def normalize_text(text: str) -> str:
+    """Normalize OCR text for search and deduplication.
+    
+    Applies NFKC (folds ligatures and full-width forms), lowercases and
+    collapses whitespace.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).lower().split())
+
+
+def text_hash(normalized_text: str) -> str:
+    """Hash of normalized text, for ``segments.text_hash``."""
+    return hashlib.sha256(normalized_text.encode()).hexdigest()
+
+
+def _keyframe_ends(manifest: FrameManifest) -> dict[int, int]:
+    """End of each keyframe: the next keyframe, or after the last, the end of the video."""
+    timestamps = sorted({r.timestamp_ms for shard in manifest.shards for r in shard.frames})
+    ends = dict(zip(timestamps, timestamps[1:], strict=False))
+    if timestamps:
+        last = timestamps[-1]
+        interval = last - timestamps[-2] if len(timestamps) > 1 else 0
+        ends[last] = last + interval
+        if manifest.duration_ms is not None and manifest.duration_ms > last:
+            ends[last] = manifest.duration_ms
+    return ends
+
+
+class _Counters:
+    """Counters of one worker thread, summed per stage by :meth:`OcrPipeline.stats`."""
+
+    def __init__(self):
+        self.items_in = 0
+        self.items_out = 0
+        self.seconds = 0.0
+        self.starved = 0.0
+        self.blocked = 0.0
+
+
+class _Stage:
+    """A step of the pipeline, run by ``workers`` threads sharing one input queue."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Iterator[Any]], Optional[Iterator[Any]]],
+        workers: int,
+        inbox: queue.Queue,
+    ):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.inbox = inbox
+        self.outbox: Optional[queue.Queue] = None
+        self.downstream_workers = 0
+        self.running = workers
+        self.counters = [_Counters() for _ in range(workers)]
+
+
+class OcrPipeline:
+    """Run the steps of an ``ocr`` job concurrently, with bounded memory.
+    
+    Example:
+        with OcrPool() as pool:
+            pipeline = OcrPipeline(pool, cache=OcrResultCache())
+            manifest = load_frame_manifest(payload["manifest_path"])
+            count = pipeline.run(manifest, video["owner_id"], video["team_id"], ["eng"])
+            print(pipeline.stats()["recognize"]["utilization"], pipeline.bottleneck)
+    """
+
+    def __init__(
+        self,
+        pool: OcrPool,
+        cache: Optional[OcrResultCache] = None,
+        client: Optional[S3Client] = None,
+        fetch_threads: int = 2,
+        queue_size: int = 32,
+        insert_batch_size: Optional[int] = None,
+    ):
+        """Initialize the pipeline.
+        
+        Args:
+            pool: Engine pool for recognition; its processes are the
+                recognize stage's concurrency.
+            cache: Cross-video result cache (default: recognize every frame).
+            client: S3 client (default: the cached client).
+            fetch_threads: Shards fetched at once.
+            queue_size: Items each queue between two stages holds.
+            insert_batch_size: Rows per ``COPY`` (default: ``db_copy_batch_size``).
+        """
+        self.pool = pool
+        self.cache = cache
+        self.client = client or get_s3_client()
+        self.fetch_threads = fetch_threads
+        self.queue_size = queue_size
+        self.insert_batch_size = insert_batch_size
+        self.seconds = 0.0
+        self._stages: list[_Stage] = []
+        self._lock = threading.Lock()
+        self._abort = threading.Event()
+        self._errors: list[BaseException] = []
+
+    def run(
+        self,
+        manifest: FrameManifest,
+        owner_id: UUID,
+        team_id: Optional[UUID] = None,
+        languages: Sequence[str] = ("eng",),
+        min_confidence: float = 0.6,
+    ) -> int:
+        """OCR every keyframe of a manifest and insert the words as segments.
+        
+        Segments are inserted in one transaction: if any stage fails, none
+        of the video's segments are committed and the job can be retried.
+        A word spans from its keyframe's timestamp to the record's
+        ``visible_until_ms``, when the sampler tracked how long the region
+        stayed on screen. Otherwise it ends at the next keyframe, and on the
+        last keyframe at the video's ``duration_ms`` or one keyframe
+        interval later.
+        
+        Args:
+            manifest: Keyframe manifest of the video.
+            owner_id: Owner copied from the video.
+            team_id: Team copied from the video.
+            languages: Tesseract language codes.
+            min_confidence: Words below this confidence (0-1) are dropped.
+        
+        Returns:
+            Number of segments inserted.
+        
+        Raises:
+            Exception: The first error raised by a stage; the other stages
+                are stopped.
+        """
+        keyframe_ends = _keyframe_ends(manifest)
+        context = manifest.model_copy(update={"shards": []})
+
+        shards: queue.Queue = queue.Queue()
+        for shard in manifest.shards:
+            shards.put(shard)
+        self._abort.clear()
+        self._errors = []
+        self._stages = []
+        self._add_stage("fetch", partial(self._fetch, context), self.fetch_threads, shards)
+        self._add_stage("recognize", partial(self._recognize, tuple(languages)), 1)
+        self._add_stage(
+            "normalize",
+            partial(
+                self._normalize,
+                manifest.video_id,
+                owner_id,
+                team_id,
+                min_confidence,
+                keyframe_ends,
+            ),
+            1,
+        )
+        self._add_stage("insert", self._insert, 1)
+        for _ in range(self.fetch_threads):
+            shards.put(_DONE)
+
+        start = time.perf_counter()
+        threads = [
+            threading.Thread(
+                target=self._work,
+                args=(stage, counters),
+                name=f"ocr-{stage.name}-{i}",
+                daemon=True,
+            )
+            for stage in self._stages
+            for i, counters in enumerate(stage.counters)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.seconds = time.perf_counter() - start
+
+        if self._errors:
+            raise self._errors[0]
+
+        stats = self.stats()
+        bottleneck = self.bottleneck
+        logger.info(
+            f"OCR pipeline for video {manifest.video_id}: {stats['recognize']['items_in']} "
+            f"frames, {stats['insert']['items_in']} segments in {self.seconds:.1f}s; "
+            f"limited by {bottleneck} ({stats[bottleneck]['utilization']:.0%} busy)"
+        )
+        return stats["insert"]["items_in"]
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Get per-stage counters of the last run.
+        
+        Returns:
+            Dictionary per stage (``fetch``, ``recognize``, ``normalize``,
+            ``insert``) with ``workers``, ``items_in``,
+            ``items_out``, ``busy_seconds``, ``starved_seconds``,
+            ``blocked_seconds`` (summed over workers), ``items_per_second``
+            (``items_in`` over the run's wall time) and ``utilization``
+            (share of the workers' time spent busy).
+        """
+        stats = {}
+        for stage in self._stages:
+            seconds = sum(c.seconds for c in stage.counters)
+            starved = sum(c.starved for c in stage.counters)
+            blocked = sum(c.blocked for c in stage.counters)
+            busy = max(seconds - starved - blocked, 0.0)
+            items_in = sum(c.items_in for c in stage.counters)
+            stats[stage.name] = {
+                "workers": stage.workers,
+                "items_in": items_in,
+                "items_out": sum(c.items_out for c in stage.counters),
+                "busy_seconds": busy,
+                "starved_seconds": starved,
+                "blocked_seconds": blocked,
+                "items_per_second": items_in / self.seconds if self.seconds else 0.0,
+                "utilization": busy / seconds if seconds else 0.0,
+            }
+        return stats
+
+    @property
+    def bottleneck(self) -> Optional[str]:
+        """Name of the stage that was busy for the largest share of the last run."""
+        stats = self.stats()
+        return max(stats, key=lambda name: stats[name]["utilization"], default=None)
+
+    def _add_stage(
+        self,
+        name: str,
+        func: Callable[[Iterator[Any]], Optional[Iterator[Any]]],
+        workers: int,
+        inbox: Optional[queue.Queue] = None,
+    ) -> None:
+        """Append a stage, reading from the previous stage's queue."""
+        if inbox is None:
+            previous = self._stages[-1]
+            previous.outbox = inbox = queue.Queue(maxsize=self.queue_size)
+            previous.downstream_workers = workers
+        self._stages.append(_Stage(name, func, workers, inbox))
+
+    def _work(self, stage: _Stage, counters: _Counters) -> None:
+        """Run one worker of a stage until its input ends or the pipeline fails."""
+        start = time.perf_counter()
+        try:
+            outputs = stage.func(self._receive(stage, counters))
+            for item in outputs or ():
+                self._send(stage, counters, item)
+                counters.items_out += 1
+            with self._lock:
+                stage.running -= 1
+                last = stage.running == 0
+            if last and stage.outbox is not None:
+                for _ in range(stage.downstream_workers):
+                    self._send(stage, counters, _DONE)
+        except _AbortedError:
+            pass
+        except BaseException as e:
+            logger.error(f"OCR pipeline stage {stage.name} failed: {e}")
+            with self._lock:
+                self._errors.append(e)
+            self._abort.set()
+        finally:
+            counters.seconds += time.perf_counter() - start
+
+    def _receive(self, stage: _Stage, counters: _Counters) -> Iterator[Any]:
+        """Yield a stage's input items until the previous stage is done."""
+        while True:
+            start = time.perf_counter()
+            while True:
+                try:
+                    item = stage.inbox.get(timeout=_POLL_SECONDS)
+                    break
+                except queue.Empty:
+                    if self._abort.is_set():
+                        raise _AbortedError("another OCR pipeline stage failed") from None
+            counters.starved += time.perf_counter() - start
+            if item is _DONE:
+                return
+            counters.items_in += 1
+            yield item
+
+    def _send(self, stage: _Stage, counters: _Counters, item: Any) -> None:
+        """Put an item on a stage's output queue, waiting while it is full."""
+        start = time.perf_counter()
+        while True:
+            try:
+                stage.outbox.put(item, timeout=_POLL_SECONDS)
+                break
+            except queue.Full:
+                if self._abort.is_set():
+                    raise _AbortedError("another OCR pipeline stage failed") from None
+        counters.blocked += time.perf_counter() - start
+
+    def _fetch(
+        self, context: FrameManifest, shards: Iterable[FrameShard]
+    ) -> Iterator[tuple[FrameRecord, bytes]]:
+        for shard in shards:
+            manifest = context.model_copy(update={"shards": [shard]})
+            yield from read_frames(manifest, self.client)
+
+    def _recognize(
+        self, languages: tuple[str, ...], frames: Iterable[tuple[FrameRecord, bytes]]
+    ) -> Iterator[tuple[FrameRecord, list[Word]]]:
+        # Both the pool and the cache yield results in input order
+        records: deque[FrameRecord] = deque()
+
+        def images() -> Iterator[bytes]:
+            for record, data in frames:
+                records.append(record)
+                yield data
+
+        if self.cache is not None:
+            results = self.cache.recognize(self.pool, images(), languages)
+        else:
+            results = self.pool.recognize(images(), languages)
+        for words in results:
+            yield records.popleft(), words
+
+    def _normalize(
+        self,
+        video_id: UUID,
+        owner_id: UUID,
+        team_id: Optional[UUID],
+        min_confidence: float,
+        keyframe_ends: dict[int, int],
+        results: Iterable[tuple[FrameRecord, list[Word]]],
+    ) -> Iterator[tuple]:
+        for record, words in results:
+            t_end = record.visible_until_ms
+            if t_end is None:
+                t_end = keyframe_ends[record.timestamp_ms]
+            for word in words:
+                if word.confidence < min_confidence:
+                    continue
+                normalized = normalize_text(word.text)
+                if not normalized:
+                    continue
+                yield (
+                    video_id,
+                    owner_id,
+                    team_id,
+                    word.text,
+                    normalized,
+                    text_hash(normalized),
+                    word.language,
+                    word.confidence,
+                    record.timestamp_ms,
+                    t_end,
+                    record.to_frame_box(word.bounding_box),
+                )
+
+    def _insert(self, rows: Iterable[tuple]) -> None:
+        bulk_insert("segments", SEGMENT_COLUMNS, rows, batch_size=self.insert_batch_size)
@@ -0,0 +1,168 @@
+"""Process pool of persistent OCR engines with batched frame recognition."""
+
+import logging
+import os
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import get_context
+from typing import TYPE_CHECKING, Optional, Union
+
+from PIL import Image
+
+from cortana_ocr_worker.models import PSM_AUTO, Word
+
+if TYPE_CHECKING:
+    from cortana_ocr_worker.engine import OcrEngine
+
+logger = logging.getLogger(__name__)
+
+# Engines of this process, one per language set and mode; filled lazily
+_engines: dict[tuple[tuple[str, ...], int], "OcrEngine"] = {}
+
+
+def _engine(languages: tuple[str, ...], psm: int) -> "OcrEngine":
+    """This process's engine for ``languages``, loaded on first use."""
+    engine = _engines.get((languages, psm))
+    if engine is None:
+        # Imported here so only the engine processes load libtesseract
+        from cortana_ocr_worker.engine import OcrEngine
+
+        start = time.perf_counter()
+        engine = _engines[(languages, psm)] = OcrEngine(languages, psm)
+        logger.info(
+            f"Loaded Tesseract {'+'.join(languages)} in process {os.getpid()} "
+            f"({time.perf_counter() - start:.2f}s)"
+        )
+    return engine
+
+
+def _load_engines(preload: list[tuple[str, ...]], psm: int) -> None:
+    """Pool initializer: load the engines every process is expected to need."""
+    for languages in preload:
+        _engine(languages, psm)
+
+
+def _recognize_batch(
+    languages: tuple[str, ...],
+    psm: int,
+    images: list[Union[bytes, Image.Image]],
+) -> list[list[Word]]:
+    """Recognize a batch of images with this process's engine for ``languages``."""
+    engine = _engine(languages, psm)
+    return [engine.recognize(image) for image in images]
+
+
+class OcrPool:
+    """Recognize frames on a pool of processes, each holding persistent engines.
+    
+    Frames are sent to the processes in batches, so the per-call overhead
+    (pickling, scheduling) is paid once per batch rather than per frame.
+    Each process loads a Tesseract handle the first time it sees a language
+    set and reuses it for every later batch.
+    
+    Example:
+        with OcrPool() as pool:
+            for (record, _), words in zip(records, pool.recognize(images, ["eng"])):
+                ...
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        batch_size: int = 16,
+        psm: int = PSM_AUTO,
+        preload: Sequence[Sequence[str]] = (("eng",),),
+    ):
+        """Start the pool.
+        
+        Args:
+            processes: Engine processes (default: CPU count).
+            batch_size: Frames sent to a process at once.
+            psm: Tesseract page segmentation mode.
+            preload: Language sets loaded by every process at startup; other
+                sets are loaded on first use.
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.psm = psm
+        # One single-threaded engine per core: Tesseract's OpenMP threads would
+        # only contend with the other processes. Spawned processes inherit the
+        # variable before they load libtesseract.
+        os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+        # Spawned, not forked: the parent usually runs DB pools and S3 threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=get_context("spawn"),
+            initializer=_load_engines,
+            initargs=([tuple(languages) for languages in preload], psm),
+        )
+        self.frames = 0
+        self.seconds = 0.0
+
+    def recognize(
+        self,
+        images: Iterable[Union[bytes, Image.Image]],
+        languages: Sequence[str] = ("eng",),
+    ) -> Iterator[list[Word]]:
+        """Recognize frames in order.
+        
+        ``images`` is consumed lazily: at most two batches per process are
+        in flight, so frames can be streamed from S3 while earlier batches
+        are being recognized.
+        
+        Args:
+            images: Encoded images (e.g. from ``cortana_common.frames.read_frames``)
+                or PIL images.
+            languages: Tesseract language codes.
+        
+        Yields:
+            The words of each image, in input order.
+        """
+        key = tuple(languages)
+        pending: deque[Future] = deque()
+        iterator = iter(images)
+        start = time.perf_counter()
+        try:
+            while batch := list(islice(iterator, self.batch_size)):
+                pending.append(self._executor.submit(_recognize_batch, key, self.psm, batch))
+                if len(pending) >= 2 * self.processes:
+                    yield from self._collect(pending.popleft())
+            while pending:
+                yield from self._collect(pending.popleft())
+        finally:
+            for future in pending:
+                future.cancel()
+            self.seconds += time.perf_counter() - start
+
+    def _collect(self, future: Future) -> list[list[Word]]:
+        results = future.result()
+        self.frames += len(results)
+        return results
+
+    def stats(self) -> dict[str, float]:
+        """Get pool counters.
+        
+        Returns:
+            Dictionary with ``processes``, ``frames``, ``frames_per_second``
+            and ``frames_per_second_per_process``.
+        """
+        fps = self.frames / self.seconds if self.seconds else 0.0
+        return {
+            "processes": self.processes,
+            "frames": self.frames,
+            "frames_per_second": fps,
+            "frames_per_second_per_process": fps / self.processes,
+        }
+
+    def close(self) -> None:
+        """Stop the engine processes."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "OcrPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,137 @@
+"""Tests for the cross-video OCR result cache."""
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import islice
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cortana_ocr_worker import cache
+from cortana_ocr_worker.models import Word
+
+HEADER = Word("Home", 0.96, 10, 4, 60, 18, "eng")
+
+
+@pytest.fixture(autouse=True)
+def tesseract_version():
+    """Pin the engine version so settings keys do not need libtesseract."""
+    with patch("cortana_ocr_worker.cache.tesseract_version", return_value="5.3.4"):
+        yield
+
+
+@pytest.fixture
+def mock_cursor():
+    """Patch the cache module's connections and yield the shared mock cursor."""
+    cursor = MagicMock()
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    @contextmanager
+    def fake_connection():
+        yield conn
+
+    with patch("cortana_ocr_worker.cache.get_db_connection", fake_connection):
+        yield cursor
+
+
+class FakePool:
+    """Stands in for OcrPool: returns one word per image, recording calls."""
+
+    psm = 3
+
+    def __init__(self):
+        self.seen = []
+
+    def recognize(self, images, languages):
+        for image in images:
+            self.seen.append(image)
+            yield [Word(image.decode(), 0.9, 0, 0, 10, 10, "eng")]
+
+
+def test_content_hash_includes_settings():
+    """Test that the same image under other OCR settings is a different entry."""
+    image = b"jpeg bytes"
+    eng = cache.settings_key(["eng"], 3)
+
+    assert cache.content_hash(image, eng) == cache.content_hash(image, eng)
+    assert cache.content_hash(image, eng) != cache.content_hash(image, cache.settings_key(["deu"], 3))
+    assert cache.content_hash(image, eng) != cache.content_hash(image, cache.settings_key(["eng"], 6))
+    assert cache.content_hash(image, eng) != cache.content_hash(b"other", eng)
+
+
+def test_recognize_skips_hits_and_repeats(mock_cursor):
+    """Test that cached and repeated images are not sent to the pool."""
+    key = cache.settings_key(["eng"], FakePool.psm)
+    header = cache.content_hash(b"header", key)
+    mock_cursor.fetchall.return_value = [{"content_hash": header, "words": [list(HEADER)]}]
+    pool = FakePool()
+    result_cache = cache.OcrResultCache()
+
+    results = list(result_cache.recognize(pool, [b"header", b"a", b"header", b"b", b"a"], ["eng"]))
+
+    assert pool.seen == [b"a", b"b"]
+    assert [[w.text for w in words] for words in results] == [["Home"], ["a"], ["Home"], ["b"], ["a"]]
+    assert results[0] == [HEADER]
+    assert result_cache.stats() == {"hits": 3, "misses": 2, "stored": 2, "hit_ratio": 0.6}
+
+    lookup, store = mock_cursor.execute.call_args_list
+    assert sorted(lookup.args[1][0]) == sorted({header, *[cache.content_hash(i, key) for i in (b"a", b"b")]})
+    hashes, documents, sizes = store.args[1]
+    assert hashes == [cache.content_hash(b"a", key), cache.content_hash(b"b", key)]
+    assert documents[0] == '[["a", 0.9, 0, 0, 10, 10, "eng"]]'
+
+
+class BatchingPool(FakePool):
+    """Like OcrPool, reads a batch of images ahead before returning its results."""
+
+    def __init__(self, batch_size):
+        super().__init__()
+        self.batch_size = batch_size
+        self.calls = 0
+
+    def recognize(self, images, languages):
+        self.calls += 1
+        iterator = iter(images)
+        while batch := list(islice(iterator, self.batch_size)):
+            yield from super().recognize(batch, languages)
+
+
+def test_recognize_streams_misses_across_chunks(mock_cursor):
+    """Test that the misses of every chunk go to one pool call that reads across chunks."""
+    mock_cursor.fetchall.return_value = []
+    pool = BatchingPool(batch_size=3)
+    result_cache = cache.OcrResultCache(chunk_size=2)
+
+    results = result_cache.recognize(pool, [b"a", b"b", b"c", b"d", b"e"], ["eng"])
+    first = next(results)
+    # The pool's first batch already needed the second chunk's lookup
+    lookups = [call for call in mock_cursor.execute.call_args_list if call.args[0] == cache._GET_QUERY]
+    assert len(lookups) == 2
+
+    assert [first, *results] == [[Word(i, 0.9, 0, 0, 10, 10, "eng")] for i in "abcde"]
+    assert pool.calls == 1
+    assert pool.seen == [b"a", b"b", b"c", b"d", b"e"]
+    stores = [call for call in mock_cursor.execute.call_args_list if call.args[0] == cache._PUT_QUERY]
+    assert [len(call.args[1][0]) for call in stores] == [2, 2, 1]
+
+
+def test_evict_runs_until_within_bound(mock_cursor):
+    """Test that eviction finds the cutoff once, repeats full batches and stops on a partial one."""
+    cutoff = datetime(2025, 11, 26, tzinfo=timezone.utc)
+    mock_cursor.fetchone.side_effect = [
+        {"cutoff": cutoff}, {"deleted": 100}, {"deleted": 100}, {"deleted": 7},
+    ]
+
+    assert cache.evict_ocr_result_cache(max_bytes=1024, batch_size=100) == 207
+    calls = mock_cursor.execute.call_args_list
+    assert "ocr_result_cache_cutoff" in calls[0].args[0] and calls[0].args[1] == (1024,)
+    assert [call.args[1] for call in calls[1:]] == [(cutoff, 100)] * 3
+
+
+def test_evict_skips_cache_within_bound(mock_cursor):
+    """Test that nothing is deleted when the cache already fits."""
+    mock_cursor.fetchone.return_value = {"cutoff": None}
+
+    assert cache.evict_ocr_result_cache(max_bytes=1024) == 0
+    assert mock_cursor.execute.call_count == 1
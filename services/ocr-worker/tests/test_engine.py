@@ -0,0 +1,54 @@
+"""Tests for the persistent OCR engine and pool."""
+
+import io
+
+import pytest
+
+tesserocr = pytest.importorskip("tesserocr")
+from PIL import Image, ImageDraw, ImageFont  # noqa: E402
+
+from cortana_ocr_worker.engine import OcrEngine  # noqa: E402
+from cortana_ocr_worker.pool import OcrPool  # noqa: E402
+
+if "eng" not in tesserocr.get_languages()[1]:
+    pytest.skip("eng.traineddata not installed (set TESSDATA_PREFIX)", allow_module_level=True)
+
+
+def render(text: str, fmt: str = "JPEG") -> bytes:
+    """Encode an image of ``text`` in black on white."""
+    image = Image.new("L", (40 + 20 * len(text), 80), 255)
+    ImageDraw.Draw(image).text((20, 20), text, fill=0, font=ImageFont.load_default(size=32))
+    buffer = io.BytesIO()
+    image.save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def test_engine_words_map_onto_segments():
+    """Test that words carry text, 0-1 confidence, boxes and language."""
+    engine = OcrEngine(["eng"])
+    try:
+        words = engine.recognize(render("Quarterly revenue 2024"))
+        blank = engine.recognize(Image.new("L", (200, 80), 255))
+    finally:
+        engine.close()
+
+    assert [w.text for w in words] == ["Quarterly", "revenue", "2024"]
+    assert all(0.5 < w.confidence <= 1 for w in words)
+    assert all(w.language == "eng" for w in words)
+    box = words[0].bounding_box
+    assert set(box) == {"x", "y", "width", "height"}
+    assert 10 <= box["x"] <= 30 and box["width"] > 50
+    assert words[0].x + words[0].width < words[1].x
+    assert blank == []
+
+
+def test_pool_preserves_order_across_batches():
+    """Test that batched recognition on several processes keeps input order."""
+    texts = [f"frame {i}" for i in range(10)]
+
+    with OcrPool(processes=2, batch_size=3) as pool:
+        results = list(pool.recognize((render(t) for t in texts), ["eng"]))
+        stats = pool.stats()
+
+    assert [" ".join(w.text for w in words) for words in results] == texts
+    assert stats["frames"] == 10 and stats["frames_per_second"] > 0
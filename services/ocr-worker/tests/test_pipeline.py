@@ -0,0 +1,148 @@
+"""Tests for the streaming OCR pipeline."""
+
+import io
+import uuid
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from cortana_common.frames import FrameManifest, FrameRecord, FrameShard
+
+from cortana_ocr_worker import pipeline
+from cortana_ocr_worker.models import Word
+
+VIDEO_ID = uuid.UUID("a1b2c3d4-e5f6-7890-abcd-ef1234567890")
+OWNER_ID = uuid.uuid4()
+
+
+def encode(value: int) -> bytes:
+    """A tiny PNG frame whose gray level identifies it."""
+    buffer = io.BytesIO()
+    Image.new("L", (8, 8), value).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class FakeS3:
+    """Serves ranged reads of in-memory shards."""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.ranges = []
+
+    def get_object_range(self, key, start, end=None):
+        self.ranges.append((key, start, end))
+        return self.objects[key][start:None if end is None else end + 1]
+
+
+class FakePool:
+    """Stands in for OcrPool: one word per encoded frame, named after its gray level."""
+
+    psm = 3
+
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+
+    def recognize(self, images, languages):
+        for image in images:
+            # Frames reach the pool still encoded; its processes decode them
+            assert isinstance(image, bytes)
+            value = Image.open(io.BytesIO(image)).getpixel((0, 0))
+            if value == self.fail_at:
+                raise RuntimeError("engine crashed")
+            yield [
+                Word(f"Frame  {value}", 0.9, 2, 3, 40, 12, "eng"),
+                Word("noise", 0.2, 0, 0, 5, 5, "eng"),
+            ]
+
+
+def build_manifest(frames_per_shard: int, shards: int):
+    """Lay out frames with gray levels 1, 2, ... over shards; the last has a region offset."""
+    objects, manifest_shards = {}, []
+    value = 0
+    for n in range(shards):
+        data, records = b"", []
+        for _ in range(frames_per_shard):
+            value += 1
+            frame = encode(value)
+            records.append(FrameRecord(
+                timestamp_ms=value * 100, offset=len(data), length=len(frame), y=value,
+            ))
+            data += frame
+        key = f"frames/{VIDEO_ID}/shard-{n:05d}.bin"
+        objects[key] = data
+        manifest_shards.append(FrameShard(key=key, size=len(data), frames=records))
+    return FrameManifest(video_id=VIDEO_ID, shards=manifest_shards), FakeS3(objects)
+
+
+@pytest.fixture
+def inserted():
+    """Patch bulk_insert to collect the streamed rows."""
+    rows = []
+
+    def fake_bulk_insert(table, columns, batch, batch_size=None):
+        assert table == "segments" and columns == pipeline.SEGMENT_COLUMNS
+        rows.extend(batch)
+
+    with patch("cortana_ocr_worker.pipeline.bulk_insert", fake_bulk_insert):
+        yield rows
+
+
+def test_normalize_text_and_hash():
+    """Test that normalization folds case, width and whitespace before hashing."""
+    assert pipeline.normalize_text("  Ｑ3\tRevenue\n") == "q3 revenue"
+    assert pipeline.text_hash("q3 revenue") == pipeline.text_hash(pipeline.normalize_text("Q3  REVENUE"))
+    assert len(pipeline.text_hash("q3 revenue")) == 64
+
+
+def test_pipeline_streams_frames_into_segments(inserted):
+    """Test that every frame becomes filtered, normalized rows, with bounded queues."""
+    manifest, s3 = build_manifest(frames_per_shard=20, shards=3)
+    ocr = pipeline.OcrPipeline(FakePool(), client=s3, fetch_threads=3, queue_size=2)
+
+    count = ocr.run(manifest, OWNER_ID, languages=["eng"])
+
+    assert count == 60 and len(inserted) == 60
+    rows = sorted(inserted, key=lambda row: row[8])
+    video_id, owner_id, team_id, text, normalized, digest, language, confidence, t_start, t_end, box = rows[0]
+    assert (video_id, owner_id, team_id) == (VIDEO_ID, OWNER_ID, None)
+    assert (text, normalized, digest) == ("Frame  1", "frame 1", pipeline.text_hash("frame 1"))
+    assert (language, confidence, t_start, t_end) == ("eng", 0.9, 100, 200)
+    assert box == {"x": 2, "y": 3 + 1, "width": 40, "height": 12}
+    # Without a duration, the last keyframe lasts one interval
+    assert rows[-1][8:10] == (6000, 6100)
+
+    stats = ocr.stats()
+    assert list(stats) == ["fetch", "recognize", "normalize", "insert"]
+    assert stats["fetch"]["items_in"] == 3 and stats["fetch"]["items_out"] == 60
+    assert stats["recognize"]["items_in"] == 60
+    assert stats["normalize"]["items_out"] == 60
+    assert stats["fetch"]["workers"] == 3
+    assert all(0 <= s["utilization"] <= 1 for s in stats.values())
+    assert ocr.bottleneck in stats
+
+
+def test_pipeline_uses_region_visibility_and_duration(inserted):
+    """Test that tracked visibility and the video's duration set t_end."""
+    manifest, s3 = build_manifest(frames_per_shard=5, shards=2)
+    manifest.duration_ms = 1250
+    manifest.shards[0].frames[0].visible_until_ms = 900
+
+    pipeline.OcrPipeline(FakePool(), client=s3).run(manifest, OWNER_ID)
+
+    ranges = sorted(row[8:10] for row in inserted)
+    assert ranges[0] == (100, 900)
+    assert ranges[1] == (200, 300)
+    assert ranges[-1] == (1000, 1250)
+
+
+def test_pipeline_stops_all_stages_on_error(inserted):
+    """Test that a failing stage aborts the others and its error is raised."""
+    manifest, s3 = build_manifest(frames_per_shard=50, shards=4)
+    ocr = pipeline.OcrPipeline(FakePool(fail_at=10), client=s3, queue_size=2)
+
+    with pytest.raises(RuntimeError, match="engine crashed"):
+        ocr.run(manifest, OWNER_ID)
+
+    # Fetching stopped long before the 200 frames were read
+    assert ocr.stats()["fetch"]["items_out"] < 200
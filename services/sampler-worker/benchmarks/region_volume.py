@@ -0,0 +1,107 @@
+"""Benchmark how many keyframe pixels reach OCR with scroll-aware regions.
+
+Generates ``--minutes`` of a 1080p grayscale recording of someone reading a
+long document at ``--fps``: the viewport scrolls by a few lines at a time
+with pauses in between, and occasionally a line is edited. Keyframes are
+picked by :class:`FrameSampler` on downscaled frames as in production, and
+:class:`RegionTracker` reduces each keyframe to its newly revealed or
+changed regions. Reports the share of keyframe pixels sent to OCR and the
+tracker's cost per keyframe.
+
+    uv run python services/sampler-worker/benchmarks/region_volume.py --minutes 5
+"""
+
+import argparse
+import time
+from collections.abc import Iterator
+
+import numpy as np
+
+from cortana_sampler_worker.hashing import hash_input_size
+from cortana_sampler_worker.regions import RegionTracker
+from cortana_sampler_worker.sampler import FrameSampler
+
+WIDTH, HEIGHT = 1920, 1080
+TITLE_H, LINE_H, GLYPH_H = 60, 24, 16
+
+
+def document(lines: int, rng: np.random.Generator) -> np.ndarray:
+    """Render a tall page of ``lines`` lines of random glyphs."""
+    page = np.full((lines * LINE_H, WIDTH), 240, dtype=np.uint8)
+    for line in range(lines):
+        length = int(rng.integers(20, 180)) * 10
+        top = line * LINE_H + 4
+        page[top:top + GLYPH_H, 40:40 + length] = rng.integers(20, 90, (GLYPH_H, length))
+    return page
+
+
+def reading_session(frames: int, seed: int = 0) -> Iterator[np.ndarray]:
+    """Yield ``(HEIGHT, WIDTH)`` frames of a scrolled document below a title bar.
+
+    Yields:
+        uint8 frames.
+    """
+    rng = np.random.default_rng(seed)
+    page = document(frames // 4 + 100, rng)
+    top, target = 0, 0
+    for _ in range(frames):
+        if top == target and rng.random() < 0.05:
+            # Scroll a few lines down (sometimes back up)
+            target = top + int(rng.integers(-2, 8)) * LINE_H
+            target = int(np.clip(target, 0, len(page) - HEIGHT))
+        top += int(np.clip(target - top, -30, 30))  # smooth scrolling
+        if rng.random() < 0.01:
+            # Edit a visible line
+            line = (top + int(rng.integers(TITLE_H, HEIGHT - LINE_H))) // LINE_H
+            page[line * LINE_H + 4:line * LINE_H + 4 + GLYPH_H, 40:400] = rng.integers(20, 90)
+        frame = page[top:top + HEIGHT].copy()
+        frame[:TITLE_H] = 60
+        yield frame
+
+
+def downscale(frames: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Area-average ``(n, H, W)`` frames to ``(n, height, width)``, cropping the remainder."""
+    n, full_h, full_w = frames.shape
+    bh, bw = full_h // height, full_w // width
+    cropped = frames[:, : bh * height, : bw * width].reshape(n, height, bh, width, bw)
+    return np.rint(cropped.mean(axis=(2, 4), dtype=np.float32)).astype(np.uint8)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=5)
+    parser.add_argument("--fps", type=float, default=10)
+    parser.add_argument("--threshold", type=float, default=0.95)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    frames = int(args.minutes * 60 * args.fps)
+    sampler = FrameSampler(args.fps, args.threshold, batch_size=args.batch_size)
+    width, height = hash_input_size(sampler.method, sampler.grid)
+    tracker = RegionTracker()
+    tracker_seconds = 0.0
+    regions = 0
+
+    session = reading_session(frames)
+    for start in range(0, frames, args.batch_size):
+        full = np.stack([next(session) for _ in range(min(args.batch_size, frames - start))])
+        for keyframe in sampler.dedupe([downscale(full, width, height)]):
+            t = time.perf_counter()
+            delta = tracker.update(full[keyframe.index - start])
+            tracker_seconds += time.perf_counter() - t
+            regions += len(delta.regions)
+
+    stats = tracker.stats()
+    print(
+        f"{frames} frames at {WIDTH}x{HEIGHT}: {stats['frames']} keyframes "
+        f"({stats['scrolled_frames']} scrolled), {regions} regions"
+    )
+    print(
+        f"  OCR pixels: {stats['pixels_out'] / 1e6:,.0f} MP of {stats['pixels_in'] / 1e6:,.0f} MP "
+        f"({stats['pixel_ratio']:.1%}, {1 / stats['pixel_ratio']:.1f}x less) | "
+        f"tracker: {tracker_seconds / stats['frames'] * 1000:.1f} ms/keyframe"
+    )
+
+
+if __name__ == "__main__":
+    main()
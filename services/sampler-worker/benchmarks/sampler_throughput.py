@@ -0,0 +1,143 @@
+"""Benchmark keyframe hashing and deduplication on a synthetic screen recording.
+
+Generates ``--minutes`` of 720p grayscale "screen recording" at ``--fps``:
+text being typed line by line with a blinking cursor, idle stretches,
+occasional scrolls and window switches. Frames are area-downscaled to the
+hash input size in NumPy (ffmpeg's ``scale`` filter does this in production)
+and fed to :class:`FrameSampler` in batches. Reports frames/sec of the
+hashing and dedupe step and the dedupe ratio for each hash method, and
+compares against a per-frame Python loop over the same frames.
+
+    uv run python services/sampler-worker/benchmarks/sampler_throughput.py --minutes 10
+"""
+
+import argparse
+import time
+from collections.abc import Iterator
+
+import numpy as np
+
+from cortana_sampler_worker.hashing import compute_hashes, hash_input_size
+from cortana_sampler_worker.sampler import FrameSampler
+
+WIDTH, HEIGHT = 1280, 720
+GLYPH_W, GLYPH_H, LINE_H = 8, 14, 20
+
+
+def synthetic_screen(frames: int, seed: int = 0) -> Iterator[np.ndarray]:
+    """Yield 720p grayscale frames of an editor-like screen.
+
+    Yields:
+        ``(HEIGHT, WIDTH)`` uint8 frames.
+    """
+    rng = np.random.default_rng(seed)
+    screen = np.full((HEIGHT, WIDTH), 235, dtype=np.uint8)
+    screen[:40] = 60  # title bar
+    row, col = 60, 20
+    for i in range(frames):
+        event = rng.random()
+        if event < 0.15:
+            # Type a glyph (roughly 1.5 characters/second at 10fps)
+            glyph = rng.integers(20, 90, (GLYPH_H, GLYPH_W), dtype=np.uint8)
+            screen[row:row + GLYPH_H, col:col + GLYPH_W] = glyph
+            col += GLYPH_W + 2
+            if col > WIDTH - 200 or rng.random() < 0.03:
+                row, col = row + LINE_H, 20
+        elif event < 0.152:
+            # Scroll by three lines
+            screen[40:-3 * LINE_H] = screen[40 + 3 * LINE_H:]
+            screen[-3 * LINE_H:] = 235
+            row = max(60, row - 3 * LINE_H)
+        elif event < 0.1525:
+            # Switch to another window
+            screen[40:] = rng.integers(200, 250, dtype=np.uint8)
+            row, col = 60, 20
+        if row > HEIGHT - LINE_H:
+            screen[40:] = 235
+            row, col = 60, 20
+
+        frame = screen.copy()
+        if (i // 5) % 2:
+            frame[row:row + GLYPH_H, col:col + 2] = 0  # blinking cursor
+        yield frame
+
+
+def downscale(frames: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Area-average ``(n, H, W)`` frames to ``(n, height, width)``, cropping the remainder."""
+    n, full_h, full_w = frames.shape
+    bh, bw = full_h // height, full_w // width
+    cropped = frames[:, : bh * height, : bw * width].reshape(n, height, bh, width, bw)
+    return np.rint(cropped.mean(axis=(2, 4), dtype=np.float32)).astype(np.uint8)
+
+
+def batches(frames: int, batch_size: int, width: int, height: int) -> tuple[list[np.ndarray], float]:
+    """Render and downscale the synthetic recording.
+
+    Returns:
+        Frame batches at hash input size and the seconds spent downscaling.
+    """
+    out = []
+    elapsed = 0.0
+    screen = synthetic_screen(frames)
+    for start in range(0, frames, batch_size):
+        full = np.stack([next(screen) for _ in range(min(batch_size, frames - start))])
+        t = time.perf_counter()
+        out.append(downscale(full, width, height))
+        elapsed += time.perf_counter() - t
+    return out, elapsed
+
+
+def per_frame_loop(frames: list[np.ndarray], method: str, grid: int, max_distance: int) -> list[int]:
+    """Reference implementation: hash and compare one frame at a time in Python."""
+    kept: list[int] = []
+    reference = None
+    index = 0
+    for batch in frames:
+        for frame in batch:
+            words = [int(w) for w in compute_hashes(frame[None], method, grid)[0]]
+            if reference is None or max(
+                bin(a ^ b).count("1") for a, b in zip(words, reference, strict=True)
+            ) > max_distance:
+                kept.append(index)
+                reference = words
+            index += 1
+    return kept
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--fps", type=float, default=10)
+    parser.add_argument("--threshold", type=float, default=0.95)
+    parser.add_argument("--grid", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    frames = int(args.minutes * 60 * args.fps)
+    for method in ("dhash", "phash"):
+        width, height = hash_input_size(method, args.grid)
+        data, downscale_seconds = batches(frames, args.batch_size, width, height)
+
+        sampler = FrameSampler(args.fps, args.threshold, method, args.grid, args.batch_size)
+        keyframes = [k.index for k in sampler.dedupe(data)]
+        stats = sampler.stats()
+
+        start = time.perf_counter()
+        reference = per_frame_loop(data, method, args.grid, sampler.max_distance)
+        loop_fps = frames / (time.perf_counter() - start)
+        assert reference == keyframes, "vectorized and per-frame results differ"
+
+        print(
+            f"{method} grid={args.grid} ({width}x{height}): {frames} frames, "
+            f"{stats['frames_kept']} keyframes, dedupe ratio {stats['dedupe_ratio']:.1%}"
+        )
+        print(
+            f"  batched: {stats['frames_per_second']:,.0f} frames/s | "
+            f"per-frame loop: {loop_fps:,.0f} frames/s | "
+            f"speedup {stats['frames_per_second'] / loop_fps:.0f}x | "
+            f"numpy downscale: {frames / downscale_seconds:,.0f} frames/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""The ``sample`` stage: keyframes of an original video into shards for OCR.
+
+The sampler only decides which frames are keyframes, from tiny hash inputs.
+:func:`extract_keyframes` then decodes the video a second time at full
+resolution, reduces each keyframe to the regions :class:`RegionTracker`
+reports as changed, and appends them as JPEG crops to packed shards with
+:class:`FrameShardWriter`. :func:`process_sample_job` wraps it for a
+:class:`JobPoller` and chains the ``ocr`` job with the manifest key.
+"""
+
+import io
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Optional
+from uuid import UUID
+
+import numpy as np
+from PIL import Image
+
+from cortana_common.frames import FrameRecord, FrameShardWriter
+from cortana_common.jobs import NextJob
+from cortana_common.models import Job, JobType
+from cortana_common.s3 import S3Client, get_object_cache, get_s3_client
+
+from cortana_sampler_worker.decode import decode_frames, probe_video
+from cortana_sampler_worker.regions import RegionTracker
+from cortana_sampler_worker.sampler import FrameSampler
+
+logger = logging.getLogger(__name__)
+
+JPEG_QUALITY = 90
+
+# Full-resolution frames per batch; a 1080p grayscale frame is 2 MB
+FULL_FRAME_BATCH = 4
+
+# Validity of the original's presigned URL when there is no object cache:
+# both ffmpeg passes read through it
+SOURCE_URL_SECONDS = 6 * 3600
+
+
+def encode_jpeg(image: np.ndarray, quality: int = JPEG_QUALITY) -> bytes:
+    """Encode a grayscale frame or crop as JPEG.
+    
+    Args:
+        image: ``(height, width)`` uint8 array.
+        quality: JPEG quality (1-95).
+    
+    Returns:
+        Encoded image bytes.
+    """
+    buffer = io.BytesIO()
+    Image.fromarray(np.ascontiguousarray(image)).save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def extract_keyframes(
+    video_id: UUID,
+    source: str,
+    sampler: Optional[FrameSampler] = None,
+    tracker: Optional[RegionTracker] = None,
+    client: Optional[S3Client] = None,
+    jpeg_quality: int = JPEG_QUALITY,
+) -> str:
+    """Sample a video and write the changed regions of its keyframes to shards.
+    
+    Both ffmpeg passes drop the video to the sampler's ``target_fps``, so the
+    n-th frame of the full-resolution pass is the sampler's frame ``n``. The
+    second pass stops after the last keyframe. Each region is stored with
+    its top-left corner, and all regions of a keyframe share its timestamp.
+    A region's ``visible_until_ms`` is the timestamp of the keyframe where
+    the tracker saw its content scroll off or change, or the video's
+    duration if it stayed on screen.
+    
+    Args:
+        video_id: Video the keyframes belong to.
+        source: Local path or URL of the original.
+        sampler: Keyframe sampler (default: :class:`FrameSampler` defaults).
+        tracker: Changed-region tracker (default: :class:`RegionTracker`
+            defaults).
+        client: S3 client for the shards (default: the cached client).
+        jpeg_quality: JPEG quality of the stored regions.
+    
+    Returns:
+        S3 key of the manifest.
+    
+    Raises:
+        RuntimeError: If ffprobe or ffmpeg fails.
+    """
+    sampler = sampler or FrameSampler()
+    tracker = tracker or RegionTracker()
+    info = probe_video(source)
+    keyframes = {keyframe.index: keyframe for keyframe in sampler.sample(source)}
+    last = max(keyframes, default=-1)
+
+    visible: dict[int, FrameRecord] = {}
+    with FrameShardWriter(video_id, client, duration_ms=info.duration_ms) as writer:
+        index = 0
+        batches = decode_frames(
+            source, info.width, info.height, sampler.target_fps, FULL_FRAME_BATCH
+        )
+        for batch in batches:
+            for frame in batch:
+                keyframe = keyframes.get(index)
+                if keyframe is not None:
+                    delta = tracker.update(frame)
+                    for region_id in delta.ended:
+                        visible.pop(region_id).visible_until_ms = keyframe.timestamp_ms
+                    for region_id, (x, y, width, height) in zip(
+                        delta.ids, delta.regions, strict=True
+                    ):
+                        data = encode_jpeg(frame[y:y + height, x:x + width], jpeg_quality)
+                        visible[region_id] = writer.add(keyframe.timestamp_ms, data, x=x, y=y)
+                index += 1
+            if index > last:
+                batches.close()
+                break
+        for record in visible.values():
+            record.visible_until_ms = info.duration_ms
+
+    logger.info(
+        f"Extracted {len(keyframes)} keyframes of {info.width}x{info.height} "
+        f"for video {video_id}; {tracker.stats()['pixel_ratio']:.1%} of their pixels "
+        f"changed and were stored"
+    )
+    return writer.manifest_key
+
+
+@contextmanager
+def _original_source(s3_key: str) -> Iterator[str]:
+    """Local copy of an original from the object cache, or a presigned URL."""
+    cache = get_object_cache()
+    if cache is None:
+        yield get_s3_client().generate_presigned_url(s3_key, expiration=SOURCE_URL_SECONDS)
+        return
+    with cache.local_path(s3_key) as path:
+        yield path
+
+
+def process_sample_job(job: Job) -> NextJob:
+    """Process a ``sample`` job and chain the video's ``ocr`` job.
+    
+    Example:
+        JobPoller(JobType.SAMPLE).run_forever(process_sample_job)
+    
+    Args:
+        job: Claimed ``sample`` job; see ``docs/jobs.md`` for the payload.
+    
+    Returns:
+        The ``ocr`` job, with the manifest key as ``manifest_path``.
+    """
+    payload = job.payload or {}
+    sampler = FrameSampler(
+        target_fps=payload.get("target_fps", 10),
+        dedupe_threshold=payload.get("dedupe_threshold", 0.95),
+    )
+    with _original_source(payload["s3_original_path"]) as source:
+        manifest_key = extract_keyframes(job.video_id, source, sampler)
+    return NextJob(JobType.OCR, {"video_id": str(job.video_id), "manifest_path": manifest_key})
@@ -0,0 +1,383 @@
+"""Scroll-offset estimation and changed regions between consecutive keyframes.
+
+Screen recordings mostly scroll: a new keyframe usually shows the previous
+one shifted vertically plus a strip of new content. :class:`RegionTracker`
+estimates the vertical scroll offset against the previous keyframe, marks
+blocks that match neither the unshifted nor the shifted previous frame as
+dirty, and returns them as rectangles in full-frame coordinates. Only those
+rectangles need to be OCRed. It also follows every region it reported
+through later keyframes, moving it with the scroll or keeping it in place,
+and reports when its content is gone, so the text OCRed from it can be
+given the time range it stayed on screen.
+"""
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+# Column bands a row is reduced to for scroll estimation
+PROFILE_BANDS = 32
+
+# Share of a region's pixels that must match in place for it to count as
+# static (a title bar) rather than scrolling with the page
+STATIC_MATCH = 0.99
+
+
+class Region(NamedTuple):
+    """A rectangle of a frame, in full-frame pixel coordinates."""
+
+    x: int
+    y: int
+    width: int
+    height: int
+
+    @property
+    def pixels(self) -> int:
+        return self.width * self.height
+
+
+class FrameDelta(NamedTuple):
+    """What changed between the previous keyframe and this one."""
+
+    scroll_y: int
+    regions: list[Region]
+    # Tracker id of each region, to match against ``ended`` of later deltas
+    ids: list[int]
+    # Ids of earlier regions whose content scrolled off or changed
+    ended: list[int]
+
+    @property
+    def pixels(self) -> int:
+        return sum(region.pixels for region in self.regions)
+
+
+def row_profiles(frame: np.ndarray, bands: int = PROFILE_BANDS) -> np.ndarray:
+    """Reduce each row of a grayscale frame to the means of ``bands`` column bands.
+    
+    Args:
+        frame: ``(height, width)`` uint8 frame.
+        bands: Column bands per row.
+    
+    Returns:
+        ``(height, bands)`` float32 profiles.
+    """
+    height, width = frame.shape
+    bands = min(bands, width)
+    band_width = width // bands
+    cropped = frame[:, : band_width * bands].reshape(height, bands, band_width)
+    return cropped.mean(axis=2, dtype=np.float32)
+
+
+def estimate_scroll(
+    previous: np.ndarray,
+    current: np.ndarray,
+    max_scroll: Optional[int] = None,
+) -> int:
+    """Estimate the vertical scroll offset between two frames.
+    
+    Finds the shift ``dy`` minimizing the mean squared difference of the row
+    profiles over the overlapping rows, with ``current[y] ~ previous[y + dy]``:
+    positive when the content moved up (scrolling down the page). All shifts
+    are scored at once: the cross term of the squared difference is a
+    cross-correlation computed with an FFT along the rows, and the energy
+    terms come from cumulative sums.
+    
+    Args:
+        previous: ``(height, width)`` uint8 previous keyframe.
+        current: ``(height, width)`` uint8 keyframe of the same size.
+        max_scroll: Largest offset considered (default: half the height, so
+            at least half of the rows overlap).
+    
+    Returns:
+        Scroll offset in pixels; 0 when no shift matches better than none.
+    """
+    a = row_profiles(current).astype(np.float64)
+    b = row_profiles(previous).astype(np.float64)
+    height = len(a)
+    max_scroll = min(max_scroll if max_scroll is not None else height // 2, height - 1)
+    if max_scroll <= 0:
+        return 0
+
+    size = 2 * height
+    # cross[dy] = sum_y a[y] * b[y + dy]; negative dy wrap around to the end
+    spectrum = np.conj(np.fft.rfft(a, size, axis=0)) * np.fft.rfft(b, size, axis=0)
+    cross = np.fft.irfft(spectrum, size, axis=0).sum(axis=1)
+
+    shifts = np.arange(-max_scroll, max_scroll + 1)
+    energy_a = np.concatenate([[0.0], np.cumsum((a * a).sum(axis=1))])
+    energy_b = np.concatenate([[0.0], np.cumsum((b * b).sum(axis=1))])
+    overlap = height - np.abs(shifts)
+    # Overlapping rows: a[max(0, -dy):height - max(0, dy)] and b[max(0, dy):height + min(0, dy)]
+    a_start, b_start = np.maximum(0, -shifts), np.maximum(0, shifts)
+    sum_a = energy_a[a_start + overlap] - energy_a[a_start]
+    sum_b = energy_b[b_start + overlap] - energy_b[b_start]
+    costs = (sum_a + sum_b - 2 * cross[shifts % size]) / overlap
+
+    best = int(np.argmin(costs))
+    # Flat content matches at any shift; only move when it is clearly better
+    if costs[max_scroll] <= costs[best] * 1.001 + 1e-6:
+        return 0
+    return int(shifts[best])
+
+
+def _block_mask(mask: np.ndarray, block_size: int) -> np.ndarray:
+    """Reduce a pixel mask to a block mask that is set where any pixel is."""
+    height, width = mask.shape
+    rows, cols = -(-height // block_size), -(-width // block_size)
+    padded = np.zeros((rows * block_size, cols * block_size), dtype=bool)
+    padded[:height, :width] = mask
+    return padded.reshape(rows, block_size, cols, block_size).any(axis=(1, 3))
+
+
+def _dilate(blocks: np.ndarray, margin: int) -> np.ndarray:
+    """Grow a block mask by ``margin`` blocks in every direction."""
+    for _ in range(margin):
+        grown = blocks.copy()
+        grown[1:] |= blocks[:-1]
+        grown[:-1] |= blocks[1:]
+        grown[:, 1:] |= blocks[:, :-1]
+        grown[:, :-1] |= blocks[:, 1:]
+        blocks = grown
+    return blocks
+
+
+def _runs(indices: np.ndarray, max_gap: int) -> list[tuple[int, int]]:
+    """Split sorted indices into ``(first, last)`` runs separated by more than ``max_gap``."""
+    breaks = np.flatnonzero(np.diff(indices) > max_gap + 1)
+    starts = np.concatenate([[0], breaks + 1])
+    ends = np.concatenate([breaks, [len(indices) - 1]])
+    return [(int(indices[s]), int(indices[e])) for s, e in zip(starts, ends, strict=True)]
+
+
+def dirty_pixels(
+    previous: np.ndarray,
+    current: np.ndarray,
+    scroll_y: int,
+    tolerance: int = 24,
+) -> np.ndarray:
+    """Mask of the pixels of ``current`` not explained by ``previous``.
+    
+    A pixel is clean if it matches ``previous`` either in place (static
+    toolbars, sidebars) or shifted by ``scroll_y`` (scrolled content).
+    
+    Args:
+        previous: ``(height, width)`` uint8 previous keyframe.
+        current: ``(height, width)`` uint8 keyframe of the same size.
+        scroll_y: Offset from :func:`estimate_scroll`.
+        tolerance: Largest per-pixel difference still treated as equal
+            (absorbs compression noise).
+    
+    Returns:
+        ``(height, width)`` bool mask, set where a pixel is dirty.
+    """
+    return ~_clean_pixels(previous, current, scroll_y, tolerance)[1]
+
+
+def _clean_pixels(
+    previous: np.ndarray, current: np.ndarray, scroll_y: int, tolerance: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Masks of the pixels matching ``previous`` in place, and in place or shifted."""
+    height = current.shape[0]
+    cur = current.astype(np.int16)
+    prev = previous.astype(np.int16)
+    in_place = np.abs(cur - prev) <= tolerance
+    clean = in_place.copy()
+    overlap = height - abs(scroll_y)
+    if scroll_y > 0:
+        clean[:overlap] |= np.abs(cur[:overlap] - prev[scroll_y:]) <= tolerance
+    elif scroll_y < 0:
+        clean[-scroll_y:] |= np.abs(cur[-scroll_y:] - prev[:overlap]) <= tolerance
+    return in_place, clean
+
+
+def dirty_regions(
+    previous: np.ndarray,
+    current: np.ndarray,
+    scroll_y: int,
+    block_size: int = 16,
+    tolerance: int = 24,
+    margin: int = 1,
+    max_gap: int = 4,
+) -> list[Region]:
+    """Rectangles of ``current`` not explained by ``previous``.
+    
+    Pixels are dirty as in :func:`dirty_pixels`. They are collected per
+    block, grown by ``margin`` blocks so a partly revealed line of text is
+    OCRed whole, and merged into horizontal bands: consecutive dirty block
+    rows form a band, split where more than ``max_gap`` clean blocks
+    separate dirty columns.
+    
+    Args:
+        previous: ``(height, width)`` uint8 previous keyframe.
+        current: ``(height, width)`` uint8 keyframe of the same size.
+        scroll_y: Offset from :func:`estimate_scroll`.
+        block_size: Block edge in pixels.
+        tolerance: Largest per-pixel difference still treated as equal
+            (absorbs compression noise).
+        margin: Blocks added around every dirty block.
+        max_gap: Clean blocks allowed inside one rectangle.
+    
+    Returns:
+        Rectangles in full-frame coordinates, top to bottom.
+    """
+    dirty = dirty_pixels(previous, current, scroll_y, tolerance)
+    return _mask_regions(dirty, block_size, margin, max_gap)
+
+
+def _mask_regions(dirty: np.ndarray, block_size: int, margin: int, max_gap: int) -> list[Region]:
+    """Merge the blocks of a dirty pixel mask into rectangles, top to bottom."""
+    height, width = dirty.shape
+    blocks = _dilate(_block_mask(dirty, block_size), margin)
+    regions = []
+    dirty_rows = np.flatnonzero(blocks.any(axis=1))
+    if not len(dirty_rows):
+        return regions
+    for top, bottom in _runs(dirty_rows, 0):
+        dirty_cols = np.flatnonzero(blocks[top:bottom + 1].any(axis=0))
+        for left, right in _runs(dirty_cols, max_gap):
+            x, y = left * block_size, top * block_size
+            regions.append(Region(
+                x,
+                y,
+                min((right + 1) * block_size, width) - x,
+                min((bottom + 1) * block_size, height) - y,
+            ))
+    return regions
+
+
+class RegionTracker:
+    """Track consecutive keyframes and report the regions that need OCR.
+    
+    Every reported region gets an id and stays visible while its content
+    is on screen: a region whose pixels still match in place stays put,
+    otherwise it moves with the scroll offset. It ends, and its id appears
+    in a later delta's ``ended``, once less than half of it is on screen,
+    once any of its pixels are dirty, or when the whole frame is reported
+    again. Regions that never end are visible until the end of the video.
+    
+    Example:
+        tracker = RegionTracker()
+        records = {}
+        for keyframe, frame in keyframes:  # full-resolution grayscale frames
+            delta = tracker.update(frame)
+            for region_id in delta.ended:
+                records.pop(region_id).visible_until_ms = keyframe.timestamp_ms
+            for region_id, (x, y, width, height) in zip(delta.ids, delta.regions):
+                data = encode_jpeg(frame[y:y + height, x:x + width])
+                records[region_id] = writer.add(keyframe.timestamp_ms, data, x=x, y=y)
+        print(tracker.stats())
+    """
+
+    def __init__(
+        self,
+        block_size: int = 16,
+        tolerance: int = 24,
+        margin: int = 1,
+        max_gap: int = 4,
+        max_scroll: Optional[int] = None,
+        full_frame_ratio: float = 0.5,
+    ):
+        """Initialize the tracker.
+        
+        Args:
+            block_size: Block edge in pixels for dirty detection.
+            tolerance: Largest per-pixel difference still treated as equal.
+            margin: Blocks added around every dirty block.
+            max_gap: Clean blocks allowed inside one rectangle.
+            max_scroll: Largest scroll offset considered (default: half the
+                frame height).
+            full_frame_ratio: When the dirty rectangles cover more than this
+                share of the frame (e.g. a window switch), emit the whole
+                frame as one region instead.
+        """
+        self.block_size = block_size
+        self.tolerance = tolerance
+        self.margin = margin
+        self.max_gap = max_gap
+        self.max_scroll = max_scroll
+        self.full_frame_ratio = full_frame_ratio
+        self._previous: Optional[np.ndarray] = None
+        self._visible: dict[int, Region] = {}
+        self._next_id = 0
+        self.frames = 0
+        self.scrolled_frames = 0
+        self.pixels_in = 0
+        self.pixels_out = 0
+
+    def update(self, frame: np.ndarray) -> FrameDelta:
+        """Compare a keyframe with the previous one and remember it.
+        
+        Args:
+            frame: ``(height, width)`` uint8 full-resolution grayscale keyframe.
+        
+        Returns:
+            Scroll offset, changed regions with their ids, and the ids of
+            earlier regions that ended; the whole frame for the first
+            keyframe or after a resolution change.
+        """
+        height, width = frame.shape
+        full = [Region(0, 0, width, height)]
+        previous, self._previous = self._previous, frame
+        scroll_y, regions = 0, full
+        if previous is not None and previous.shape == frame.shape:
+            scroll_y = estimate_scroll(previous, frame, self.max_scroll)
+            in_place, clean = _clean_pixels(previous, frame, scroll_y, self.tolerance)
+            regions = _mask_regions(~clean, self.block_size, self.margin, self.max_gap)
+            if sum(region.pixels for region in regions) > self.full_frame_ratio * width * height:
+                regions = full
+
+        if regions is full:
+            ended = list(self._visible)
+            self._visible.clear()
+        else:
+            ended = self._follow(scroll_y, in_place, clean)
+        ids = list(range(self._next_id, self._next_id + len(regions)))
+        self._next_id += len(regions)
+        self._visible.update(zip(ids, regions, strict=True))
+        delta = FrameDelta(scroll_y, regions, ids, ended)
+
+        self.frames += 1
+        self.scrolled_frames += delta.scroll_y != 0
+        self.pixels_in += width * height
+        self.pixels_out += delta.pixels
+        return delta
+
+    def reset(self) -> None:
+        """Forget the previous keyframe, e.g. at the start of a new video."""
+        self._previous = None
+        self._visible.clear()
+
+    def _follow(self, scroll_y: int, in_place: np.ndarray, clean: np.ndarray) -> list[int]:
+        """Move visible regions with their content; return the ids of those that ended."""
+        height = clean.shape[0]
+        ended = []
+        for region_id, region in list(self._visible.items()):
+            top, bottom = max(region.y, 0), min(region.y + region.height, height)
+            columns = slice(region.x, region.x + region.width)
+            if scroll_y:
+                matches = in_place[top:bottom, columns]
+                if np.count_nonzero(matches) < STATIC_MATCH * matches.size:
+                    region = region._replace(y=region.y - scroll_y)
+                    top, bottom = max(region.y, 0), min(region.y + region.height, height)
+            if 2 * (bottom - top) < region.height or not clean[top:bottom, columns].all():
+                del self._visible[region_id]
+                ended.append(region_id)
+            else:
+                self._visible[region_id] = region
+        return ended
+
+    def stats(self) -> dict[str, float]:
+        """Get tracker counters.
+        
+        Returns:
+            Dictionary with ``frames``, ``scrolled_frames``, ``pixels_in``,
+            ``pixels_out`` and ``pixel_ratio`` (share of keyframe pixels
+            sent to OCR).
+        """
+        return {
+            "frames": self.frames,
+            "scrolled_frames": self.scrolled_frames,
+            "pixels_in": self.pixels_in,
+            "pixels_out": self.pixels_out,
+            "pixel_ratio": self.pixels_out / self.pixels_in if self.pixels_in else 0.0,
+        }
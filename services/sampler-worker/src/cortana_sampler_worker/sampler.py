@@ -0,0 +1,151 @@
+"""Streaming keyframe sampler: downsample, hash and drop near-duplicates."""
+
+import logging
+import time
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from cortana_sampler_worker.decode import decode_frames
+from cortana_sampler_worker.hashing import (
+    compute_hashes,
+    hash_input_size,
+    max_tile_distance,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Keyframe(NamedTuple):
+    """A sampled frame that differs enough from the previous keyframe."""
+
+    index: int
+    timestamp_ms: int
+    hash: np.ndarray
+
+
+class FrameSampler:
+    """Deduplicate a stream of frames by perceptual hash.
+    
+    A frame is kept when it differs from the last kept frame by more than
+    the allowed number of bits in at least one tile, i.e. when its
+    similarity ``1 - max_tile_distance / 64`` is below ``dedupe_threshold``.
+    Hashes are computed per batch, and each batch is compared against the
+    current keyframe in one vectorized step; Python only loops once per
+    kept frame, which is rare in screen recordings.
+    
+    Example:
+        sampler = FrameSampler(target_fps=10, dedupe_threshold=0.95)
+        for keyframe in sampler.sample(presigned_url):
+            print(keyframe.timestamp_ms)
+        print(sampler.stats())
+    """
+
+    def __init__(
+        self,
+        target_fps: float = 10,
+        dedupe_threshold: float = 0.95,
+        method: str = "dhash",
+        grid: int = 4,
+        batch_size: int = 256,
+    ):
+        """Initialize the sampler.
+        
+        Args:
+            target_fps: Frame rate to sample the video at.
+            dedupe_threshold: Similarity (0-1) at or above which a frame is
+                a duplicate of the previous keyframe.
+            method: ``"dhash"`` (fast) or ``"phash"`` (more robust to
+                brightness and compression changes).
+            grid: Tiles per row and column; each tile gets a 64-bit hash.
+            batch_size: Frames decoded and hashed per batch.
+        """
+        self.target_fps = target_fps
+        self.method = method
+        self.grid = grid
+        self.batch_size = batch_size
+        self.frame_size = hash_input_size(method, grid)
+        # Bits a tile may differ by and still count as the same
+        self.max_distance = int(np.floor((1 - dedupe_threshold) * 64))
+        self.frames_in = 0
+        self.frames_kept = 0
+        self.seconds = 0.0
+
+    def sample(self, source: str) -> Iterator[Keyframe]:
+        """Decode a video with ffmpeg and yield its keyframes.
+        
+        Args:
+            source: Local path or URL of the video.
+        
+        Yields:
+            Keyframes in timestamp order.
+        """
+        width, height = self.frame_size
+        batches = decode_frames(source, width, height, self.target_fps, self.batch_size)
+        yield from self.dedupe(batches)
+
+    def dedupe(self, batches: Iterable[np.ndarray]) -> Iterator[Keyframe]:
+        """Yield the keyframes of a stream of frame batches.
+        
+        Args:
+            batches: ``(n, height, width)`` uint8 arrays at :attr:`frame_size`,
+                sampled at :attr:`target_fps`.
+        
+        Yields:
+            Keyframes in timestamp order.
+        """
+        reference: Optional[np.ndarray] = None
+        for batch in batches:
+            start = time.perf_counter()
+            hashes = compute_hashes(batch, self.method, self.grid)
+            offsets = list(self._keep(hashes, reference))
+            self.seconds += time.perf_counter() - start
+
+            for offset in offsets:
+                index = self.frames_in + offset
+                yield Keyframe(index, round(index * 1000 / self.target_fps), hashes[offset])
+            if offsets:
+                reference = hashes[offsets[-1]]
+            self.frames_in += len(batch)
+            self.frames_kept += len(offsets)
+        logger.info(
+            f"Sampled {self.frames_in} frames, kept {self.frames_kept} "
+            f"({self.dedupe_ratio:.1%} dropped)"
+        )
+
+    def _keep(self, hashes: np.ndarray, reference: Optional[np.ndarray]) -> Iterator[int]:
+        """Offsets of the frames in a batch that become keyframes."""
+        position = 0
+        if reference is None:
+            reference = hashes[0]
+            position = 1
+            yield 0
+        while position < len(hashes):
+            changed = np.flatnonzero(max_tile_distance(hashes[position:], reference) > self.max_distance)
+            if not len(changed):
+                return
+            position += int(changed[0])
+            reference = hashes[position]
+            yield position
+            position += 1
+
+    @property
+    def dedupe_ratio(self) -> float:
+        """Share of sampled frames dropped as duplicates."""
+        return 1 - self.frames_kept / self.frames_in if self.frames_in else 0.0
+
+    def stats(self) -> dict[str, float]:
+        """Get sampler counters.
+        
+        Returns:
+            Dictionary with ``frames_in``, ``frames_kept``, ``dedupe_ratio``
+            and ``frames_per_second`` (hashing and dedupe throughput, excluding
+            decoding).
+        """
+        return {
+            "frames_in": self.frames_in,
+            "frames_kept": self.frames_kept,
+            "dedupe_ratio": self.dedupe_ratio,
+            "frames_per_second": self.frames_in / self.seconds if self.seconds else 0.0,
+        }
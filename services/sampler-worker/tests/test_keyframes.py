@@ -0,0 +1,159 @@
+"""Tests for the sample stage: keyframes into shards."""
+
+import io
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+pytest.importorskip("PIL")
+from PIL import Image  # noqa: E402
+
+from cortana_common.frames import load_frame_manifest, read_frames  # noqa: E402
+from cortana_common.models import Job, JobStatus, JobType  # noqa: E402
+
+from cortana_sampler_worker import keyframes  # noqa: E402
+from cortana_sampler_worker.decode import VideoInfo  # noqa: E402
+from cortana_sampler_worker.sampler import FrameSampler  # noqa: E402
+
+VIDEO_ID = uuid.UUID("a1b2c3d4-e5f6-7890-abcd-ef1234567890")
+HEIGHT, WIDTH = 96, 160
+
+
+class FakeS3:
+    """Keeps uploaded objects in memory and serves ranged reads."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_many(self, items, content_type=None):
+        self.objects.update(items)
+        return [SimpleNamespace(ok=True) for _ in items]
+
+    def get_object_range(self, key, start, end=None):
+        return self.objects[key][start:None if end is None else end + 1]
+
+
+class FakeVideo:
+    """Decodes to the given full-resolution frames."""
+
+    def __init__(self, frames: np.ndarray):
+        self.frames = frames
+        self.full_frames_read = 0
+
+    def decode(self, source, width, height, fps, batch_size=256):
+        """Stands in for decode_frames: nearest-neighbour scaling of the frames."""
+        rows = np.linspace(0, HEIGHT - 1, height).astype(int)
+        cols = np.linspace(0, WIDTH - 1, width).astype(int)
+        for start in range(0, len(self.frames), batch_size):
+            batch = self.frames[start:start + batch_size][:, rows][:, :, cols]
+            if (width, height) == (WIDTH, HEIGHT):
+                self.full_frames_read += len(batch)
+            yield batch
+
+
+def screens() -> np.ndarray:
+    """Four seconds at 10fps of three screens, changing at frames 10 and 20."""
+    rng = np.random.default_rng(0)
+    screens = rng.integers(0, 256, (3, HEIGHT, WIDTH), dtype=np.uint8)
+    return screens[[0] * 10 + [1] * 10 + [2] * 20]
+
+
+def scrolling_page() -> np.ndarray:
+    """Four seconds at 10fps of a document scrolled down by 24px every second."""
+    rng = np.random.default_rng(1)
+    page = np.full((HEIGHT + 100, WIDTH), 235, dtype=np.uint8)
+    for row in range(4, len(page) - 12, 12):
+        length = int(rng.integers(4, 14)) * 10
+        page[row:row + 8, 6:6 + length] = rng.integers(20, 90, (8, length))
+    return np.stack([page[24 * (i // 10):24 * (i // 10) + HEIGHT] for i in range(40)])
+
+
+@pytest.fixture
+def video(request):
+    video = FakeVideo(getattr(request, "param", screens)())
+    with (
+        patch("cortana_sampler_worker.sampler.decode_frames", video.decode),
+        patch("cortana_sampler_worker.keyframes.decode_frames", video.decode),
+        patch(
+            "cortana_sampler_worker.keyframes.probe_video",
+            return_value=VideoInfo(WIDTH, HEIGHT, len(video.frames) * 100),
+        ),
+    ):
+        yield video
+
+
+def test_extract_keyframes_writes_full_resolution_jpegs(video):
+    """Test that each keyframe is stored once, as a full-resolution JPEG."""
+    s3 = FakeS3()
+
+    manifest_key = keyframes.extract_keyframes(
+        VIDEO_ID, "master.mp4", FrameSampler(target_fps=10), client=s3
+    )
+
+    manifest = load_frame_manifest(manifest_key, s3)
+    frames = list(read_frames(manifest, s3))
+    assert [record.timestamp_ms for record, _ in frames] == [0, 1000, 2000]
+    # Each screen is replaced by the next; the last stays until the end
+    assert [record.visible_until_ms for record, _ in frames] == [1000, 2000, 4000]
+    assert manifest.duration_ms == 4000
+    for (_, data), index in zip(frames, [0, 10, 20], strict=True):
+        image = np.asarray(Image.open(io.BytesIO(data)))
+        assert image.shape == (HEIGHT, WIDTH)
+        assert np.abs(image.astype(int) - video.frames[index]).mean() < 8
+    # The full-resolution pass stops after the last keyframe
+    assert video.full_frames_read < len(video.frames)
+
+
+@pytest.mark.parametrize("video", [scrolling_page], indirect=True)
+def test_extract_keyframes_stores_changed_regions(video):
+    """Test that after the first keyframe only the revealed strips are stored."""
+    s3 = FakeS3()
+
+    manifest_key = keyframes.extract_keyframes(
+        VIDEO_ID, "master.mp4", FrameSampler(target_fps=10), client=s3
+    )
+
+    frames = list(read_frames(load_frame_manifest(manifest_key, s3), s3))
+    assert sorted({record.timestamp_ms for record, _ in frames}) == [0, 1000, 2000, 3000]
+    (first, data), *regions = frames
+    assert (first.x, first.y) == (0, 0)
+    # Most of the first screen is still visible after two scrolls of 24px
+    assert first.visible_until_ms == 3000
+    assert np.asarray(Image.open(io.BytesIO(data))).shape == (HEIGHT, WIDTH)
+    for record, data in regions:
+        height, width = np.asarray(Image.open(io.BytesIO(data))).shape
+        # A strip at the bottom, from the revealed rows and a block of margin
+        assert record.y >= HEIGHT - 24 - 2 * 16 and record.y + height == HEIGHT
+        assert record.x + width <= WIDTH
+
+
+def test_process_sample_job_chains_ocr(video):
+    """Test that a sample job returns the ocr job with the manifest key."""
+    job = Job(
+        id=uuid.uuid4(),
+        video_id=VIDEO_ID,
+        job_type=JobType.SAMPLE,
+        status=JobStatus.PROCESSING,
+        payload={"s3_original_path": f"videos/original/{VIDEO_ID}/master.mp4", "target_fps": 10},
+        created_at="2025-11-28T09:00:00Z",
+        updated_at="2025-11-28T09:00:00Z",
+    )
+    s3 = FakeS3()
+    s3.generate_presigned_url = lambda key, expiration: f"https://s3.test/{key}"
+
+    with (
+        patch("cortana_sampler_worker.keyframes.get_object_cache", return_value=None),
+        patch("cortana_sampler_worker.keyframes.get_s3_client", return_value=s3),
+        patch("cortana_common.frames.get_s3_client", return_value=s3),
+    ):
+        next_job = keyframes.process_sample_job(job)
+
+    assert next_job.job_type == JobType.OCR
+    assert next_job.payload == {
+        "video_id": str(VIDEO_ID),
+        "manifest_path": f"frames/{VIDEO_ID}/manifest.json",
+    }
+    assert f"frames/{VIDEO_ID}/manifest.json" in s3.objects
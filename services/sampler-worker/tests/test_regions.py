@@ -0,0 +1,114 @@
+"""Tests for scroll-offset estimation and changed regions."""
+
+import numpy as np
+import pytest
+
+from cortana_sampler_worker.regions import (
+    Region,
+    RegionTracker,
+    dirty_regions,
+    estimate_scroll,
+)
+
+HEIGHT, WIDTH = 360, 640
+
+
+@pytest.fixture(scope="module")
+def page() -> np.ndarray:
+    """A tall document with lines of random glyphs."""
+    rng = np.random.default_rng(0)
+    page = np.full((1500, WIDTH), 235, dtype=np.uint8)
+    for row in range(20, len(page) - 20, 20):
+        length = int(rng.integers(10, 60)) * 10
+        page[row:row + 14, 10:10 + length] = rng.integers(20, 90, (14, length))
+    return page
+
+
+def viewport(page: np.ndarray, top: int) -> np.ndarray:
+    """The window showing the page from ``top``, below a static 30px title bar."""
+    frame = page[top:top + HEIGHT].copy()
+    frame[:30] = 60
+    return frame
+
+
+@pytest.mark.parametrize("scroll", [0, 1, 37, 120, -45])
+def test_estimate_scroll(page, scroll):
+    """Test that the scroll offset is recovered despite the static title bar."""
+    assert estimate_scroll(viewport(page, 400), viewport(page, 400 + scroll)) == scroll
+
+
+def test_estimate_scroll_flat_frames():
+    """Test that frames without structure report no scroll."""
+    frame = np.full((HEIGHT, WIDTH), 200, dtype=np.uint8)
+
+    assert estimate_scroll(frame, frame) == 0
+
+
+def test_dirty_regions_cover_only_revealed_strip(page):
+    """Test that scrolling down marks only the newly revealed rows."""
+    previous, current = viewport(page, 400), viewport(page, 450)
+
+    regions = dirty_regions(previous, current, 50)
+
+    assert regions and all(r.y + r.height == HEIGHT for r in regions)
+    assert min(r.y for r in regions) >= HEIGHT - 50 - 2 * 16
+    assert not dirty_regions(previous, previous, 0)
+
+
+def test_dirty_regions_local_change(page):
+    """Test that an edit in place yields a small rectangle around it."""
+    previous = viewport(page, 0)
+    current = previous.copy()
+    current[200:214, 300:340] = 0
+
+    assert dirty_regions(previous, current, 0, block_size=16, margin=1) == [
+        Region(272, 176, 96, 64)
+    ]
+
+
+def test_tracker_pixel_volume(page):
+    """Test that a scroll session sends a fraction of the pixels to OCR."""
+    tracker = RegionTracker()
+    deltas = [tracker.update(viewport(page, top)) for top in range(0, 1000, 40)]
+
+    assert deltas[0].regions == [Region(0, 0, WIDTH, HEIGHT)]
+    assert all(d.scroll_y == 40 for d in deltas[1:])
+    assert tracker.stats()["scrolled_frames"] == len(deltas) - 1
+    assert tracker.stats()["pixel_ratio"] < 0.3
+
+    # A completely different screen falls back to the whole frame
+    assert tracker.update(255 - viewport(page, 0)).regions == [Region(0, 0, WIDTH, HEIGHT)]
+
+
+def test_tracker_follows_scrolled_regions_until_they_leave(page):
+    """Test that regions move with the scroll and end once half of them is gone."""
+    tracker = RegionTracker()
+    deltas = [tracker.update(viewport(page, top)) for top in range(0, 1000, 40)]
+
+    ended_at = {region_id: i for i, d in enumerate(deltas) for region_id in d.ended}
+    # The first frame scrolls by 40px per keyframe: 5 * 40 > 360 / 2
+    assert deltas[0].ids == [0] and ended_at[0] == 5
+    for i, delta in enumerate(deltas[1:], start=1):
+        for region_id, region in zip(delta.ids, delta.regions, strict=True):
+            # A revealed strip ends when the scroll has carried half of it past the top
+            expected = i + (region.y + region.height // 2) // 40 + 1
+            assert ended_at.get(region_id) == (expected if expected < len(deltas) else None)
+
+
+def test_tracker_ends_regions_whose_content_changes(page):
+    """Test that an edit ends the regions it touches and no others."""
+    tracker = RegionTracker()
+    frame = viewport(page, 0)
+    tracker.update(frame)
+    edited = frame.copy()
+    edited[200:214, 300:340] = 0
+    first_edit = tracker.update(edited)
+    assert first_edit.ended == [0]
+
+    elsewhere = edited.copy()
+    elsewhere[60:74, 40:80] = 0
+    assert tracker.update(elsewhere).ended == []
+
+    again = elsewhere.copy()
+    again[205:210, 310:320] = 255
+    assert first_edit.ids[0] in tracker.update(again).ended
@@ -0,0 +1,163 @@
+"""Tests for the keyframe sampling engine."""
+
+import io
+import subprocess
+import sys
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from cortana_sampler_worker import hashing
+from cortana_sampler_worker.decode import (
+    VideoInfo,
+    decode_frames,
+    ffmpeg_command,
+    probe_video,
+    read_frame_batches,
+)
+from cortana_sampler_worker.hashing import (
+    compute_hashes,
+    dhash,
+    hash_input_size,
+    max_tile_distance,
+    phash,
+    popcount,
+)
+from cortana_sampler_worker.sampler import FrameSampler
+
+
+def screen(seed: int, n: int, method: str = "dhash", grid: int = 4) -> np.ndarray:
+    """``n`` copies of a random screen-like frame at hash input size."""
+    width, height = hash_input_size(method, grid)
+    frame = np.random.default_rng(seed).integers(0, 256, (height, width), dtype=np.uint8)
+    return np.repeat(frame[None], n, axis=0)
+
+
+def test_dhash_bits():
+    """Test that dHash bits follow left-to-right brightness increases."""
+    ramp = np.tile(np.arange(9, dtype=np.uint8) * 10, (8, 1))[None]
+
+    assert dhash(ramp, grid=1)[0, 0] == np.uint64(2**64 - 1)
+    assert dhash(ramp[:, :, ::-1], grid=1)[0, 0] == 0
+
+
+def test_hashes_are_per_tile():
+    """Test that a change in one tile only flips bits of that tile."""
+    for method in hashing.HASH_METHODS:
+        frames = screen(1, 2, method)
+        width, height = hash_input_size(method, 4)
+        frames[1, : height // 4, : width // 4] = 255 - frames[1, : height // 4, : width // 4]
+
+        hashes = compute_hashes(frames, method, grid=4)
+
+        assert hashes.shape == (2, 16) and hashes.dtype == np.uint64
+        distances = popcount(hashes[0] ^ hashes[1])
+        assert distances[0] > 0
+        assert not distances[1:].any()
+
+
+def test_phash_ignores_brightness_shift():
+    """Test that pHash is stable under a uniform brightness change."""
+    frames = screen(2, 2, "phash").astype(np.int16)
+    frames[1] = np.clip(frames[1] + 20, 0, 255)
+    frames = frames.astype(np.uint8)
+
+    hashes = phash(frames, grid=4)
+
+    assert max_tile_distance(hashes[1:], hashes[0])[0] <= 4
+
+
+def test_popcount():
+    """Test popcount, including the lookup-table fallback for numpy < 2."""
+    words = np.random.default_rng(3).integers(0, 2**63, 1000, dtype=np.uint64) * np.uint64(2)
+    expected = np.array([bin(int(w)).count("1") for w in words])
+
+    assert (popcount(words) == expected).all()
+    assert (hashing._popcount_table(words) == expected).all()
+
+
+def test_dedupe_keeps_changes_only():
+    """Test that near-duplicates are dropped and changes start a keyframe."""
+    a = screen(10, 300)
+    b = screen(11, 250)
+    c = screen(12, 50)
+    # A blinking cursor: one pixel in one tile toggles every other frame
+    a[1::2, 0, 0] ^= 0x80
+    frames = np.concatenate([a, b, c, a[:10]])
+    sampler = FrameSampler(target_fps=10, dedupe_threshold=0.95, batch_size=128)
+
+    keyframes = list(sampler.dedupe(frames[i:i + 128] for i in range(0, len(frames), 128)))
+
+    assert [k.index for k in keyframes] == [0, 300, 550, 600]
+    assert [k.timestamp_ms for k in keyframes] == [0, 30000, 55000, 60000]
+    assert sampler.stats()["frames_in"] == 610
+    assert sampler.stats()["dedupe_ratio"] == pytest.approx(1 - 4 / 610)
+
+
+def test_dedupe_threshold():
+    """Test that the threshold sets how many bits a tile may differ by."""
+    frames = screen(20, 2)
+    hashes = compute_hashes(frames, "dhash", grid=4)
+    # Flip pixels in one tile until 4 of its 64 hash bits differ (similarity 0.9375)
+    for col in range(8):
+        frames[1, 0, col] = 0 if frames[1, 0, col + 1] > frames[1, 0, col] else 255
+        hashes = compute_hashes(frames, "dhash", grid=4)
+        if max_tile_distance(hashes[1:], hashes[0])[0] >= 4:
+            break
+    distance = int(max_tile_distance(hashes[1:], hashes[0])[0])
+    similarity = 1 - distance / 64
+
+    strict = FrameSampler(dedupe_threshold=similarity + 0.001)
+    loose = FrameSampler(dedupe_threshold=similarity)
+
+    assert len(list(strict.dedupe([frames]))) == 2
+    assert len(list(loose.dedupe([frames]))) == 1
+
+
+def test_read_frame_batches():
+    """Test batching of a raw frame stream, including a partial last frame."""
+    frames = np.arange(5 * 6 * 4, dtype=np.uint8).reshape(5, 6, 4)
+    stream = io.BufferedReader(io.BytesIO(frames.tobytes() + b"\x00" * 7))
+
+    batches = list(read_frame_batches(stream, width=4, height=6, batch_size=2))
+
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert (np.concatenate(batches) == frames).all()
+
+
+def test_ffmpeg_command():
+    """Test that ffmpeg scales and drops frames before the pipe."""
+    command = ffmpeg_command("https://s3.test/master.mp4?X-Amz-Signature=x", 36, 32, 10)
+
+    assert command[command.index("-i") + 1].startswith("https://")
+    assert "fps=10,scale=36:32:flags=area,format=gray" in command
+    assert command[-3:] == ["-f", "rawvideo", "pipe:1"]
+
+
+def test_decode_frames_survives_chatty_stderr():
+    """Test that a process flooding stderr neither blocks nor floods the error."""
+    # 1 MB of warnings, far beyond a pipe buffer, then two 4x6 frames and a failure
+    script = (
+        "import sys; sys.stderr.write('warning\\n' * 131072); sys.stderr.write('fatal');"
+        "sys.stdout.buffer.write(bytes(48)); sys.exit(1)"
+    )
+    with patch(
+        "cortana_sampler_worker.decode.ffmpeg_command", return_value=[sys.executable, "-c", script]
+    ):
+        frames = decode_frames("master.mp4", width=4, height=6, fps=1)
+        assert next(frames).shape == (2, 6, 4)
+        with pytest.raises(RuntimeError, match="fatal$") as error:
+            next(frames)
+
+    assert len(str(error.value)) < 5000
+
+
+def test_probe_video():
+    """Test that ffprobe's JSON becomes the frame size and duration in milliseconds."""
+    output = '{"streams": [{"width": 1920, "height": 1080}], "format": {"duration": "61.4406"}}'
+    with patch(
+        "cortana_sampler_worker.decode.subprocess.run",
+        return_value=subprocess.CompletedProcess([], 0, output, ""),
+    ):
+        assert probe_video("master.mp4") == VideoInfo(1920, 1080, 61441)
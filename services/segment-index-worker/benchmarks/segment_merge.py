@@ -0,0 +1,116 @@
+"""Benchmark merging a video's segments: row at a time vs one set-based statement.
+
+Generates synthetic videos of ``--sizes`` segments inside the database: 20
+words per keyframe, one keyframe per second, and each word slot changes
+its text every few keyframes, so about four of five segments merge into an
+earlier one. Then merges them two ways:
+
+- row at a time: fetch the video's segments ordered by ``text_hash`` and
+  ``t_start``, and update or delete each merged segment with its own
+  statement (only for sizes up to ``--row-max``);
+- :func:`merge_video_segments`, one ``merge_video_segments()`` call.
+
+Reports wall time and segments/sec. Run against a scratch database only:
+
+    DATABASE_URL=postgresql://... \\
+        uv run python services/segment-index-worker/benchmarks/segment_merge.py
+"""
+
+import argparse
+import time
+import uuid
+
+from cortana_common.db import get_db_connection
+
+from cortana_segment_index_worker.merge import merge_video_segments
+
+WORDS_PER_FRAME = 20
+
+# Slot s shows text (s * 7919 + (frame + s) / 5): a new word every 5 frames,
+# with slots changing on different frames
+GENERATE_QUERY = """
+INSERT INTO segments (
+    video_id, owner_id, text, normalized_text, text_hash,
+    confidence, t_start, t_end, bounding_box
+)
+SELECT
+    %(video_id)s, %(owner_id)s, 'word ' || w, 'word ' || w, md5('word ' || w),
+    0.6 + (frame * 7 + slot) %% 40 / 100.0, frame * 1000, frame * 1000 + 1000,
+    jsonb_build_object('x', 16, 'y', 40 * slot, 'width', 120, 'height', 18)
+FROM generate_series(0, %(frames)s - 1) AS frame,
+     generate_series(0, %(words)s - 1) AS slot,
+     LATERAL (SELECT (slot * 7919 + (frame + slot) / 5) %% 50000 AS w) AS word
+"""
+
+
+def create_video(owner_id: uuid.UUID, segments: int) -> uuid.UUID:
+    with get_db_connection() as conn:
+        video_id = conn.execute(
+            "INSERT INTO videos (owner_id, s3_original_path) "
+            "VALUES (%s, 'benchmark/merge') RETURNING id",
+            (owner_id,),
+        ).fetchone()["id"]
+        conn.execute(GENERATE_QUERY, {
+            "video_id": video_id,
+            "owner_id": owner_id,
+            "frames": segments // WORDS_PER_FRAME,
+            "words": WORDS_PER_FRAME,
+        })
+        conn.execute("ANALYZE segments")
+    return video_id
+
+
+def row_at_a_time(video_id: uuid.UUID) -> int:
+    """Merge in Python, with one statement per changed segment."""
+    with get_db_connection() as conn:
+        rows = conn.execute(
+            "SELECT id, text_hash, t_start, t_end, confidence FROM segments "
+            "WHERE video_id = %s ORDER BY text_hash, t_start, id",
+            (video_id,),
+        ).fetchall()
+        deleted = 0
+        keep = None
+        for row in rows + [None]:
+            if keep and row and row["text_hash"] == keep["text_hash"] and row["t_start"] <= keep["t_end"]:
+                keep["t_end"] = max(keep["t_end"], row["t_end"])
+                keep["confidence"] = max(keep["confidence"], row["confidence"])
+                keep["merged"] = True
+                conn.execute("DELETE FROM segments WHERE id = %s", (row["id"],))
+                deleted += 1
+                continue
+            if keep and keep.get("merged"):
+                conn.execute(
+                    "UPDATE segments SET t_end = %s, confidence = %s WHERE id = %s",
+                    (keep["t_end"], keep["confidence"], keep["id"]),
+                )
+            keep = row
+    return deleted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--row-max", type=int, default=100_000)
+    args = parser.parse_args()
+
+    owner_id = uuid.uuid4()
+    for size in map(int, args.sizes.split(",")):
+        runs = [("set-based", merge_video_segments)]
+        if size <= args.row_max:
+            runs.insert(0, ("row at a time", row_at_a_time))
+        print(f"{size} segments")
+        for name, merge in runs:
+            video_id = create_video(owner_id, size)
+            start = time.perf_counter()
+            deleted = merge(video_id)
+            elapsed = time.perf_counter() - start
+            print(
+                f"  {name:<14} {elapsed:7.2f}s | {size / elapsed:10,.0f} segments/s | "
+                f"{size - deleted} left"
+            )
+            with get_db_connection() as conn:
+                conn.execute("DELETE FROM videos WHERE id = %s", (video_id,))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Merge repeated text detections of a video into continuous time ranges.
+
+The ocr-worker inserts a segment per word per keyframe, so text that stays
+on screen becomes many segments with the same ``text_hash`` whose time
+ranges touch. The merge runs inside Postgres as one set-based statement
+(``merge_video_segments``, gaps and islands over ``t_start`` per
+``text_hash``): no segment is sent to the worker, so client memory does not
+depend on the size of the video.
+"""
+
+import logging
+import time
+from uuid import UUID
+
+from cortana_common.db import execute_query
+
+logger = logging.getLogger(__name__)
+
+
+def merge_video_segments(video_id: UUID, max_gap_ms: int = 0) -> int:
+    """Merge consecutive segments of a video that have the same text.
+    
+    Segments with the same ``text_hash`` form one range while each starts at
+    most ``max_gap_ms`` after the end of the ones before it. Each range is
+    kept as its first segment, with ``t_end`` extended to the end of the
+    range and the highest confidence of the range; the other segments are
+    deleted.
+    
+    Args:
+        video_id: Video whose segments to merge.
+        max_gap_ms: Largest gap between two detections of the same text that
+            still counts as continuous (default: ranges must touch or overlap).
+    
+    Returns:
+        Number of segments deleted by merging.
+    """
+    start = time.perf_counter()
+    row = execute_query(
+        "SELECT merge_video_segments(%s, %s) AS deleted",
+        (video_id, max_gap_ms),
+        fetch_one=True,
+    )
+    logger.info(
+        f"Merged segments of video {video_id}: {row['deleted']} removed "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    return row["deleted"]
@@ -0,0 +1,22 @@
+"""Tests for merging repeated text detections."""
+
+import uuid
+from unittest.mock import patch
+
+from cortana_segment_index_worker.merge import merge_video_segments
+
+
+def test_merge_runs_in_one_database_call():
+    """Test that the merge is a single call of the SQL function, not a row loop."""
+    video_id = uuid.uuid4()
+
+    with patch(
+        "cortana_segment_index_worker.merge.execute_query", return_value={"deleted": 42}
+    ) as execute:
+        assert merge_video_segments(video_id, max_gap_ms=500) == 42
+
+    execute.assert_called_once()
+    query, params = execute.call_args.args
+    assert "merge_video_segments(%s, %s)" in query
+    assert params == (video_id, 500)
+    assert execute.call_args.kwargs == {"fetch_one": True}
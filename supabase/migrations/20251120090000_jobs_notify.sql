@@ -0,0 +1,27 @@
+-- Wake idle workers through LISTEN/NOTIFY instead of interval polling.
+-- Each job type gets its own channel (jobs_transcode, jobs_sample, ...) and
+-- the payload is the job id. Notifications are delivered on commit.
+
+create or replace function notify_job_queued()
+returns trigger
+language plpgsql
+as $$
+begin
+  perform pg_notify('jobs_' || new.job_type::text, new.id::text);
+  return null;
+end;
+$$;
+
+create trigger notify_jobs_queued_insert
+  after insert on jobs
+  for each row
+  when (new.status = 'queued')
+  execute function notify_job_queued();
+
+create trigger notify_jobs_queued_requeue
+  after update of status on jobs
+  for each row
+  when (new.status = 'queued' and old.status is distinct from 'queued')
+  execute function notify_job_queued();
+
+comment on function notify_job_queued() is 'Publishes queued/requeued jobs on the jobs_<job_type> channel';
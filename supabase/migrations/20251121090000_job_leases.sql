@@ -0,0 +1,11 @@
+-- Job leasing: a claim stamps the worker and an expiry, heartbeats extend the
+-- expiry while the job runs, and expired leases are reclaimed by the reaper.
+
+alter table jobs add column locked_by text;
+alter table jobs add column locked_until timestamptz;
+
+-- Reaper scan: only in-flight jobs, ordered by expiry
+create index idx_jobs_lease_expiry on jobs (locked_until) where status = 'processing';
+
+comment on column jobs.locked_by is 'Worker ID holding the lease on a processing job';
+comment on column jobs.locked_until is 'Lease expiry; processing jobs past this are reclaimed';
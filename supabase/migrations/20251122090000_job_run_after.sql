@@ -0,0 +1,26 @@
+-- Retry backoff: a failed job is requeued with run_after in the future and
+-- is not claimable until then. New jobs default to now(), so they stay FIFO.
+
+alter table jobs add column run_after timestamptz not null default now();
+
+-- Claim scan: queued jobs of one type in run_after order
+create index idx_jobs_claim on jobs (job_type, run_after) where status = 'queued';
+
+-- Only wake workers for jobs they can claim right away; delayed retries are
+-- picked up by the pollers' fallback interval once run_after has passed.
+drop trigger notify_jobs_queued_insert on jobs;
+drop trigger notify_jobs_queued_requeue on jobs;
+
+create trigger notify_jobs_queued_insert
+  after insert on jobs
+  for each row
+  when (new.status = 'queued' and new.run_after <= now())
+  execute function notify_job_queued();
+
+create trigger notify_jobs_queued_requeue
+  after update of status on jobs
+  for each row
+  when (new.status = 'queued' and old.status is distinct from 'queued' and new.run_after <= now())
+  execute function notify_job_queued();
+
+comment on column jobs.run_after is 'Earliest time the job may be claimed; set by retry backoff';
@@ -0,0 +1,92 @@
+-- Priority classes and per-tenant fair share for the job queue.
+--
+-- Claims order by priority (higher first), then by fair_key: a per-tenant
+-- virtual start time assigned on insert (start-time fair queuing). Each job
+-- a tenant enqueues advances that tenant's clock by 1/weight, and a tenant's
+-- clock never lags behind the head of the queue, so a tenant that enqueues
+-- 500 jobs gets keys head, head+1, ..., head+499 while another tenant's next
+-- job lands at the head. Claiming interleaves tenants without any extra
+-- bookkeeping on the hot claim path, which stays a single index range scan
+-- under SKIP LOCKED.
+
+alter table jobs add column priority smallint not null default 0;
+alter table jobs add column fair_key double precision;
+
+create table job_tenant_clock (
+  tenant_id uuid not null,
+  job_type job_type not null,
+  last_fair_key double precision not null,
+  weight real not null default 1 check (weight > 0),
+  primary key (tenant_id, job_type)
+);
+
+create index idx_job_tenant_clock_max on job_tenant_clock (job_type, last_fair_key);
+
+alter table job_tenant_clock enable row level security;
+
+create policy "Service role can manage job tenant clocks"
+  on job_tenant_clock for all
+  using ((auth.jwt() ->> 'role') = 'service_role')
+  with check ((auth.jwt() ->> 'role') = 'service_role');
+
+create or replace function assign_job_fair_key()
+returns trigger
+language plpgsql
+as $$
+declare
+  v_tenant uuid;
+  v_head double precision;
+begin
+  -- Callers (backfills, benchmarks) may assign keys themselves
+  if new.fair_key is not null then
+    return new;
+  end if;
+
+  select coalesce(team_id, owner_id) into v_tenant
+  from videos
+  where id = new.video_id;
+
+  -- Virtual time: the head of this job type's queue in the same priority
+  -- class, or, with an empty queue, the furthest tenant clock so past usage
+  -- is forgotten once the backlog has drained.
+  select fair_key into v_head
+  from jobs
+  where job_type = new.job_type
+    and status = 'queued'
+    and priority = new.priority
+  order by fair_key
+  limit 1;
+
+  if v_head is null then
+    select max(last_fair_key) into v_head
+    from job_tenant_clock
+    where job_type = new.job_type;
+  end if;
+
+  insert into job_tenant_clock as c (tenant_id, job_type, last_fair_key)
+  values (v_tenant, new.job_type, coalesce(v_head, 0))
+  on conflict (tenant_id, job_type) do update
+    set last_fair_key = greatest(c.last_fair_key + 1.0 / c.weight, coalesce(v_head, 0))
+  returning last_fair_key into new.fair_key;
+
+  return new;
+end;
+$$;
+
+create trigger assign_jobs_fair_key
+  before insert on jobs
+  for each row
+  execute function assign_job_fair_key();
+
+-- Existing jobs keep their FIFO order
+update jobs set fair_key = extract(epoch from created_at) where fair_key is null;
+alter table jobs alter column fair_key set not null;
+
+-- Claim scan: one range per (job_type, priority), in fair_key order
+drop index idx_jobs_claim;
+create index idx_jobs_claim on jobs (job_type, priority desc, fair_key) where status = 'queued';
+
+comment on table job_tenant_clock is 'Per-tenant virtual clock used to assign jobs.fair_key';
+comment on column job_tenant_clock.weight is 'Relative share of workers; 2 gets twice the claims of 1 under contention';
+comment on column jobs.priority is 'Claim priority class; higher values are claimed first';
+comment on column jobs.fair_key is 'Start-time fair queuing key; lower values are claimed first within a priority';
@@ -0,0 +1,39 @@
+-- At most one active (queued or processing) pipeline job per video and type.
+-- Enqueues use ON CONFLICT DO NOTHING against this index, so a duplicate
+-- enqueue (retried request, worker restarted between ack and enqueue) is a
+-- cheap no-op instead of a second transcode/OCR run. clip_generate jobs are
+-- on-demand and may legitimately run several times per video.
+
+-- Fail queued duplicates that predate the constraint, keeping the job that
+-- is already processing or, failing that, the oldest one
+with ranked as (
+  select id,
+         row_number() over (
+           partition by video_id, job_type
+           order by (status = 'processing') desc, created_at
+         ) as rn
+  from jobs
+  where status in ('queued', 'processing')
+    and job_type <> 'clip_generate'
+)
+update jobs
+set status = 'failed',
+    finished_at = now(),
+    payload = jsonb_set(
+      coalesce(jobs.payload, '{}'::jsonb),
+      '{errors}',
+      coalesce(jobs.payload -> 'errors', '[]'::jsonb)
+        || jsonb_build_array(jsonb_build_object(
+          'message', 'Duplicate: superseded by another active job',
+          'timestamp', now(),
+          'retry_count', jobs.retry_count
+        ))
+    )
+from ranked
+where jobs.id = ranked.id
+  and ranked.rn > 1
+  and jobs.status = 'queued';
+
+create unique index idx_jobs_video_pipeline_active
+  on jobs (video_id, job_type)
+  where status in ('queued', 'processing') and job_type <> 'clip_generate';
@@ -0,0 +1,124 @@
+-- Keep the jobs table limited to live work. Finished jobs are moved to the
+-- month-partitioned jobs_history table by archive_finished_jobs(), so claim
+-- scans, index maintenance and autovacuum only ever deal with a small table,
+-- and old history is dropped by detaching a partition instead of a DELETE.
+
+-- Claims go through idx_jobs_claim (queued rows only, in claim order) and
+-- leases through idx_jobs_lease_expiry; these generic indexes only add write
+-- amplification to every status transition.
+drop index idx_jobs_status;
+drop index idx_jobs_job_type;
+drop index idx_jobs_status_job_type;
+
+-- Archival scan: finished rows in finished_at order
+create index idx_jobs_finished on jobs (finished_at) where status in ('done', 'failed');
+
+-- Room for HOT updates, and vacuum a queue table long before 20% of it is dead
+alter table jobs set (
+  fillfactor = 80,
+  autovacuum_vacuum_scale_factor = 0.01,
+  autovacuum_analyze_scale_factor = 0.02
+);
+
+-- Queue helpers already set updated_at; only fill it in for other writers
+drop trigger update_jobs_updated_at on jobs;
+
+create trigger update_jobs_updated_at
+  before update on jobs
+  for each row
+  when (new.updated_at is not distinct from old.updated_at)
+  execute function update_updated_at_column();
+
+-- Same columns, in the same order, as jobs: archive_finished_jobs() copies
+-- rows with select *. Columns added to jobs must be added here too.
+create table jobs_history (
+  like jobs including defaults,
+  primary key (id, finished_at)
+) partition by range (finished_at);
+
+alter table jobs_history alter column finished_at set not null;
+
+create table jobs_history_default partition of jobs_history default;
+
+create index idx_jobs_history_video_id on jobs_history (video_id);
+
+alter table jobs_history enable row level security;
+
+create policy "Users can view job history for their videos"
+  on jobs_history for select
+  using (exists (
+    select 1 from videos
+    where videos.id = jobs_history.video_id
+    and videos.owner_id = auth.uid()
+  ));
+
+create policy "Service role can manage job history"
+  on jobs_history for all
+  using ((auth.jwt() ->> 'role') = 'service_role')
+  with check ((auth.jwt() ->> 'role') = 'service_role');
+
+create or replace function create_jobs_history_partition(p_month date)
+returns void
+language plpgsql
+as $$
+declare
+  v_start date := date_trunc('month', p_month)::date;
+  v_name text := 'jobs_history_' || to_char(v_start, 'YYYY_MM');
+begin
+  execute format(
+    'create table if not exists %I partition of jobs_history for values from (%L) to (%L)',
+    v_name,
+    v_start,
+    (v_start + interval '1 month')::date
+  );
+end;
+$$;
+
+create or replace function archive_finished_jobs(
+  p_older_than interval default interval '7 days',
+  p_batch_size integer default 10000
+)
+returns integer
+language plpgsql
+as $$
+declare
+  v_month date;
+  v_moved integer;
+begin
+  for v_month in
+    select distinct date_trunc('month', finished_at)::date
+    from (
+      select finished_at
+      from jobs
+      where status in ('done', 'failed')
+        and finished_at < now() - p_older_than
+      order by finished_at
+      limit p_batch_size
+    ) batch
+  loop
+    perform create_jobs_history_partition(v_month);
+  end loop;
+
+  with moved as (
+    delete from jobs
+    where id in (
+      select id
+      from jobs
+      where status in ('done', 'failed')
+        and finished_at < now() - p_older_than
+      order by finished_at
+      limit p_batch_size
+      for update skip locked
+    )
+    returning *
+  )
+  insert into jobs_history
+  select * from moved;
+
+  get diagnostics v_moved = row_count;
+  return v_moved;
+end;
+$$;
+
+comment on table jobs_history is 'Finished jobs moved out of the live queue, partitioned by month of finished_at';
+comment on function archive_finished_jobs(interval, integer) is 'Moves up to p_batch_size jobs finished before now() - p_older_than into jobs_history';
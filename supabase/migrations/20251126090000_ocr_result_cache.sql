@@ -0,0 +1,57 @@
+-- OCR results shared across videos, keyed by a hash of the exact image bytes
+-- plus the OCR settings (Tesseract version, languages, page segmentation
+-- mode). UI chrome such as app headers and nav bars looks the same in every
+-- recording; the ocr-worker reuses the cached words instead of recognizing
+-- it again.
+create table ocr_result_cache (
+  content_hash bytea primary key,            -- sha256
+  words jsonb not null,                      -- [[text, confidence, x, y, width, height, language], ...]
+  byte_size integer not null,                -- approximate row size, for eviction
+  created_at timestamptz not null default now(),
+  last_used_at timestamptz not null default now()
+) with (fillfactor = 90);
+
+-- Eviction scan: least recently used first
+create index idx_ocr_result_cache_last_used on ocr_result_cache (last_used_at);
+
+alter table ocr_result_cache enable row level security;
+
+create policy "Service role can manage OCR result cache"
+  on ocr_result_cache for all
+  using ((auth.jwt() ->> 'role') = 'service_role')
+  with check ((auth.jwt() ->> 'role') = 'service_role');
+
+-- Deletes up to p_batch_size least recently used entries beyond the newest
+-- p_max_bytes of cached results.
+create or replace function evict_ocr_result_cache(
+  p_max_bytes bigint,
+  p_batch_size integer default 10000
+)
+returns integer
+language plpgsql
+as $$
+declare
+  v_deleted integer;
+begin
+  delete from ocr_result_cache
+  where content_hash in (
+    select content_hash
+    from (
+      select
+        content_hash,
+        last_used_at,
+        sum(byte_size) over (order by last_used_at desc, content_hash) as newer_bytes
+      from ocr_result_cache
+    ) ranked
+    where newer_bytes > p_max_bytes
+    order by last_used_at
+    limit p_batch_size
+  );
+
+  get diagnostics v_deleted = row_count;
+  return v_deleted;
+end;
+$$;
+
+comment on table ocr_result_cache is 'OCR words per image content hash and OCR settings, shared across videos';
+comment on function evict_ocr_result_cache(bigint, integer) is 'Deletes up to p_batch_size least recently used entries beyond p_max_bytes of cached results';
@@ -0,0 +1,88 @@
+-- Merging a video's repeated detections into continuous time ranges, done in
+-- the database in one statement. The ocr-worker inserts one segment per word
+-- per keyframe; text that stays on screen for a minute becomes dozens of
+-- rows with the same text_hash whose time ranges touch. Streaming them to a
+-- worker and updating or deleting them one row at a time costs a round trip
+-- per row and does not scale to videos with hundreds of thousands of
+-- segments.
+
+-- Serves the merge's scan in (text_hash, t_start) order per video
+create index idx_segments_video_text_hash_t_start on segments (video_id, text_hash, t_start);
+
+-- Gaps and islands per text_hash: ordered by t_start, a segment starts a new
+-- island unless it begins at most p_max_gap_ms after the latest t_end of the
+-- earlier segments with the same text. The first segment of each island is
+-- kept, with t_end extended to the island's end and the island's highest
+-- confidence; the others are deleted. Returns the number of deleted segments.
+create or replace function merge_video_segments(
+  p_video_id uuid,
+  p_max_gap_ms integer default 0
+)
+returns integer
+language plpgsql
+as $$
+declare
+  v_deleted integer;
+begin
+  with ordered as (
+    select
+      id,
+      text_hash,
+      t_start,
+      t_end,
+      confidence,
+      max(t_end) over (
+        partition by text_hash
+        order by t_start, id
+        rows between unbounded preceding and 1 preceding
+      ) as previous_end
+    from segments
+    where video_id = p_video_id
+  ),
+  numbered as (
+    select
+      *,
+      count(*) filter (
+        where previous_end is null or t_start > previous_end + p_max_gap_ms
+      ) over (partition by text_hash order by t_start, id) as island
+    from ordered
+  ),
+  islands as (
+    select
+      id,
+      t_end,
+      confidence,
+      first_value(id) over island_rows as keep_id,
+      max(t_end) over island_rows as island_end,
+      max(confidence) over island_rows as island_confidence,
+      count(*) over island_rows as island_size
+    from numbered
+    window island_rows as (
+      partition by text_hash, island
+      order by t_start, id
+      rows between unbounded preceding and unbounded following
+    )
+  ),
+  extended as (
+    update segments s
+    set t_end = i.island_end, confidence = i.island_confidence
+    from islands i
+    where s.id = i.id
+      and i.id = i.keep_id
+      and i.island_size > 1
+      and (s.t_end, s.confidence) is distinct from (i.island_end, i.island_confidence)
+  ),
+  merged as (
+    delete from segments s
+    using islands i
+    where s.id = i.id
+      and i.id <> i.keep_id
+    returning 1
+  )
+  select count(*) into v_deleted from merged;
+
+  return v_deleted;
+end;
+$$;
+
+comment on function merge_video_segments(uuid, integer) is 'Merges consecutive segments of a video with the same text_hash into one segment per continuous time range';
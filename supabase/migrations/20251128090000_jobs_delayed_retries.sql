@@ -0,0 +1,7 @@
+-- Backed-off retries are requeued with run_after in the future and send no
+-- NOTIFY (see notify_jobs_queued_*). A listening poller looks up the
+-- earliest one to know how long it may block; this keeps that lookup a
+-- single index probe. New jobs (retry_count = 0) are claimable right away
+-- and stay out of the index.
+create index idx_jobs_delayed_retries on jobs (job_type, run_after)
+  where status = 'queued' and retry_count > 0;
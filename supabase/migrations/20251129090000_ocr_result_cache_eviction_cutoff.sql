@@ -0,0 +1,56 @@
+-- OCR result cache eviction in two steps. evict_ocr_result_cache() used to
+-- rank the whole table by a running sum of byte_size for every batch it
+-- deleted, so evicting n entries in batches of b scanned the table n / b
+-- times. The cutoff is now computed once, and each batch deletes the least
+-- recently used entries at or before it through idx_ocr_result_cache_last_used.
+
+drop function evict_ocr_result_cache(bigint, integer);
+
+-- last_used_at of the most recently used entry beyond the newest p_max_bytes
+-- of cached results; null if the cache fits. Entries used after the cutoff
+-- was computed are newer than it and survive the eviction.
+create or replace function ocr_result_cache_cutoff(p_max_bytes bigint)
+returns timestamptz
+language sql
+stable
+as $$
+  select last_used_at
+  from (
+    select
+      last_used_at,
+      sum(byte_size) over (order by last_used_at desc, content_hash) as newer_bytes
+    from ocr_result_cache
+  ) ranked
+  where newer_bytes > p_max_bytes
+  order by newer_bytes
+  limit 1;
+$$;
+
+-- Deletes up to p_batch_size least recently used entries last used at or
+-- before p_cutoff.
+create or replace function evict_ocr_result_cache(
+  p_cutoff timestamptz,
+  p_batch_size integer default 10000
+)
+returns integer
+language plpgsql
+as $$
+declare
+  v_deleted integer;
+begin
+  delete from ocr_result_cache
+  where content_hash in (
+    select content_hash
+    from ocr_result_cache
+    where last_used_at <= p_cutoff
+    order by last_used_at
+    limit p_batch_size
+  );
+
+  get diagnostics v_deleted = row_count;
+  return v_deleted;
+end;
+$$;
+
+comment on function ocr_result_cache_cutoff(bigint) is 'last_used_at of the most recently used entry beyond p_max_bytes of cached results, or null if the cache fits';
+comment on function evict_ocr_result_cache(timestamptz, integer) is 'Deletes up to p_batch_size least recently used entries last used at or before p_cutoff';
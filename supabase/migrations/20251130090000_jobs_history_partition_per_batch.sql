@@ -0,0 +1,96 @@
+-- archive_finished_jobs() created partitions for the months of the first
+-- p_batch_size finished rows, but moved the first p_batch_size rows it could
+-- lock (skip locked). When those differed, rows of a month without a
+-- partition landed in jobs_history_default, after which creating that
+-- month's partition failed on every run: Postgres refuses to add a
+-- partition while the default partition holds rows that belong to it.
+--
+-- The batch is now locked first, partitions are created for the months of
+-- exactly the locked rows, and only those rows are moved. Creating a
+-- partition also moves any rows of its month out of the default partition,
+-- which repairs tables that already hit the problem.
+
+create or replace function create_jobs_history_partition(p_month date)
+returns void
+language plpgsql
+as $$
+declare
+  v_start date := date_trunc('month', p_month)::date;
+  v_end date := (date_trunc('month', p_month) + interval '1 month')::date;
+  v_name text := 'jobs_history_' || to_char(v_start, 'YYYY_MM');
+begin
+  if to_regclass(v_name) is not null then
+    return;
+  end if;
+
+  create temp table jobs_history_stray (like jobs_history) on commit drop;
+
+  with stray as (
+    delete from jobs_history_default
+    where finished_at >= v_start and finished_at < v_end
+    returning *
+  )
+  insert into jobs_history_stray
+  select * from stray;
+
+  execute format(
+    'create table %I partition of jobs_history for values from (%L) to (%L)',
+    v_name,
+    v_start,
+    v_end
+  );
+
+  insert into jobs_history
+  select * from jobs_history_stray;
+
+  drop table jobs_history_stray;
+end;
+$$;
+
+create or replace function archive_finished_jobs(
+  p_older_than interval default interval '7 days',
+  p_batch_size integer default 10000
+)
+returns integer
+language plpgsql
+as $$
+declare
+  v_ids uuid[];
+  v_months date[];
+  v_month date;
+  v_moved integer;
+begin
+  -- The row locks are held until commit, so the batch cannot change before
+  -- it is moved
+  select array_agg(id), array_agg(distinct date_trunc('month', finished_at)::date)
+  into v_ids, v_months
+  from (
+    select id, finished_at
+    from jobs
+    where status in ('done', 'failed')
+      and finished_at < now() - p_older_than
+    order by finished_at
+    limit p_batch_size
+    for update skip locked
+  ) batch;
+
+  if v_ids is null then
+    return 0;
+  end if;
+
+  foreach v_month in array v_months loop
+    perform create_jobs_history_partition(v_month);
+  end loop;
+
+  with moved as (
+    delete from jobs
+    where id = any(v_ids)
+    returning *
+  )
+  insert into jobs_history
+  select * from moved;
+
+  get diagnostics v_moved = row_count;
+  return v_moved;
+end;
+$$;